@@ -0,0 +1,40 @@
+"""keyset pagination indexes on posts and replies
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 10:00:00
+
+기준 스키마(create_all로 만든 기존 테이블)에 목록 keyset 페이지네이션용 인덱스를 추가합니다.
+운영 중 쓰기를 막지 않도록 CONCURRENTLY로 만들고, 새 DB처럼 create_all이 이미 만든
+경우를 위해 IF NOT EXISTS를 씁니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_posts_created_at_post_id", "posts", "created_at, post_id"),
+    ("ix_posts_category_created_at_post_id", "posts", "category, created_at, post_id"),
+    ("ix_posts_view_count_post_id", "posts", "view_count, post_id"),
+    ("ix_replies_post_id_created_at_reply_id", "replies", "post_id, created_at, reply_id"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서만 실행할 수 있다
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
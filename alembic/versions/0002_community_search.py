@@ -0,0 +1,46 @@
+"""community full-text search columns and GIN indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:10:00
+
+posts.search_title/search_content, replies.search_content(문자 바이그램)와 검색 GIN
+인덱스를 추가합니다. 인덱스 식은 app/services/community_search.py의 검색 문서 식과
+같아야 합니다. 기존 행의 바이그램은 애플리케이션 시작 시 backfill_search_text가 채웁니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_title TEXT")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_content TEXT")
+    op.execute("ALTER TABLE replies ADD COLUMN IF NOT EXISTS search_content TEXT")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_search ON posts USING gin (("
+            "setweight(to_tsvector('simple'::regconfig, coalesce(search_title, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(search_content, '')), 'B')))"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_replies_search ON replies USING gin ("
+            "(to_tsvector('simple'::regconfig, coalesce(search_content, ''))))"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_replies_search")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts_search")
+
+    op.execute("ALTER TABLE replies DROP COLUMN IF EXISTS search_content")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_content")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_title")
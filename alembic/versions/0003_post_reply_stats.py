@@ -0,0 +1,60 @@
+"""posts.reply_count/last_reply_at with backfill and recent activity index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:20:00
+
+게시글 댓글 집계 컬럼을 추가하고 기존 댓글로 채운 뒤, recent_activity 정렬용
+(coalesce(last_reply_at, created_at), post_id) 인덱스를 만듭니다.
+NOT NULL DEFAULT 0 컬럼 추가는 PostgreSQL 11 이상에서 테이블을 다시 쓰지 않습니다.
+백필은 긴 잠금을 피하려고 post_id 구간별로 나눠 커밋합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+# CommunityService.refresh_reply_stats와 같은 집계
+BACKFILL_SQL = (
+    "UPDATE posts SET "
+    "reply_count = (SELECT count(*) FROM replies WHERE replies.post_id = posts.post_id), "
+    "last_reply_at = (SELECT max(created_at) FROM replies WHERE replies.post_id = posts.post_id)"
+)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS reply_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS last_reply_at TIMESTAMP WITHOUT TIME ZONE")
+
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            op.execute(BACKFILL_SQL)
+        else:
+            bind = op.get_bind()
+            max_id = bind.execute(sa.text("SELECT max(post_id) FROM posts")).scalar() or 0
+            for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    sa.text(BACKFILL_SQL + " WHERE posts.post_id BETWEEN :start AND :end"),
+                    {"start": start, "end": start + BACKFILL_BATCH_SIZE - 1}
+                )
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_last_activity_post_id "
+            "ON posts (coalesce(last_reply_at, created_at), post_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts_last_activity_post_id")
+
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS last_reply_at")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS reply_count")
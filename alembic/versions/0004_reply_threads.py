@@ -0,0 +1,39 @@
+"""replies.parent_reply_id for threaded replies
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:30:00
+
+대댓글용 상위 댓글 컬럼(상위 댓글 삭제 시 CASCADE)과 인덱스를 추가합니다.
+새 컬럼은 모두 NULL이므로 외래 키 검사는 테이블을 다시 읽지 않고 끝납니다.
+기존 댓글은 모두 최상위 댓글로 남습니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 외래 키 이름은 create_all과 같은 PostgreSQL 기본 이름(replies_parent_reply_id_fkey)
+    op.execute(
+        "ALTER TABLE replies ADD COLUMN IF NOT EXISTS parent_reply_id INTEGER "
+        "REFERENCES replies (reply_id) ON DELETE CASCADE"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_replies_parent_reply_id ON replies (parent_reply_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_replies_parent_reply_id")
+
+    op.execute("ALTER TABLE replies DROP COLUMN IF EXISTS parent_reply_id")
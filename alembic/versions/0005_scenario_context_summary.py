@@ -0,0 +1,29 @@
+"""scenario_progress.context_summary/summarized_turn for rolling conversation summary
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:40:00
+
+시나리오 대화 요약 컬럼을 추가합니다. 기존 진행 기록은 요약 없이(summarized_turn = 0)
+시작하고, 다음 턴부터 밀려난 턴이 쌓이면 요약이 만들어집니다.
+NOT NULL DEFAULT 0 컬럼 추가는 PostgreSQL 11 이상에서 테이블을 다시 쓰지 않습니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE scenario_progress ADD COLUMN IF NOT EXISTS context_summary TEXT")
+    op.execute("ALTER TABLE scenario_progress ADD COLUMN IF NOT EXISTS summarized_turn INTEGER NOT NULL DEFAULT 0")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE scenario_progress DROP COLUMN IF EXISTS summarized_turn")
+    op.execute("ALTER TABLE scenario_progress DROP COLUMN IF EXISTS context_summary")
@@ -1,23 +1,68 @@
 """
 인증 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
 from app.core.security import (
-    verify_password, get_password_hash, create_access_token, 
-    create_refresh_token, verify_token, oauth2_scheme
+    Principal, create_access_token, create_refresh_token, get_current_principal,
+    new_token_id, verify_token
 )
+from app.core.concurrency import KeyedConcurrencyLimiter
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.token_revocation import revocation_store
 from app.schemas.user import SignupRequest, LoginRequest
 from app.schemas.common import BaseResponse, TokenResponse
 from app.services.user_service import UserService
 
-router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# 로그인은 요청마다 bcrypt 검증을 하므로 IP당 동시 처리 수를 제한
+login_limiter = KeyedConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_PER_IP)
+
+
+async def limit_login_concurrency(request: Request):
+    """IP당 동시 로그인 요청 제한 (초과 시 429)"""
+    client_ip = request.client.host if request.client else "unknown"
+    if not login_limiter.acquire(client_ip):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="로그인 요청이 너무 많습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        login_limiter.release(client_ip)
+
+
+def _family_expires_at() -> float:
+    # 패밀리 폐기 이후로는 새 토큰이 발급되지 않으므로 refresh 토큰 수명만큼 보관하면 충분
+    return time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+def _issue_tokens(user, family: str) -> TokenResponse:
+    """access/refresh 토큰 발급 (같은 로그인에서 이어지는 토큰은 같은 패밀리)"""
+    claims = {"sub": str(user.user_id), "email": user.email, "fam": family}
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(data=claims, expires_delta=access_token_expires)
+    refresh_token = create_refresh_token(data=claims)
+    
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
 
 
 @router.post("/signup", response_model=BaseResponse)
@@ -36,7 +81,7 @@ async def signup(
         )
     
     # 사용자 생성
-    user = user_service.create_user(user_data)
+    user = await user_service.create_user(user_data)
     
     return BaseResponse(
         success=True,
@@ -48,13 +93,14 @@ async def signup(
 @router.post("/login", response_model=TokenResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(limit_login_concurrency)
 ):
     """로그인"""
     user_service = UserService(db)
     
     # 사용자 인증
-    user = user_service.authenticate_user(form_data.username, form_data.password)
+    user = await user_service.authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,26 +108,20 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 토큰 생성
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.user_id), "email": user.email},
-        expires_delta=access_token_expires
-    )
-    refresh_token = create_refresh_token(
-        data={"sub": str(user.user_id), "email": user.email}
-    )
-    
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    )
+    return _issue_tokens(user, new_token_id())
 
 
 @router.post("/logout", response_model=BaseResponse)
-async def logout():
-    """로그아웃 (클라이언트에서 토큰 삭제)"""
+async def logout(
+    principal: Principal = Depends(get_current_principal)
+):
+    """로그아웃 (이 로그인에서 발급된 access/refresh 토큰 모두 폐기)"""
+    family = principal.claims.get("fam")
+    if family:
+        revocation_store.revoke(family, _family_expires_at())
+    elif principal.claims.get("jti"):
+        revocation_store.revoke(principal.claims["jti"], principal.claims["exp"])
+    
     return BaseResponse(
         success=True,
         message="로그아웃되었습니다"
@@ -93,15 +133,38 @@ async def refresh_token(
     refresh_token: str,
     db: Session = Depends(get_db)
 ):
-    """토큰 갱신"""
+    """
+    토큰 갱신 (refresh 토큰 회전)
+    
+    사용한 refresh 토큰은 폐기하고 같은 토큰 패밀리로 새 토큰을 발급합니다.
+    이미 사용한 refresh 토큰이 다시 들어오면 탈취된 것으로 보고 패밀리 전체를 폐기합니다.
+    """
     try:
-        payload = verify_token(refresh_token)
+        payload = verify_token(refresh_token, check_revoked=False)
         if payload.get("type") != "refresh":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="유효하지 않은 리프레시 토큰입니다"
             )
         
+        jti = payload.get("jti")
+        family = payload.get("fam")
+        if not jti or not family or revocation_store.is_revoked(family):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="다시 로그인해주세요"
+            )
+        
+        # 사용 처리는 원자적이므로 동시에 같은 토큰으로 갱신해도 한 번만 성공
+        if not revocation_store.revoke(jti, payload["exp"]):
+            revocation_store.revoke(family, _family_expires_at())
+            metrics.incr("auth.refresh_reuse_detected")
+            logger.warning("리프레시 토큰 재사용 감지: user_id=%s", payload.get("sub"))
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="다시 로그인해주세요"
+            )
+        
         user_id = payload.get("sub")
         user_service = UserService(db)
         user = user_service.get_user_by_id(int(user_id))
@@ -112,22 +175,10 @@ async def refresh_token(
                 detail="사용자를 찾을 수 없습니다"
             )
         
-        # 새 토큰 생성
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": str(user.user_id), "email": user.email},
-            expires_delta=access_token_expires
-        )
-        new_refresh_token = create_refresh_token(
-            data={"sub": str(user.user_id), "email": user.email}
-        )
-        
-        return TokenResponse(
-            access_token=access_token,
-            refresh_token=new_refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-        )
+        return _issue_tokens(user, family)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.core.database import get_db
+from app.core.http_cache import content_cache
+from app.core.responses import FastJSONRoute
+from app.core.pagination import InvalidCursorError
 from app.core.security import get_current_user_id, oauth2_scheme
 from app.schemas.learning import (
     ChapterResponse, ChapterCreate, ChapterUpdate, 
@@ -14,7 +17,7 @@ from app.schemas.learning import (
 from app.schemas.common import BaseResponse
 from app.services.chapter_service import ChapterService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/", response_model=ChapterListResponse)
@@ -23,29 +26,43 @@ async def get_chapters(
     level_id: Optional[int] = Query(None, description="레벨 ID"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """직무·레벨 기반 챕터 목록 조회"""
     chapter_service = ChapterService(db)
-    chapters, total = chapter_service.get_chapters(
-        job_id=job_id,
-        level_id=level_id,
-        page=page,
-        size=size
-    )
+    try:
+        result = chapter_service.get_chapters(
+            job_id=job_id,
+            level_id=level_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return ChapterListResponse(
-        chapters=chapters,
-        total=total,
+        chapters=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
     )
 
 
 @router.get("/{chapter_id}", response_model=ChapterResponse)
 async def get_chapter(
     chapter_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """단일 챕터 상세 조회"""
     chapter_service = ChapterService(db)
@@ -132,7 +149,10 @@ async def get_chapter_sentences(
     chapter_id: int,
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """챕터 내 문장 목록 조회"""
     chapter_service = ChapterService(db)
@@ -143,15 +163,25 @@ async def get_chapter_sentences(
             detail="챕터를 찾을 수 없습니다"
         )
     
-    sentences, total = chapter_service.get_chapter_sentences(
-        chapter_id=chapter_id,
-        page=page,
-        size=size
-    )
+    try:
+        result = chapter_service.get_chapter_sentences(
+            chapter_id=chapter_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return SentenceListResponse(
-        sentences=sentences,
-        total=total,
+        sentences=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
     )
@@ -6,39 +6,109 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
+from app.core.pagination import InvalidCursorError
 from app.core.security import get_current_user_id, oauth2_scheme
 from app.schemas.community import (
     PostResponse, PostCreate, PostUpdate, PostListResponse,
-    ReplyResponse, ReplyCreate, ReplyUpdate, ReplyListResponse
+    ReplyResponse, ReplyCreate, ReplyUpdate, ReplyListResponse, ReplyTreeListResponse
 )
 from app.schemas.common import BaseResponse
 from app.services.community_service import CommunityService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/", response_model=PostListResponse)
 async def get_posts(
     category: Optional[str] = Query(None, description="카테고리"),
-    sort: Optional[str] = Query("created_at", description="정렬 기준"),
+    sort: Optional[str] = Query("created_at", description="정렬 기준 (created_at, view_count, title, recent_activity, trending)"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     db: Session = Depends(get_db)
 ):
     """게시글 목록 조회"""
     community_service = CommunityService(db)
-    posts, total = community_service.get_posts(
+    try:
+        result = community_service.get_posts(
+            category=category,
+            sort=sort,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return PostListResponse(
+        posts=result.items,
+        total=result.total,
+        page=page,
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
+    )
+
+
+@router.get("/search", response_model=PostListResponse)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어"),
+    category: Optional[str] = Query(None, description="카테고리"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db)
+):
+    """게시글 검색 (제목·본문, 관련도순)"""
+    community_service = CommunityService(db)
+    result = community_service.search_posts(
+        keyword=q,
         category=category,
-        sort=sort,
         page=page,
-        size=size
+        size=size,
+        include_total=include_total
     )
     
     return PostListResponse(
-        posts=posts,
-        total=total,
+        posts=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        is_estimate=result.is_estimate
+    )
+
+
+@router.get("/replies/search", response_model=ReplyListResponse)
+async def search_replies(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어"),
+    post_id: Optional[int] = Query(None, description="게시글 ID"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db)
+):
+    """댓글 검색 (관련도순)"""
+    community_service = CommunityService(db)
+    result = community_service.search_replies(
+        keyword=q,
+        post_id=post_id,
+        page=page,
+        size=size,
+        include_total=include_total
+    )
+    
+    return ReplyListResponse(
+        replies=result.items,
+        total=result.total,
+        page=page,
+        size=size,
+        is_estimate=result.is_estimate
     )
 
 
@@ -152,6 +222,8 @@ async def get_post_replies(
     post_id: int,
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     db: Session = Depends(get_db)
 ):
     """댓글 목록 조회"""
@@ -163,17 +235,69 @@ async def get_post_replies(
             detail="게시글을 찾을 수 없습니다"
         )
     
-    replies, total = community_service.get_post_replies(
-        post_id=post_id,
+    try:
+        result = community_service.get_post_replies(
+            post_id=post_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return ReplyListResponse(
+        replies=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
     )
+
+
+@router.get("/{post_id}/replies/tree", response_model=ReplyTreeListResponse)
+async def get_post_reply_tree(
+    post_id: int,
+    page: int = Query(1, ge=1, description="페이지 번호 (최상위 댓글 기준)"),
+    size: int = Query(20, ge=1, le=100, description="페이지 크기 (최상위 댓글 기준)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db)
+):
+    """댓글 트리 조회 (최상위 댓글 + 대댓글)"""
+    community_service = CommunityService(db)
     
-    return ReplyListResponse(
-        replies=replies,
-        total=total,
+    if not community_service.get_post_by_id(post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="게시글을 찾을 수 없습니다"
+        )
+    
+    try:
+        result = community_service.get_reply_tree(
+            post_id=post_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return ReplyTreeListResponse(
+        replies=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
     )
 
 
@@ -194,6 +318,14 @@ async def create_reply(
             detail="게시글을 찾을 수 없습니다"
         )
     
+    if reply_data.parent_reply_id is not None:
+        parent = community_service.get_reply_by_id(reply_data.parent_reply_id)
+        if not parent or parent.post_id != post_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="상위 댓글을 찾을 수 없습니다"
+            )
+    
     reply = community_service.create_reply(user_id, post_id, reply_data)
     
     return BaseResponse(
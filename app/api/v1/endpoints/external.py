@@ -8,12 +8,13 @@ from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
 from app.core.security import oauth2_scheme
 from app.schemas.common import BaseResponse
 from app.services.external_service import ExternalService
 
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.post("/stt/file") ## file 형식의 음성파일을 인자로 받아 stt 작업 수행하고 결과를 반환하는 함수 #####
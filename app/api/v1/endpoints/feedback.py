@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
 from app.core.security import get_current_user_id, oauth2_scheme
 from app.schemas.learning import (
     ChapterFeedbackResponse, ChapterFeedbackCreate,
@@ -14,7 +15,7 @@ from app.schemas.scenario import ScenarioFeedbackResponse
 from app.schemas.common import BaseResponse
 from app.services.feedback_service import FeedbackService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/chapters/{chapter_id}", response_model=ChapterFeedbackResponse)
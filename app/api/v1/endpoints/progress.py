@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
 from app.core.security import get_current_user_id, oauth2_scheme
 from app.schemas.progress import (
     ProgressStatsResponse, ChapterProgressResponse, UserProgressHistoryResponse,
@@ -13,7 +14,7 @@ from app.schemas.progress import (
 from app.schemas.common import BaseResponse
 from app.services.progress_service import ProgressService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/users/{user_id}", response_model=ProgressStatsResponse)
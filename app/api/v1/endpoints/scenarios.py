@@ -1,21 +1,29 @@
 """
 시나리오 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime
 
 from app.core.database import get_db
+from app.core.http_cache import content_cache
+from app.core.responses import FastJSONRoute
+from app.core.pagination import InvalidCursorError
 from app.core.security import get_current_user_id, oauth2_scheme
 from app.schemas.scenario import (
     ScenarioResponse, ScenarioCreate, ScenarioUpdate, ScenarioListResponse,
     ScenarioStartRequest, ConversationTurnRequest, ScenarioCompleteRequest,
-    ScenarioProgressResponse, ScenarioFeedbackResponse
+    ScenarioProgressResponse, ScenarioFeedbackResponse, ScenarioTurnStreamRequest,
+    ScenarioFeedbackStatusResponse
 )
 from app.schemas.common import BaseResponse
+from app.services.llm_client import is_llm_configured
+from app.services.scenario_chat_service import ScenarioChatService
 from app.services.scenario_service import ScenarioService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/", response_model=ScenarioListResponse)
@@ -24,29 +32,43 @@ async def get_scenarios(
     level_id: Optional[int] = Query(None, description="레벨 ID"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """시나리오 목록 조회"""
     scenario_service = ScenarioService(db)
-    scenarios, total = scenario_service.get_scenarios(
-        job_id=job_id,
-        level_id=level_id,
-        page=page,
-        size=size
-    )
+    try:
+        result = scenario_service.get_scenarios(
+            job_id=job_id,
+            level_id=level_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return ScenarioListResponse(
-        scenarios=scenarios,
-        total=total,
+        scenarios=result.items,
+        total=result.total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=result.next_cursor,
+        is_estimate=result.is_estimate
     )
 
 
 @router.get("/{scenario_id}", response_model=ScenarioResponse)
 async def get_scenario(
     scenario_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """시나리오 상세 조회"""
     scenario_service = ScenarioService(db)
@@ -148,6 +170,36 @@ async def save_conversation_turn(
     )
 
 
+@router.post("/{scenario_id}/turns/stream")
+async def stream_conversation_turn(
+    scenario_id: int,
+    turn_data: ScenarioTurnStreamRequest,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """대화 턴 진행 (AI 응답을 SSE로 토큰 단위 전달, 완료 후 턴 저장)"""
+    user_id = get_current_user_id(token)
+    
+    if not is_llm_configured():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI 응답 서비스가 설정되지 않았습니다"
+        )
+    
+    context = ScenarioChatService(db).prepare_turn(user_id, scenario_id, turn_data.user_message)
+    if context is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="진행 중인 시나리오를 찾을 수 없습니다"
+        )
+    
+    return StreamingResponse(
+        ScenarioChatService.stream_turn(context),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.patch("/{scenario_id}/complete", response_model=BaseResponse)
 async def complete_scenario(
     scenario_id: int,
@@ -167,40 +219,78 @@ async def complete_scenario(
     )
 
 
-@router.get("/{scenario_id}/feedback", response_model=ScenarioFeedbackResponse)
+@router.get(
+    "/{scenario_id}/feedback",
+    response_model=ScenarioFeedbackResponse,
+    responses={202: {"model": ScenarioFeedbackStatusResponse, "description": "피드백 생성 중"}}
+)
 async def get_scenario_feedback(
     scenario_id: int,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
-    """시나리오 피드백 조회"""
+    """시나리오 피드백 조회 (생성 중이면 202와 작업 상태)"""
     user_id = get_current_user_id(token)
     scenario_service = ScenarioService(db)
     
-    feedback = scenario_service.get_scenario_feedback(user_id, scenario_id)
-    
-    if not feedback:
+    current = scenario_service.get_scenario_feedback_status(user_id, scenario_id)
+    if current is None or (current[1] is None and current[2] is None):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="시나리오 피드백을 찾을 수 없습니다"
         )
     
-    return feedback
+    progress_id, feedback, job = current
+    if feedback is not None:
+        return feedback
+    
+    if job["status"] == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="AI 피드백 생성에 실패했습니다. 다시 요청해주세요"
+        )
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=ScenarioFeedbackStatusResponse(
+            progress_id=progress_id,
+            status=job["status"],
+            attempts=job["attempts"],
+            queued_at=datetime.utcfromtimestamp(job["queued_at"]),
+            error=job["error"] or None
+        ).model_dump(mode="json")
+    )
 
 
-@router.post("/{scenario_id}/feedback", response_model=BaseResponse)
+@router.post("/{scenario_id}/feedback", response_model=BaseResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_scenario_feedback(
     scenario_id: int,
+    response: Response,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
-    """AI 피드백 생성 요청"""
+    """AI 피드백 생성 요청 (작업 큐에 등록, 결과는 GET으로 확인)"""
     user_id = get_current_user_id(token)
     scenario_service = ScenarioService(db)
     
-    scenario_service.generate_scenario_feedback(user_id, scenario_id)
+    result = scenario_service.request_scenario_feedback(user_id, scenario_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="시나리오 진행 기록을 찾을 수 없습니다"
+        )
+    
+    progress_id, job_status = result
+    if job_status == "ready":
+        response.status_code = status.HTTP_200_OK
+        return BaseResponse(
+            success=True,
+            message="AI 피드백이 이미 생성되었습니다",
+            data={"progress_id": progress_id, "status": job_status}
+        )
     
     return BaseResponse(
         success=True,
-        message="AI 피드백 생성이 요청되었습니다"
+        message="AI 피드백 생성이 요청되었습니다",
+        data={"progress_id": progress_id, "status": job_status}
     )
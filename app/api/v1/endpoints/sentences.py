@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.http_cache import content_cache
+from app.core.responses import FastJSONRoute
 from app.core.security import oauth2_scheme
 from app.schemas.learning import (
     SentenceResponse, SentenceCreate, SentenceUpdate,
@@ -14,13 +16,14 @@ from app.schemas.learning import (
 from app.schemas.common import BaseResponse
 from app.services.sentence_service import SentenceService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/{sentence_id}", response_model=SentenceResponse)
 async def get_sentence(
     sentence_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """단일 문장 조회"""
     sentence_service = SentenceService(db)
@@ -87,7 +90,8 @@ async def delete_sentence(
 @router.get("/{sentence_id}/similar", response_model=List[SimilarSentenceResponse])
 async def get_similar_sentences(
     sentence_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(content_cache)
 ):
     """해당 문장의 유사 문장 목록 조회"""
     sentence_service = SentenceService(db)
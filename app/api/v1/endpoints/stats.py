@@ -5,11 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import FastJSONRoute
 from app.core.security import oauth2_scheme
+from app.core.cache import get_cache_stats
+from app.core.metrics import metrics
 from app.schemas.common import BaseResponse
 from app.services.stats_service import StatsService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/users/{user_id}", response_model=BaseResponse)
@@ -99,3 +102,27 @@ async def get_api_usage_stats(
         message="API 사용량 통계를 조회했습니다",
         data=api_stats
     )
+
+
+@router.get("/cache", response_model=BaseResponse)
+async def get_cache_usage_stats(
+    token: str = Depends(oauth2_scheme)
+):
+    """캐시 적중률 통계 조회 (워커 단위)"""
+    return BaseResponse(
+        success=True,
+        message="캐시 통계를 조회했습니다",
+        data=get_cache_stats()
+    )
+
+
+@router.get("/metrics", response_model=BaseResponse)
+async def get_latency_metrics(
+    token: str = Depends(oauth2_scheme)
+):
+    """지연 시간 지표 조회 (워커 단위, LLM 첫 토큰 시간 등)"""
+    return BaseResponse(
+        success=True,
+        message="지연 시간 지표를 조회했습니다",
+        data=metrics.snapshot()
+    )
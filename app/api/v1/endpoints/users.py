@@ -6,7 +6,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
-from app.core.security import get_current_user_id, oauth2_scheme
+from app.core.responses import FastJSONRoute
+from app.core.security import Principal, get_current_principal
 from app.schemas.user import (
     UserResponse, UserUpdate, UserPasswordChange, 
     UserLanguageChange, UserJobChange, UserStatusResponse
@@ -14,17 +15,16 @@ from app.schemas.user import (
 from app.schemas.common import BaseResponse
 from app.services.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    """현재 사용자 정보 가져오기"""
-    user_id = get_current_user_id(token)
+    """현재 사용자 프로필 가져오기 (캐시, 전체 정보가 필요한 핸들러용)"""
     user_service = UserService(db)
-    user = user_service.get_user_by_id(user_id)
+    user = user_service.get_user_profile(principal.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,12 +44,12 @@ async def get_current_user_info(
 @router.put("/", response_model=BaseResponse)
 async def update_user_info(
     user_update: UserUpdate,
-    current_user = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """사용자 정보 전체 수정"""
     user_service = UserService(db)
-    user_service.update_user(current_user.user_id, user_update)
+    user_service.update_user(principal.user_id, user_update)
     
     return BaseResponse(
         success=True,
@@ -60,21 +60,21 @@ async def update_user_info(
 @router.patch("/password", response_model=BaseResponse)
 async def change_password(
     password_change: UserPasswordChange,
-    current_user = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """비밀번호 변경"""
     user_service = UserService(db)
     
     # 현재 비밀번호 확인
-    if not user_service.verify_user_password(current_user.user_id, password_change.current_password):
+    if not await user_service.verify_user_password(principal.user_id, password_change.current_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="현재 비밀번호가 올바르지 않습니다"
         )
     
     # 새 비밀번호로 변경
-    user_service.update_user_password(current_user.user_id, password_change.new_password)
+    await user_service.update_user_password(principal.user_id, password_change.new_password)
     
     return BaseResponse(
         success=True,
@@ -85,12 +85,12 @@ async def change_password(
 @router.patch("/language", response_model=BaseResponse)
 async def change_language(
     language_change: UserLanguageChange,
-    current_user = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """모국어 변경"""
     user_service = UserService(db)
-    user_service.update_user_language(current_user.user_id, language_change.level_id)
+    user_service.update_user_language(principal.user_id, language_change.level_id)
     
     return BaseResponse(
         success=True,
@@ -101,12 +101,12 @@ async def change_language(
 @router.patch("/job", response_model=BaseResponse)
 async def change_job(
     job_change: UserJobChange,
-    current_user = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """직무 변경"""
     user_service = UserService(db)
-    user_service.update_user_job(current_user.user_id, job_change.job_id)
+    user_service.update_user_job(principal.user_id, job_change.job_id)
     
     return BaseResponse(
         success=True,
@@ -0,0 +1,472 @@
+"""
+2단 read-through 캐시 (프로세스 내 LRU + Redis)
+
+서비스 메서드에 @cached 데코레이터를 붙이면 반환값을 응답 스키마 형태로
+직렬화해 워커 로컬 LRU와 Redis에 저장합니다. 조회는 로컬 → Redis → 원본 순서로
+진행하고, 캐시 키는 전역 버전, 네임스페이스, 스키마 필드, 인자로 구성됩니다.
+
+쓰기 작업 후 invalidate_tags()를 호출하면 Redis 항목을 지우고 pub/sub 채널로
+무효화 메시지를 전파해 모든 워커의 로컬 항목을 제거합니다.
+REDIS_URL이 없으면 로컬 캐시만 사용하며, 이 경우 다른 워커의 로컬 항목은
+CACHE_LOCAL_TTL이 지나야 갱신됩니다.
+
+캐시 미스 시 한 요청만 원본을 조회하도록 Redis 락을 잡고, 나머지는 결과를 기다립니다.
+캐시된 서비스 메서드는 async 엔드포인트에서 이벤트 루프 스레드로 직접 호출되기도
+하므로, 루프 스레드에서는 잠들어 기다리지 않고 한 번만 다시 확인한 뒤 직접 조회합니다
+(기다리는 동안 워커의 다른 요청이 모두 멈추기 때문).
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.pagination import Page
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache"
+TUPLE_MARKER = "__tuple__"
+PAGE_MARKER = "__page__"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+# pub/sub 메시지에서 자기 자신이 보낸 무효화를 구분하기 위한 워커 식별자
+# (preload_app으로 마스터에서 import한 뒤 fork하므로 자식 프로세스에서 새로 만든다)
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def _reset_instance_id() -> None:
+    global INSTANCE_ID
+    INSTANCE_ID = uuid.uuid4().hex
+
+
+os.register_at_fork(after_in_child=_reset_instance_id)
+
+TagsSpec = Union[Iterable[str], Callable[[Dict[str, Any]], Iterable[str]], None]
+
+
+class CacheMetrics:
+    """네임스페이스별 캐시 적중률 집계 (프로세스 단위)"""
+
+    FIELDS = ("local_hits", "hits", "misses", "errors", "lock_waits", "lock_skips")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def incr(self, namespace: str, field: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, dict.fromkeys(self.FIELDS, 0))
+            counters[field] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["local_hits"] + counters["hits"] + counters["misses"]
+                result[namespace] = dict(
+                    counters,
+                    hit_rate=round((counters["local_hits"] + counters["hits"]) / lookups, 4) if lookups else None,
+                    local_hit_rate=round(counters["local_hits"] / lookups, 4) if lookups else None
+                )
+            return result
+
+
+class LocalCache:
+    """항목 수와 바이트 크기로 제한되는 TTL + LRU 캐시 (워커 로컬)"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (만료 시각, 직렬화된 값, 태그)
+        self._entries: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, payload: str, tags: Iterable[str], ttl: float) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            tags = tuple(tags)
+            self._entries[key] = (time.monotonic() + ttl, payload, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def evict_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            removed = 0
+            for tag in tags:
+                for key in self._tag_index.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, payload, tags = self._entries.pop(key)
+        self._bytes -= len(payload)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+
+cache_metrics = CacheMetrics()
+local_cache = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_MAX_BYTES)
+
+
+# 직렬화
+def _encode(value: Any, model: Optional[Type[BaseModel]]) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Page):
+        return {PAGE_MARKER: [_encode(value.items, model), value.total, value.next_cursor, value.is_estimate]}
+    if isinstance(value, tuple):
+        return {TUPLE_MARKER: [_encode(item, model) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item, model) for item in value]
+    if model is not None:
+        return model.model_validate(value).model_dump(mode="json")
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _decode(value: Any, model: Optional[Type[BaseModel]]) -> Any:
+    if isinstance(value, list):
+        return [_decode(item, model) for item in value]
+    if isinstance(value, dict):
+        if PAGE_MARKER in value:
+            items, total, next_cursor, is_estimate = value[PAGE_MARKER]
+            return Page(_decode(items, model), total, next_cursor, is_estimate)
+        if TUPLE_MARKER in value:
+            return tuple(_decode(item, model) for item in value[TUPLE_MARKER])
+        if model is not None:
+            return model.model_validate(value)
+    return value
+
+
+def _schema_fingerprint(model: Optional[Type[BaseModel]]) -> str:
+    """응답 스키마가 바뀌면 기존 키를 읽지 않도록 필드 목록을 키에 반영"""
+    if model is None:
+        return "raw"
+    fields = ",".join(sorted(model.model_fields.keys()))
+    return hashlib.sha1(f"{model.__name__}:{fields}".encode()).hexdigest()[:8]
+
+
+def build_key(namespace: str, fingerprint: str, params: Dict[str, Any]) -> str:
+    """캐시 키 생성"""
+    raw = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"{KEY_PREFIX}:v{settings.CACHE_KEY_VERSION}:{namespace}:{fingerprint}:{digest}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{KEY_PREFIX}:v{settings.CACHE_KEY_VERSION}:tag:{tag}"
+
+
+def _resolve_tags(tags: TagsSpec, params: Dict[str, Any]) -> List[str]:
+    if tags is None:
+        return []
+    if callable(tags):
+        return list(tags(params))
+    return list(tags)
+
+
+def _on_event_loop() -> bool:
+    """현재 스레드에서 이벤트 루프가 실행 중인지 (async 엔드포인트에서 직접 호출된 경우)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _ttl_with_jitter(ttl: int) -> int:
+    """동시 만료를 피하기 위해 TTL에 최대 10% 지터 추가"""
+    return ttl + random.randint(0, max(1, ttl // 10))
+
+
+def cached(
+    namespace: str,
+    ttl: Optional[int] = None,
+    tags: TagsSpec = None,
+    model: Optional[Type[BaseModel]] = None
+):
+    """
+    read-through 캐시 데코레이터
+
+    Args:
+        namespace: 캐시 네임스페이스 (지표 집계 단위)
+        ttl: Redis 만료 시간(초), 기본값은 CACHE_DEFAULT_TTL
+        tags: 무효화 태그 목록 또는 인자 dict를 받아 태그를 반환하는 함수
+        model: 반환값 직렬화에 사용할 Pydantic 응답 스키마
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        fingerprint = _schema_fingerprint(model)
+        redis_ttl = ttl or settings.CACHE_DEFAULT_TTL
+        local_ttl = min(redis_ttl, settings.CACHE_LOCAL_TTL)
+
+        def _serialize(value: Any) -> str:
+            return json.dumps(_encode(value, model), ensure_ascii=False, default=str)
+
+        def _deserialize(payload: Union[str, bytes]) -> Any:
+            return _decode(json.loads(payload), model)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            key = build_key(namespace, fingerprint, params)
+            tag_list = _resolve_tags(tags, params)
+
+            payload = local_cache.get(key)
+            if payload is not None:
+                cache_metrics.incr(namespace, "local_hits")
+                return _deserialize(payload)
+
+            client = get_redis()
+            if client is None:
+                cache_metrics.incr(namespace, "misses")
+                payload = _serialize(func(*args, **kwargs))
+                local_cache.set(key, payload, tag_list, local_ttl)
+                return _deserialize(payload)
+
+            try:
+                remote = client.get(key)
+            except Exception:
+                cache_metrics.incr(namespace, "errors")
+                logger.warning("캐시 조회 실패: %s", key, exc_info=True)
+                return func(*args, **kwargs)
+
+            if remote is not None:
+                cache_metrics.incr(namespace, "hits")
+                payload = remote.decode()
+            else:
+                cache_metrics.incr(namespace, "misses")
+                payload = _load(client, key, tag_list, lambda: _serialize(func(*args, **kwargs)))
+
+            local_cache.set(key, payload, tag_list, local_ttl)
+            return _deserialize(payload)
+
+        def _load(client, key: str, tag_list: List[str], loader: Callable[[], str]) -> str:
+            # 스탬피드 방지: 한 요청만 원본을 조회하고 나머지는 결과를 기다린다
+            lock_key = f"{key}:lock"
+            token = uuid.uuid4().hex
+            try:
+                acquired = client.set(lock_key, token, nx=True, px=settings.CACHE_LOCK_TIMEOUT_MS)
+            except Exception:
+                acquired = False
+
+            if not acquired and _on_event_loop():
+                # 루프를 막지 않도록 기다리지 않고 한 번만 확인 후 직접 조회
+                cache_metrics.incr(namespace, "lock_skips")
+                try:
+                    remote = client.get(key)
+                except Exception:
+                    remote = None
+                if remote is not None:
+                    return remote.decode()
+            elif not acquired:
+                cache_metrics.incr(namespace, "lock_waits")
+                deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT_MS / 1000
+                while time.monotonic() < deadline:
+                    time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+                    try:
+                        remote = client.get(key)
+                    except Exception:
+                        break
+                    if remote is not None:
+                        return remote.decode()
+
+            try:
+                payload = loader()
+                try:
+                    expire = _ttl_with_jitter(redis_ttl)
+                    pipe = client.pipeline(transaction=False)
+                    pipe.set(key, payload, ex=expire)
+                    for tag in tag_list:
+                        pipe.sadd(_tag_key(tag), key)
+                        pipe.expire(_tag_key(tag), expire * 2)
+                    pipe.execute()
+                except Exception:
+                    cache_metrics.incr(namespace, "errors")
+                    logger.warning("캐시 저장 실패: %s", key, exc_info=True)
+                return payload
+            finally:
+                if acquired:
+                    try:
+                        if client.get(lock_key) == token.encode():
+                            client.delete(lock_key)
+                    except Exception:
+                        pass
+
+        wrapper.cache_namespace = namespace
+        return wrapper
+
+    return decorator
+
+
+# 무효화
+_invalidation_handlers: List[Callable[[List[str]], Any]] = [local_cache.evict_tags]
+
+
+def register_invalidation_handler(handler: Callable[[List[str]], Any]) -> None:
+    """태그 무효화 시 (다른 워커에서 발생한 경우 포함) 호출될 핸들러 등록"""
+    _invalidation_handlers.append(handler)
+
+
+def _dispatch_invalidation(tags: List[str]) -> None:
+    for handler in _invalidation_handlers:
+        try:
+            handler(tags)
+        except Exception:
+            logger.warning("캐시 무효화 핸들러 실패: %s", tags, exc_info=True)
+
+
+def invalidate_local_tags(*tags: str) -> None:
+    """이 워커의 로컬 캐시와 무효화 핸들러에만 적용 (놓친 무효화 메시지 보정, Redis는 그대로)"""
+    if tags:
+        _dispatch_invalidation(list(tags))
+
+
+def invalidate_tags(*tags: str) -> None:
+    """태그에 속한 캐시 항목 무효화 (쓰기 작업 커밋 후 호출)"""
+    if not tags:
+        return
+
+    _dispatch_invalidation(list(tags))
+
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        for tag in tags:
+            tag_key = _tag_key(tag)
+            keys = client.smembers(tag_key)
+            pipe = client.pipeline(transaction=False)
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(tag_key)
+            pipe.execute()
+        client.publish(
+            INVALIDATION_CHANNEL,
+            json.dumps({"origin": INSTANCE_ID, "tags": list(tags)})
+        )
+    except Exception:
+        logger.warning("캐시 무효화 실패: %s", tags, exc_info=True)
+
+
+class InvalidationListener:
+    """다른 워커가 보낸 무효화 메시지를 구독해 로컬 항목을 제거"""
+
+    def __init__(self):
+        self._thread = None
+
+    def start(self) -> None:
+        client = get_redis()
+        if client is None or self._thread is not None:
+            return
+
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+            self._thread = pubsub.run_in_thread(
+                sleep_time=0.5,
+                daemon=True,
+                exception_handler=self._on_error
+            )
+        except Exception:
+            logger.warning("캐시 무효화 채널 구독 실패", exc_info=True)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    @staticmethod
+    def _on_message(message: Dict[str, Any]) -> None:
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("origin") == INSTANCE_ID:
+            return
+        _dispatch_invalidation(list(data.get("tags", [])))
+
+    @staticmethod
+    def _on_error(error: BaseException, pubsub, thread) -> None:
+        # 연결이 끊긴 동안 놓친 메시지가 있을 수 있으므로 로컬 캐시를 비운다
+        logger.warning("캐시 무효화 채널 오류: %s", error)
+        local_cache.clear()
+        time.sleep(1)
+
+
+invalidation_listener = InvalidationListener()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """캐시 지표 조회"""
+    return {
+        "redis_enabled": get_redis() is not None,
+        "key_version": settings.CACHE_KEY_VERSION,
+        "local": local_cache.stats(),
+        "namespaces": cache_metrics.snapshot()
+    }
@@ -0,0 +1,200 @@
+"""
+응답 압축 ASGI 미들웨어 (brotli, gzip)
+
+Accept-Encoding에 따라 br(brotli 패키지가 설치된 경우) 또는 gzip으로 압축합니다.
+COMPRESSION_MIN_SIZE 이상이고 Content-Type이 허용 목록에 있는 한 번에 전송되는 응답만
+압축하며, 스트리밍 응답(text/event-stream 등 여러 조각으로 보내는 응답)과 이미
+Content-Encoding이 있는 응답은 그대로 보냅니다.
+
+ETag가 있는 200 응답(콘텐츠 응답)은 (경로, ETag, 인코딩)별 압축 결과를 워커 로컬 LRU에
+보관해 같은 콘텐츠를 요청마다 다시 압축하지 않습니다. 압축한 응답의 ETag는 표현이
+달라지므로 약한 ETag(W/)로 바꿉니다(If-None-Match 비교는 약한 비교라 304는 그대로 동작).
+
+절약한 바이트 수는 compression.bytes_saved 지표(GET /api/stats/metrics)로 확인합니다.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+
+def _parse_accept_encoding(value: str) -> Dict[str, float]:
+    encodings: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """사용할 인코딩 (br 우선, 없으면 None)"""
+    encodings = _parse_accept_encoding(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    if brotli is not None and encodings.get("br", wildcard) > 0:
+        return "br"
+    if encodings.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedCache:
+    """압축 결과 LRU (바이트 크기 제한, 워커 로컬)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: Tuple[str, str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+compressed_cache = CompressedCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _weaken_etag(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    return [
+        (key, b"W/" + value if key.lower() == b"etag" and not value.startswith(b"W/") else value)
+        for key, value in headers
+    ]
+
+
+class CompressionMiddleware:
+    """응답 압축 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = choose_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"] + ("?" + scope["query_string"].decode("latin-1") if scope.get("query_string") else "")
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = (_header(headers, b"content-type") or b"").split(b";")[0].strip().decode("latin-1")
+                if message["status"] == 304:
+                    # 압축된 200 응답과 같은 (약한) ETag로 맞춘다
+                    message["headers"] = _weaken_etag(headers)
+                elif content_type in COMPRESSIBLE_TYPES and _header(headers, b"content-encoding") is None:
+                    # 본문을 보고 압축 여부를 정하므로 시작 메시지는 잠시 보류
+                    start_message = dict(message, headers=headers + [(b"vary", b"Accept-Encoding")])
+                    return
+                await send(message)
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+
+            pending, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < settings.COMPRESSION_MIN_SIZE:
+                # 스트리밍 응답이나 작은 응답은 그대로 보낸다
+                await send(pending)
+                await send(message)
+                return
+
+            headers = pending["headers"]
+            etag = _header(headers, b"etag")
+            cache_key = None
+            compressed = None
+            if etag is not None and pending["status"] == 200:
+                cache_key = (path, etag.decode("latin-1"), encoding)
+                compressed = compressed_cache.get(cache_key)
+                if compressed is not None:
+                    metrics.incr("compression.cache_hits")
+
+            if compressed is None:
+                compressed = compress(body, encoding)
+                if cache_key is not None:
+                    compressed_cache.set(cache_key, compressed)
+
+            if len(compressed) >= len(body):
+                await send(pending)
+                await send(message)
+                return
+
+            metrics.incr("compression.responses")
+            metrics.incr("compression.bytes_in", len(body))
+            metrics.incr("compression.bytes_saved", len(body) - len(compressed))
+
+            headers = [(key, value) for key, value in _weaken_etag(headers) if key.lower() != b"content-length"]
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+            ]
+            await send(dict(pending, headers=headers))
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
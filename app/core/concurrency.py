@@ -0,0 +1,35 @@
+"""
+키별 동시 실행 제한
+
+같은 키(예: 클라이언트 IP)로 동시에 처리 중인 요청 수를 프로세스 단위로 제한합니다.
+기다리게 하지 않고 바로 거절하므로, 한 클라이언트가 비싼 작업(비밀번호 해싱 등)으로
+워커를 독점하지 못합니다.
+"""
+from typing import Dict
+
+
+class KeyedConcurrencyLimiter:
+    """키별 동시 실행 수 제한 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active: Dict[str, int] = {}
+
+    def acquire(self, key: str) -> bool:
+        """자리가 있으면 점유하고 True, 한도에 도달했으면 False"""
+        current = self._active.get(key, 0)
+        if current >= self.limit:
+            return False
+        self._active[key] = current + 1
+        return True
+
+    def release(self, key: str) -> None:
+        current = self._active.get(key, 0)
+        if current <= 1:
+            # 유휴 키가 쌓이지 않도록 0이 되면 제거
+            self._active.pop(key, None)
+        else:
+            self._active[key] = current - 1
+
+    def active(self, key: str) -> int:
+        return self._active.get(key, 0)
@@ -0,0 +1,190 @@
+"""
+목록 전체 개수 계산 전략
+
+정확한 COUNT(*)는 필터 조건에 맞는 행을 모두 읽어야 하므로 큰 테이블에서는
+페이지 조회보다 비쌀 수 있습니다. 이 모듈은 다음 순서로 개수를 구합니다.
+
+1. PostgreSQL이 아니면 정확한 COUNT
+2. COUNT_EXACT_THRESHOLD + 1건까지만 세는 제한 COUNT → 임계값 이하면 정확한 값
+3. 임계값을 넘으면 백그라운드에서 갱신한 캐시 값 (Redis 또는 로컬)
+4. 캐시가 없으면 pg_class.reltuples(필터 없음) 또는 실행 계획 추정치
+
+3, 4번 결과는 is_estimate=True로 표시합니다. 임계값을 넘은 필터 조합은
+최근 사용 순으로 기록해 두고 run_count_refresher()가 주기적으로 정확한 값을
+다시 계산해 캐시에 저장합니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "count"
+
+
+def _count_key(query: Query) -> str:
+    """SQL 문과 바인드 값으로 필터 조합 식별 키 생성"""
+    compiled = query.statement.compile()
+    raw = json.dumps([str(compiled), compiled.params], sort_keys=True, default=str, ensure_ascii=False)
+    return f"{KEY_PREFIX}:v{settings.CACHE_KEY_VERSION}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+class CountStrategy:
+    """정확한 개수 / 캐시된 개수 / 추정치 선택"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 임계값을 넘은 필터 조합 (key -> 필터만 적용된 쿼리)
+        self._hot: "OrderedDict[str, Query]" = OrderedDict()
+        # Redis를 사용할 수 없을 때의 캐시 (key -> (만료 시각, 개수))
+        self._local: Dict[str, Tuple[float, int]] = {}
+
+    def count(self, query: Query) -> Tuple[int, bool]:
+        """(개수, 추정치 여부) 반환 (query는 정렬 미적용 상태)"""
+        query = query.order_by(None)
+        bind = query.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return query.count(), False
+
+        threshold = settings.COUNT_EXACT_THRESHOLD
+        bounded = query.session.query(func.count()).select_from(
+            query.limit(threshold + 1).subquery()
+        ).scalar()
+        if bounded <= threshold:
+            return bounded, False
+
+        key = _count_key(query)
+        self._remember(key, query)
+
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached, True
+
+        estimate = self._estimate(query)
+        if estimate is None:
+            total = query.count()
+            self._set_cached(key, total)
+            return total, False
+
+        # 제한 COUNT로 임계값을 넘는 것은 확인했으므로 추정치가 작으면 보정
+        return max(estimate, threshold + 1), True
+
+    # 추정
+    def _estimate(self, query: Query) -> Optional[int]:
+        session = query.session
+        try:
+            # 추정 실패가 요청 트랜잭션을 중단시키지 않도록 세이브포인트 안에서 실행
+            with session.begin_nested():
+                return self._estimate_rows(session, query)
+        except Exception:
+            logger.warning("개수 추정 실패", exc_info=True)
+            return None
+
+    @staticmethod
+    def _estimate_rows(session, query: Query) -> int:
+        if query.whereclause is None and len(query.statement.get_final_froms()) == 1:
+            table = query.statement.get_final_froms()[0]
+            reltuples = session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+                {"name": table.name}
+            ).scalar()
+            # 한 번도 ANALYZE되지 않은 테이블은 -1
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+
+        compiled = query.statement.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        # 리터럴에 포함된 콜론이 바인드 파라미터로 해석되지 않도록 드라이버에 직접 전달
+        plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    # 캐시
+    def _get_cached(self, key: str) -> Optional[int]:
+        client = get_redis()
+        if client is not None:
+            try:
+                value = client.get(key)
+                return int(value) if value is not None else None
+            except Exception:
+                logger.warning("개수 캐시 조회 실패: %s", key, exc_info=True)
+
+        with self._lock:
+            entry = self._local.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _set_cached(self, key: str, total: int) -> None:
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, total, ex=settings.COUNT_CACHE_TTL)
+                return
+            except Exception:
+                logger.warning("개수 캐시 저장 실패: %s", key, exc_info=True)
+
+        with self._lock:
+            self._local[key] = (time.monotonic() + settings.COUNT_CACHE_TTL, total)
+
+    def _remember(self, key: str, query: Query) -> None:
+        with self._lock:
+            # 요청 세션을 붙잡지 않도록 세션을 떼어 보관
+            self._hot[key] = query.with_session(None)
+            self._hot.move_to_end(key)
+            while len(self._hot) > settings.COUNT_HOT_KEYS_MAX:
+                evicted, _ = self._hot.popitem(last=False)
+                self._local.pop(evicted, None)
+
+    # 백그라운드 갱신
+    def refresh(self) -> int:
+        """기록된 필터 조합의 정확한 개수를 다시 계산해 캐시에 저장"""
+        with self._lock:
+            hot = list(self._hot.items())
+
+        if not hot:
+            return 0
+
+        db = SessionLocal()
+        refreshed = 0
+        try:
+            for key, query in hot:
+                try:
+                    self._set_cached(key, query.with_session(db).count())
+                    refreshed += 1
+                except Exception:
+                    db.rollback()
+                    logger.warning("개수 캐시 갱신 실패: %s", key, exc_info=True)
+        finally:
+            db.close()
+        return refreshed
+
+
+count_strategy = CountStrategy()
+
+
+def count_total(query: Query) -> Tuple[int, bool]:
+    """목록 전체 개수 조회 (개수, 추정치 여부)"""
+    return count_strategy.count(query)
+
+
+async def run_count_refresher() -> None:
+    """자주 조회되는 큰 목록의 개수를 주기적으로 갱신"""
+    while True:
+        await asyncio.sleep(settings.COUNT_REFRESH_INTERVAL)
+        await asyncio.to_thread(count_strategy.refresh)
@@ -1,7 +1,10 @@
 """
 데이터베이스 연결 및 세션 관리
 """
-from sqlalchemy import create_engine
+import asyncio
+import zlib
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
@@ -25,6 +28,9 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # 베이스 클래스
 Base = declarative_base()
 
+# init_db 동시 실행 방지용 PostgreSQL advisory lock 키
+INIT_DB_LOCK_KEY = zlib.crc32(b"koreanforyou:init_db")
+
 
 def get_db() -> Generator[Session, None, None]:
     """데이터베이스 세션 의존성"""
@@ -35,7 +41,15 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _create_tables() -> None:
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # 여러 워커가 동시에 시작해도 한 번에 하나만 테이블을 만든다 (트랜잭션 종료 시 해제)
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": INIT_DB_LOCK_KEY})
+        Base.metadata.create_all(bind=conn)
+
+
 async def init_db():
     """데이터베이스 초기화"""
-    # 모든 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    # 모든 테이블 생성 (이벤트 루프를 막지 않도록 스레드에서)
+    await asyncio.to_thread(_create_tables)
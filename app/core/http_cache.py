@@ -0,0 +1,179 @@
+"""
+학습 콘텐츠 HTTP 캐시 (ETag, 조건부 GET)
+
+챕터/문장/시나리오 응답의 ETag는 콘텐츠 버전 카운터로 만듭니다. 콘텐츠 쓰기 작업
+(ChapterService, SentenceService, ScenarioService)이 bump_content_version()으로 버전을
+올리면 모든 콘텐츠 응답의 ETag가 바뀝니다. 응답 본문을 만들지 않고 버전만으로
+비교하므로 If-None-Match가 일치하면 DB 조회 전에 304를 반환합니다.
+
+ETag는 응답 본문보다 앞서면 안 됩니다. 새 ETag로 이전 본문이 클라이언트에 저장되면
+다음 쓰기 전까지 304로 이전 본문이 계속 쓰이기 때문입니다. 그래서 ETag에는 Redis의
+최신 버전(content:version)이 아니라 이 워커가 "반영한" 버전을 씁니다.
+
+- 쓰기 워커는 콘텐츠 태그 무효화 후 버전을 올리고, 올린 값을 content_version:{버전}
+  태그로 보냅니다. 받는 워커는 같은 채널에서 콘텐츠 태그 무효화(로컬 캐시 삭제, 스냅샷
+  stale 표시)를 먼저 처리한 뒤 이 버전을 반영하므로, 이후 본문은 그 버전 이상입니다.
+- 메시지를 놓친 경우에 대비해 CONTENT_VERSION_LOCAL_TTL마다 Redis 버전을 읽고, 반영한
+  버전과 다르면 콘텐츠 태그를 로컬에서 무효화한 뒤 반영합니다.
+- REDIS_URL이 없으면 다른 워커의 쓰기를 알 수 없으므로 워커별 쓰기 횟수와 시간 구간으로
+  ETag를 만듭니다. 다른 워커의 쓰기는 로컬 캐시(CACHE_LOCAL_TTL)와 스냅샷
+  (CONTENT_SNAPSHOT_REFRESH_INTERVAL) 중 긴 쪽이 지나야 본문에 반영되므로, 그만큼 지난
+  구간 번호를 붙여 ETag가 본문보다 늦게 바뀌게 합니다.
+Redis 조회가 실패하면 ETag 없이 응답합니다.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.cache import invalidate_local_tags, invalidate_tags, register_invalidation_handler
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "content:version"
+VERSION_TAG_PREFIX = "content_version:"
+
+# 콘텐츠 응답 본문이 쓰는 캐시 태그 (메시지를 놓쳤을 때 로컬에서 무효화)
+CONTENT_TAGS = ("chapters", "sentences", "categories")
+
+# Redis 미사용 시 워커 구분 (재시작 후 이전 ETag와 겹치지 않게)
+# preload_app으로 마스터에서 import한 뒤 fork하므로 워커마다 새로 만든다
+BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def _reset_boot_id() -> None:
+    global BOOT_ID
+    BOOT_ID = uuid.uuid4().hex[:8]
+
+
+os.register_at_fork(after_in_child=_reset_boot_id)
+
+
+class ContentVersion:
+    """콘텐츠 버전 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 이 워커가 반영한 버전 (None이면 아직 읽지 않음)
+        self._applied: Optional[int] = None
+        self._checked_at = 0.0
+        self._local = 0
+
+    def current(self) -> Optional[str]:
+        """이 워커의 응답 본문이 반영한 버전 (확인할 수 없으면 None)"""
+        client = get_redis()
+        if client is None:
+            window = _propagation_window()
+            bucket = int((time.time() - window) // window)
+            return f"{BOOT_ID}.{self._local}.{bucket}"
+
+        with self._lock:
+            if self._applied is not None and time.monotonic() - self._checked_at < settings.CONTENT_VERSION_LOCAL_TTL:
+                return str(self._applied)
+
+        try:
+            raw = client.get(VERSION_KEY)
+        except Exception:
+            logger.warning("콘텐츠 버전 조회 실패", exc_info=True)
+            return None
+
+        latest = int(raw or 0)
+        with self._lock:
+            missed = self._applied is not None and latest != self._applied
+        if missed:
+            # 무효화 메시지를 놓쳤거나 아직 받지 못함: 본문을 먼저 최신으로 만든 뒤 반영
+            invalidate_local_tags(*CONTENT_TAGS)
+        with self._lock:
+            self._applied = latest
+            self._checked_at = time.monotonic()
+        return str(latest)
+
+    def bump(self) -> None:
+        """콘텐츠 쓰기 커밋 후, 콘텐츠 태그 무효화 다음에 호출"""
+        with self._lock:
+            self._local += 1
+
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            version = client.incr(VERSION_KEY)
+        except Exception:
+            logger.warning("콘텐츠 버전 갱신 실패", exc_info=True)
+            return
+        # 이 워커와 다른 워커에 반영 (콘텐츠 태그 무효화 메시지 다음에 도착)
+        invalidate_tags(f"{VERSION_TAG_PREFIX}{version}")
+
+    def on_invalidate(self, tags: List[str]) -> None:
+        for tag in tags:
+            if not tag.startswith(VERSION_TAG_PREFIX):
+                continue
+            version = int(tag[len(VERSION_TAG_PREFIX):])
+            with self._lock:
+                # 메시지가 Redis 직접 조회보다 늦게 도착하면 되돌리지 않는다
+                if self._applied is None or version > self._applied:
+                    self._applied = version
+
+
+def _propagation_window() -> int:
+    """Redis 미사용 시 다른 워커의 쓰기가 이 워커 본문에 반영되기까지 걸리는 최대 시간 (초)"""
+    window = settings.CACHE_LOCAL_TTL
+    if settings.CONTENT_SNAPSHOT_ENABLED:
+        window = max(window, settings.CONTENT_SNAPSHOT_REFRESH_INTERVAL)
+    return max(window, 1)
+
+
+content_version = ContentVersion()
+register_invalidation_handler(content_version.on_invalidate)
+
+
+def bump_content_version() -> None:
+    """챕터/문장/시나리오 변경 후 호출 (콘텐츠 응답 ETag 갱신)"""
+    content_version.bump()
+
+
+def content_etag() -> Optional[str]:
+    version = content_version.current()
+    if version is None:
+        return None
+    # 응답 스키마가 바뀌는 배포에서는 CACHE_KEY_VERSION을 올려 ETag도 바뀌게 한다
+    return f'"{settings.CACHE_KEY_VERSION}-{version}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교 (W/ 접두사 무시)
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+def content_cache(request: Request, response: Response) -> None:
+    """
+    콘텐츠 GET 엔드포인트용 의존성
+
+    If-None-Match가 현재 ETag와 같으면 304를 발생시키고(엔드포인트 실행 안 함),
+    아니면 응답에 ETag와 Cache-Control을 붙입니다.
+    """
+    etag = content_etag()
+    if etag is None:
+        return
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.CONTENT_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={settings.CONTENT_CACHE_STALE_WHILE_REVALIDATE}"
+        )
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -0,0 +1,83 @@
+"""
+지연 시간/처리량 지표 (프로세스 단위)
+
+최근 METRICS_SAMPLE_SIZE개 관측값으로 분위수를 계산하고, 누적 횟수와 합계를
+함께 보관합니다. /api/stats/metrics에서 조회합니다.
+
+    metrics.observe("llm.ttft_ms", 412.5)
+    metrics.incr("llm.errors")
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+from app.core.config import settings
+
+
+def _percentile(ordered, ratio: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class _Series:
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+
+class Metrics:
+    """이름별 관측값과 카운터"""
+
+    def __init__(self, sample_size: int):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+        self._counters: Dict[str, int] = {}
+
+    def observe(self, name: str, value: float) -> None:
+        """관측값 기록 (지연 시간은 ms 단위 권장)"""
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series(self.sample_size)
+            series.samples.append(value)
+            series.count += 1
+            series.total += value
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            series = {
+                name: (sorted(item.samples), item.count, item.total)
+                for name, item in self._series.items()
+            }
+            counters = dict(self._counters)
+
+        result: Dict[str, Any] = {"counters": counters, "series": {}}
+        for name, (ordered, count, total) in series.items():
+            if not ordered:
+                continue
+            result["series"][name] = {
+                "count": count,
+                "mean": round(total / count, 3),
+                "p50": round(_percentile(ordered, 0.5), 3),
+                "p95": round(_percentile(ordered, 0.95), 3),
+                "p99": round(_percentile(ordered, 0.99), 3),
+                "max": round(ordered[-1], 3)
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._counters.clear()
+
+
+metrics = Metrics(settings.METRICS_SAMPLE_SIZE)
@@ -0,0 +1,138 @@
+"""
+페이지네이션 유틸리티 (offset / keyset 커서)
+
+커서는 정렬 기준 이름, 마지막 항목의 정렬 값, 기본 키를 base64url JSON으로
+인코딩한 불투명 문자열입니다. 커서가 주어지면 OFFSET 대신
+(정렬 값, 기본 키) 비교 조건으로 다음 페이지를 조회하므로 페이지 깊이와
+무관하게 인덱스 범위 스캔 한 번으로 응답합니다.
+"""
+import base64
+import bisect
+import json
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.core.counting import count_total
+
+
+class Page(NamedTuple):
+    """목록 조회 결과"""
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+    is_estimate: bool = False
+
+
+class InvalidCursorError(ValueError):
+    """잘못된 커서"""
+
+
+def encode_cursor(sort: str, value: Any, pk: int) -> str:
+    """정렬 값과 기본 키를 커서 문자열로 인코딩"""
+    payload = {"s": sort, "id": pk}
+    if isinstance(value, datetime):
+        payload["dt"] = value.isoformat()
+    else:
+        payload["v"] = value
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """커서 문자열에서 (정렬 값, 기본 키) 복원"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort:
+            raise InvalidCursorError("정렬 기준이 다른 커서입니다")
+        value = datetime.fromisoformat(payload["dt"]) if "dt" in payload else payload.get("v")
+        return value, int(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("유효하지 않은 커서입니다") from e
+
+
+def paginate(
+    query: Query,
+    pk,
+    page: int,
+    size: int,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    sort_key=None,
+    descending: bool = False,
+    sort_name: str = "id",
+    sort_value: Optional[Callable[[Any], Any]] = None
+) -> Page:
+    """
+    SQLAlchemy 쿼리 페이지네이션
+
+    Args:
+        query: 필터가 적용된 쿼리 (정렬 미적용)
+        pk: 동률 정렬 및 커서에 사용할 기본 키 컬럼
+        sort_key: 정렬 컬럼 (None이면 기본 키로만 정렬)
+        descending: 내림차순 여부
+        sort_name: 커서에 기록할 정렬 기준 이름
+        sort_value: 행에서 정렬 값을 꺼내는 함수 (기본값: sort_key 속성)
+    """
+    total, is_estimate = count_total(query) if include_total else (None, False)
+
+    if cursor:
+        if sort_key is None:
+            _, last_pk = decode_cursor(cursor, sort_name)
+            query = query.filter(pk < last_pk if descending else pk > last_pk)
+        else:
+            last_value, last_pk = decode_cursor(cursor, sort_name)
+            row_key = tuple_(sort_key, pk)
+            query = query.filter(
+                row_key < (last_value, last_pk) if descending else row_key > (last_value, last_pk)
+            )
+
+    columns = [pk] if sort_key is None else [sort_key, pk]
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+    if not cursor:
+        query = query.offset((page - 1) * size)
+
+    # 한 건 더 조회해 다음 페이지 존재 여부 확인
+    rows = query.limit(size + 1).all()
+    items = rows[:size]
+
+    next_cursor = None
+    if len(rows) > size:
+        last = items[-1]
+        if sort_value is not None:
+            value = sort_value(last)
+        elif sort_key is not None:
+            value = getattr(last, sort_key.key)
+        else:
+            value = None
+        next_cursor = encode_cursor(sort_name, value, getattr(last, pk.key))
+
+    return Page(items, total, next_cursor, is_estimate)
+
+
+def paginate_sequence(
+    items: Sequence[Any],
+    pk_name: str,
+    page: int,
+    size: int,
+    cursor: Optional[str] = None,
+    sort_name: str = "id"
+) -> Page:
+    """기본 키 오름차순으로 정렬된 메모리 내 시퀀스 페이지네이션"""
+    if cursor:
+        _, last_pk = decode_cursor(cursor, sort_name)
+        start = bisect.bisect_right(items, last_pk, key=lambda item: getattr(item, pk_name))
+    else:
+        start = (page - 1) * size
+
+    page_items = list(items[start:start + size])
+    next_cursor = None
+    if start + size < len(items) and page_items:
+        next_cursor = encode_cursor(sort_name, None, getattr(page_items[-1], pk_name))
+
+    return Page(page_items, len(items), next_cursor)
@@ -0,0 +1,64 @@
+"""
+SQL 실행 횟수 측정
+
+N+1 조회 회귀를 잡기 위한 도구입니다. 블록 안에서 실행된 SQL 문을 기록하고
+허용 횟수를 넘으면 AssertionError를 발생시킵니다.
+
+    with assert_max_queries(3):
+        client.get("/api/posts/")
+
+    with count_queries() as counter:
+        service.get_posts()
+    print(counter.count, counter.statements)
+"""
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine as default_engine
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 기록"""
+
+    def __init__(self, thread_only: bool = False):
+        self.statements: List[str] = []
+        # 요청 처리 스레드가 다를 수 있으므로 기본은 모든 스레드 기록
+        self._thread_id = threading.get_ident() if thread_only else None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._thread_id is not None and threading.get_ident() != self._thread_id:
+            return
+        with self._lock:
+            self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None, thread_only: bool = False) -> Iterator[QueryCounter]:
+    """블록 안에서 실행된 SQL 문 수 측정"""
+    target = engine or default_engine
+    counter = QueryCounter(thread_only=thread_only)
+    event.listen(target, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter._on_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """블록 안에서 실행된 SQL 문이 limit개를 넘으면 실패"""
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > limit:
+        executed = "\n".join(f"  {i + 1}. {statement}" for i, statement in enumerate(counter.statements))
+        raise AssertionError(f"SQL {counter.count}회 실행 (허용 {limit}회):\n{executed}")
@@ -0,0 +1,241 @@
+"""
+요청 수 제한 ASGI 미들웨어
+
+경로/메서드로 정책을 고르고(먼저 일치한 정책 하나만 적용) 정책의 키(IP 또는 사용자)별로
+슬라이딩 윈도 카운터를 셉니다. 직전 윈도 개수에 남은 비율을 곱해 현재 윈도 개수에
+더하는 근사 방식이라 키마다 카운터 두 개만 유지합니다.
+
+카운터는 Redis(ratelimit:{정책}:{키}:{윈도 번호})에 INCR로 기록하고 한 번의
+파이프라인 왕복으로 확인합니다. REDIS_URL이 없거나 Redis 호출이 실패하면 워커 로컬
+카운터를 사용합니다(워커마다 따로 셈).
+
+응답에는 RateLimit-Limit / RateLimit-Remaining / RateLimit-Reset / RateLimit-Policy
+헤더를 붙이고, 초과 시 429와 Retry-After를 반환합니다. 거절된 요청도 카운터에
+포함되므로 계속 초과해서 보내는 클라이언트는 보내는 속도를 줄여야 풀립니다.
+"""
+import json
+import logging
+import math
+import threading
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class RateLimitPolicy(NamedTuple):
+    name: str
+    methods: FrozenSet[str]
+    path_prefix: str
+    limit: int
+    window: int  # 초
+    per_user: bool  # False면 IP별, True면 사용자별 (토큰이 없으면 IP별)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    reset: int  # 남은 요청 수가 다시 생기기까지 걸리는 시간 (초)
+
+
+def parse_rate(spec: str) -> Tuple[int, int]:
+    """"요청 수/초" 형식 파싱"""
+    count, _, seconds = spec.partition("/")
+    return int(count), int(seconds or 1)
+
+
+def default_policies() -> List[RateLimitPolicy]:
+    """설정으로 만든 기본 정책 (먼저 일치한 정책 하나만 적용)"""
+    specs = [
+        ("login", frozenset({"POST"}), "/api/auth/login", settings.RATE_LIMIT_LOGIN, False),
+        ("stt", frozenset({"POST"}), "/api/external/stt/", settings.RATE_LIMIT_STT, True),
+        ("write", WRITE_METHODS, "/api/", settings.RATE_LIMIT_WRITE, True),
+    ]
+    policies = []
+    for name, methods, prefix, spec, per_user in specs:
+        limit, window = parse_rate(spec)
+        if limit > 0:
+            policies.append(RateLimitPolicy(name, methods, prefix, limit, window, per_user))
+    return policies
+
+
+def _evaluate(policy: RateLimitPolicy, now: float, previous: int, current: int) -> RateLimitResult:
+    window = policy.window
+    elapsed = now % window
+    weight = 1 - elapsed / window
+    estimated = previous * weight + current
+    allowed = estimated <= policy.limit
+    remaining = max(0, math.floor(policy.limit - estimated))
+
+    if remaining > 0:
+        reset = window - elapsed
+    elif current < policy.limit and previous > 0:
+        # 직전 윈도 비중이 줄어 추정치가 한도 아래로 내려가는 시점
+        reset = window * (1 - (policy.limit - current) / previous) - elapsed
+    else:
+        # 다음 윈도에서 이번 윈도 개수의 비중이 충분히 줄어드는 시점
+        reset = window - elapsed + window * max(0.0, 1 - policy.limit / max(current, 1))
+    return RateLimitResult(allowed, remaining, max(1, math.ceil(reset)))
+
+
+class LocalCounters:
+    """워커 로컬 윈도 카운터 (키마다 현재/직전 윈도 개수만 유지)"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (윈도 번호, 현재 윈도 개수, 직전 윈도 개수, 더 이상 필요 없어지는 시각)
+        self._counts: Dict[str, Tuple[int, int, int, float]] = {}
+
+    def hit(self, key: str, window_index: int, window: int) -> Tuple[int, int]:
+        """현재 윈도 카운터를 올리고 (직전 윈도 개수, 현재 윈도 개수) 반환"""
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None and len(self._counts) >= self.max_keys:
+                self._prune()
+
+            if entry is not None and entry[0] == window_index:
+                current, previous = entry[1] + 1, entry[2]
+            elif entry is not None and entry[0] == window_index - 1:
+                current, previous = 1, entry[1]
+            else:
+                current, previous = 1, 0
+            self._counts[key] = (window_index, current, previous, (window_index + 2) * window)
+            return previous, current
+
+    def _prune(self) -> None:
+        now = time.time()
+        for key in [key for key, entry in self._counts.items() if entry[3] <= now]:
+            del self._counts[key]
+        if len(self._counts) >= self.max_keys:
+            # 활성 키만으로 가득 차면 비운다 (그 순간 제한이 잠시 느슨해짐)
+            metrics.incr("rate_limit.local_overflow")
+            self._counts.clear()
+
+
+class RateLimiter:
+    def __init__(self, policies: List[RateLimitPolicy]):
+        self.policies = policies
+        self._local = LocalCounters(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+
+    def match(self, method: str, path: str) -> Optional[RateLimitPolicy]:
+        for policy in self.policies:
+            if method in policy.methods and path.startswith(policy.path_prefix):
+                return policy
+        return None
+
+    def hit(self, policy: RateLimitPolicy, identity: str, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        window_index = int(now // policy.window)
+        key = f"{KEY_PREFIX}:{policy.name}:{identity}"
+
+        counts = self._hit_redis(key, window_index, policy.window)
+        if counts is None:
+            counts = self._local.hit(key, window_index, policy.window)
+        return _evaluate(policy, now, *counts)
+
+    @staticmethod
+    def _hit_redis(key: str, window_index: int, window: int) -> Optional[Tuple[int, int]]:
+        client = get_redis()
+        if client is None:
+            return None
+
+        current_key = f"{key}:{window_index}"
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.incr(current_key)
+            # 다음 윈도에서 직전 윈도 개수로 읽히도록 두 윈도 동안 유지
+            pipe.expire(current_key, window * 2)
+            pipe.get(f"{key}:{window_index - 1}")
+            current, _, previous = pipe.execute()
+        except Exception:
+            metrics.incr("rate_limit.redis_errors")
+            logger.warning("요청 수 제한 카운터 조회 실패, 로컬 카운터 사용", exc_info=True)
+            return None
+        return int(previous or 0), int(current)
+
+
+def _client_ip(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                # 검증된 클레임은 캐시되므로 이후 인증 의존성에서 다시 디코드하지 않는다
+                return str(verify_token(token).get("sub") or "") or None
+            except HTTPException:
+                return None
+    return None
+
+
+class RateLimitMiddleware:
+    """요청 수 제한 ASGI 미들웨어"""
+
+    def __init__(self, app, policies: Optional[List[RateLimitPolicy]] = None):
+        self.app = app
+        self.limiter = RateLimiter(default_policies() if policies is None else policies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.limiter.match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        identity = None
+        if policy.per_user:
+            user_id = _user_id(scope)
+            identity = f"user:{user_id}" if user_id else None
+        if identity is None:
+            identity = f"ip:{_client_ip(scope)}"
+
+        result = self.limiter.hit(policy, identity)
+        headers = [
+            (b"ratelimit-limit", str(policy.limit).encode()),
+            (b"ratelimit-remaining", str(result.remaining).encode()),
+            (b"ratelimit-reset", str(result.reset).encode()),
+            (b"ratelimit-policy", f"{policy.limit};w={policy.window}".encode()),
+        ]
+
+        if not result.allowed:
+            metrics.incr(f"rate_limit.rejected.{policy.name}")
+            body = json.dumps(
+                {"detail": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요"}, ensure_ascii=False
+            ).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(result.reset).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
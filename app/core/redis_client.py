@@ -0,0 +1,47 @@
+"""
+Redis 연결 관리 (캐싱, 집계용)
+"""
+import logging
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # redis는 선택 의존성
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def get_redis() -> Optional["redis.Redis"]:
+    """Redis 클라이언트 반환 (REDIS_URL 미설정 또는 패키지 미설치 시 None)"""
+    global _client
+
+    if _client is not None:
+        return _client
+
+    if not settings.REDIS_URL or redis is None:
+        return None
+
+    _client = redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        health_check_interval=30
+    )
+    return _client
+
+
+def close_redis() -> None:
+    """Redis 연결 종료"""
+    global _client
+
+    if _client is not None:
+        try:
+            _client.close()
+        except Exception:
+            logger.warning("Redis 연결 종료 중 오류", exc_info=True)
+        _client = None
@@ -0,0 +1,96 @@
+"""
+JSON 응답 직렬화
+
+- ORJSONResponse: 앱 기본 응답 클래스 (stdlib json 대신 orjson)
+- FastJSONRoute: response_model이 있는 엔드포인트의 반환값을 pydantic-core에서 바로
+  JSON 바이트로 검증/직렬화합니다. FastAPI 기본 경로(검증 → 파이썬 객체로 변환 →
+  json.dumps)에서 중간 dict/list를 만드는 단계를 건너뜁니다.
+
+엔드포인트나 의존성이 `response: Response` 매개변수로 바꾼 상태 코드/헤더는 기본 경로와
+같게 반영합니다. response_model_include/exclude 등 직렬화 옵션을 쓰는 엔드포인트는 기본
+경로를 그대로 사용합니다.
+"""
+import asyncio
+import functools
+from typing import Any, Callable, Optional
+
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import TypeAdapter, ValidationError
+from starlette.responses import Response
+
+__all__ = ["ORJSONResponse", "FastJSONRoute", "json_response_factory"]
+
+# 엔드포인트에 Response 매개변수가 없을 때 FastAPI가 공유 응답 객체를 넘겨줄 이름
+SUB_RESPONSE_PARAM = "_fast_json_sub_response"
+
+
+def json_response_factory(response_model: Any, status_code: int) -> Callable[..., Response]:
+    """반환값을 response_model로 검증해 JSON 응답으로 만드는 함수"""
+    adapter = TypeAdapter(response_model)
+
+    def render(content: Any, sub_response: Optional[Response] = None) -> Response:
+        if isinstance(content, Response):
+            return content
+        try:
+            value = adapter.validate_python(content, from_attributes=True)
+        except ValidationError as exc:
+            raise ResponseValidationError(errors=exc.errors(), body=content)
+
+        current_status = status_code
+        if sub_response is not None and sub_response.status_code:
+            current_status = sub_response.status_code
+        body = adapter.dump_json(value, by_alias=True) if is_body_allowed_for_status_code(current_status) else b""
+        response = Response(content=body, status_code=current_status, media_type="application/json")
+        if sub_response is not None:
+            response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    return render
+
+
+class FastJSONRoute(APIRoute):
+    """response_model 직렬화를 pydantic-core에서 바로 하는 라우트"""
+
+    def _uses_default_serialization(self) -> bool:
+        return (
+            self.response_model is not None
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+            and self.response_model_by_alias
+        )
+
+    def get_route_handler(self) -> Callable:
+        if self._uses_default_serialization():
+            render = json_response_factory(self.response_model, self.status_code or 200)
+            call = self.dependant.call
+
+            # 의존성에서 바꾼 상태 코드/헤더를 반영하려면 공유 응답 객체가 필요하다
+            param = self.dependant.response_param_name
+            if param is None:
+                param = self.dependant.response_param_name = SUB_RESPONSE_PARAM
+
+            def sub_response_of(kwargs) -> Response:
+                if param == SUB_RESPONSE_PARAM:
+                    return kwargs.pop(param)
+                return kwargs[param]
+
+            # 동기 엔드포인트는 스레드 풀에서 실행되므로 직렬화도 그 스레드에서 한다
+            if asyncio.iscoroutinefunction(call):
+                @functools.wraps(call)
+                async def endpoint(**kwargs):
+                    sub_response = sub_response_of(kwargs)
+                    return render(await call(**kwargs), sub_response)
+            else:
+                @functools.wraps(call)
+                def endpoint(**kwargs):
+                    sub_response = sub_response_of(kwargs)
+                    return render(call(**kwargs), sub_response)
+
+            self.dependant.call = endpoint
+        return super().get_route_handler()
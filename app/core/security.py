@@ -1,32 +1,119 @@
 """
 보안 관련 유틸리티 (JWT, 비밀번호 해싱 등)
 """
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, TypeVar, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.token_revocation import revocation_store
+
+T = TypeVar("T")
 
 
 # OAuth2 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-# 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 컨텍스트 (PASSWORD_BCRYPT_ROUNDS를 바꾸면 기존 해시는 로그인 시 재해싱)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """비밀번호 해싱 대기 작업이 가득 참"""
+
+
+class PasswordHasher:
+    """
+    bcrypt 연산 전용 스레드 풀
+    
+    bcrypt는 연산 중 GIL을 놓으므로 스레드 풀로도 여러 코어를 쓰고, 이벤트 루프는
+    그동안 다른 요청을 처리합니다. 대기 작업이 PASSWORD_HASH_MAX_PENDING개를 넘으면
+    큐에 쌓지 않고 PasswordHasherBusyError를 발생시킵니다.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 이벤트 루프 스레드에서만 변경
+        self._pending = 0
+    
+    @property
+    def pending(self) -> int:
+        return self._pending
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+    
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            metrics.incr("auth.password_hash_rejected")
+            raise PasswordHasherBusyError()
+        
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            metrics.observe("auth.password_hash_ms", (time.perf_counter() - started) * 1000)
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
+    """비밀번호 검증 (동기, 이벤트 루프 밖에서만 사용)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """비밀번호 해싱"""
+    """비밀번호 해싱 (동기, 이벤트 루프 밖에서만 사용)"""
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 (해싱 풀에서 실행)
+    
+    Returns:
+        (일치 여부, 비용 설정이 바뀌어 다시 만든 해시 또는 None)
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """비밀번호 해싱 (해싱 풀에서 실행)"""
+    return await password_hasher.run(pwd_context.hash, password)
+
+
+def new_token_id() -> str:
+    """토큰 jti / 토큰 패밀리 식별자 생성"""
+    return uuid.uuid4().hex
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """액세스 토큰 생성"""
     to_encode = data.copy()
@@ -35,7 +122,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": new_token_id()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -44,32 +131,113 @@ def create_refresh_token(data: dict) -> str:
     """리프레시 토큰 생성"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": new_token_id()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str) -> dict:
-    """토큰 검증"""
+class TokenCache:
+    """
+    검증된 토큰 클레임 LRU 캐시 (워커 로컬)
+    
+    키는 토큰의 SHA-256 해시이고, 항목은 토큰의 exp가 지나면 사용하지 않습니다.
+    서명 검증을 통과한 토큰만 저장하므로 캐시 적중은 다시 검증한 것과 같습니다.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # 토큰 해시 -> (exp 타임스탬프, 클레임)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def verify_token(token: str, check_revoked: bool = True) -> dict:
+    """
+    토큰 검증 (검증된 클레임은 exp까지 캐시)
+    
+    Args:
+        check_revoked: 폐기 목록 확인 여부 (리프레시 토큰 재사용 감지처럼 직접 확인할 때만 False)
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        metrics.incr("auth.token_cache_hits")
+    else:
+        metrics.incr("auth.token_cache_misses")
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            raise _credentials_exception()
+        token_cache.set(token, payload)
+    
+    if check_revoked and revocation_store.is_token_revoked(payload):
+        raise _credentials_exception()
+    return payload
+
+
+class Principal(NamedTuple):
+    """토큰 클레임으로 만든 인증 사용자 (DB 조회 없음)"""
+    user_id: int
+    email: Optional[str]
+    claims: Dict[str, Any]
+
+
+def get_principal(token: str) -> Principal:
+    """토큰에서 인증 사용자 추출"""
+    payload = verify_token(token)
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise _credentials_exception()
+    return Principal(user_id=user_id, email=payload.get("email"), claims=payload)
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """인증 사용자 의존성 (user_id만 필요한 핸들러용)"""
+    return get_principal(token)
 
 
 def get_current_user_id(token: str) -> int:
     """현재 사용자 ID 추출"""
-    payload = verify_token(token)
-    user_id: int = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user_id
+    return get_principal(token).user_id
@@ -0,0 +1,18 @@
+"""
+운영 서버 워커 (gunicorn + uvicorn)
+
+gunicorn.conf.py의 worker_class로 사용합니다. 기본 UvicornWorker는 loop/http를 "auto"로
+골라 패키지가 없으면 조용히 asyncio/h11로 내려가므로, 운영에서는 uvloop와 httptools를
+명시해 빠진 경우 시작 단계에서 실패하게 합니다.
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    """uvloop + httptools 고정 uvicorn 워커"""
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+    }
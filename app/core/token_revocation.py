@@ -0,0 +1,252 @@
+"""
+토큰 폐기 목록 (denylist)
+
+폐기 대상은 토큰 jti 또는 토큰 패밀리(fam, 로그인 한 번에서 이어지는 access/refresh 토큰)
+식별자이며, 원래 토큰의 만료 시각까지만 보관합니다.
+
+요청마다 하는 확인은 워커 로컬 블룸 필터로 먼저 거릅니다. 대부분의 토큰은 필터에서
+바로 통과하고, 필터가 "있을 수도 있음"이라고 답한 경우에만 Redis(auth:revoked:{id})를
+조회합니다. 다른 워커에서 폐기한 항목은 캐시 무효화 채널(token_revoked:{id} 태그)로
+받아 필터에 추가하고, 메시지를 놓친 경우에 대비해 TOKEN_REVOCATION_SYNC_INTERVAL마다
+Redis의 auth:revoked 정렬 집합(점수는 만료 시각)으로 필터를 다시 만듭니다. 블룸 필터는
+삭제를 지원하지 않으므로 재생성 때 만료된 항목이 빠집니다.
+
+REDIS_URL이 없으면 revoked_tokens 테이블에 보관합니다. 이때는 다른 워커의 폐기를
+알릴 채널이 없어 워커 로컬 블룸 필터를 믿을 수 없으므로, 요청마다 DB를 기본 키로
+조회합니다(jti와 fam을 한 번에). 폐기 추가는 기본 키 삽입이라 여러 워커에서 동시에
+같은 refresh 토큰을 써도 한 번만 성공합니다.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import invalidate_tags, register_invalidation_handler
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from app.models.user import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "auth:revoked"
+INDEX_KEY = KEY_PREFIX
+TAG_PREFIX = "token_revoked:"
+
+
+class BloomFilter:
+    """비트 배열 블룸 필터 (이중 해싱, 비트 수는 2의 거듭제곱)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        optimal_bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.size = 1 << max(3, math.ceil(math.log2(optimal_bits)))
+        self.hash_count = max(1, round(optimal_bits / capacity * math.log(2)))
+        self._mask = self.size - 1
+        self._bits = bytearray(self.size >> 3)
+
+    def _hashes(self, item: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def add(self, item: str) -> None:
+        h1, h2 = self._hashes(item)
+        bits, mask = self._bits, self._mask
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) & mask
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self._hashes(item)
+        bits, mask = self._bits, self._mask
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) & mask
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """블룸 필터 + Redis(또는 DB) 폐기 목록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = self._new_bloom(0)
+        # 재생성 중 추가된 항목 (새 필터로 교체할 때 옮겨 담음)
+        self._added_during_rebuild: Optional[List[str]] = None
+
+    @staticmethod
+    def _new_bloom(count: int) -> BloomFilter:
+        capacity = max(settings.TOKEN_REVOCATION_BLOOM_CAPACITY, count * 2)
+        return BloomFilter(capacity, settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE)
+
+    def revoke(self, revoked_id: str, expires_at: float) -> bool:
+        """
+        폐기 목록에 추가
+
+        Returns:
+            새로 추가했으면 True, 이미 폐기된 상태였으면 False (원자적)
+        """
+        ttl = int(math.ceil(expires_at - time.time()))
+        if ttl <= 0:
+            return True
+
+        client = get_redis()
+        if client is None:
+            return self._db_revoke(revoked_id, expires_at)
+
+        # 예외는 호출한 쪽으로 전달 (폐기 실패를 성공으로 취급하지 않는다)
+        if not client.set(f"{KEY_PREFIX}:{revoked_id}", 1, nx=True, ex=ttl):
+            return False
+        pipe = client.pipeline(transaction=False)
+        pipe.zadd(INDEX_KEY, {revoked_id: expires_at})
+        pipe.zremrangebyscore(INDEX_KEY, "-inf", time.time())
+        pipe.execute()
+
+        self.add_to_filter(revoked_id)
+        # 다른 워커의 블룸 필터에 전파
+        invalidate_tags(f"{TAG_PREFIX}{revoked_id}")
+        metrics.incr("auth.tokens_revoked")
+        return True
+
+    def add_to_filter(self, revoked_id: str) -> None:
+        with self._lock:
+            self._bloom.add(revoked_id)
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(revoked_id)
+
+    def is_revoked(self, revoked_id: str) -> bool:
+        """폐기 여부 (블룸 필터에 없으면 바로 False)"""
+        client = get_redis()
+        if client is None:
+            return self._db_is_revoked([revoked_id])
+
+        if revoked_id not in self._bloom:
+            return False
+
+        metrics.incr("auth.revocation_filter_hits")
+        try:
+            return bool(client.exists(f"{KEY_PREFIX}:{revoked_id}"))
+        except Exception:
+            # 필터에 걸린 토큰만 해당되므로 확인할 수 없으면 거부한다
+            logger.warning("토큰 폐기 여부 확인 실패: %s", revoked_id, exc_info=True)
+            return True
+
+    def is_token_revoked(self, claims: Dict[str, Any]) -> bool:
+        """토큰 자체(jti) 또는 토큰 패밀리(fam)가 폐기되었는지"""
+        if get_redis() is None:
+            return self._db_is_revoked([claims.get("jti"), claims.get("fam")])
+
+        jti = claims.get("jti")
+        if jti and self.is_revoked(jti):
+            return True
+        family = claims.get("fam")
+        return bool(family) and self.is_revoked(family)
+
+    def rebuild(self) -> None:
+        """현재 폐기 목록으로 블룸 필터 재생성 (만료 항목 제거)"""
+        now = time.time()
+        client = get_redis()
+        if client is None:
+            # 블룸 필터를 쓰지 않으므로 만료 항목 정리만
+            self._db_prune(now)
+            return
+
+        with self._lock:
+            self._added_during_rebuild = []
+        try:
+            client.zremrangebyscore(INDEX_KEY, "-inf", now)
+            ids = [
+                member.decode() if isinstance(member, bytes) else member
+                for member in client.zrangebyscore(INDEX_KEY, now, "+inf")
+            ]
+        except Exception:
+            logger.warning("토큰 폐기 목록 동기화 실패", exc_info=True)
+            with self._lock:
+                self._added_during_rebuild = None
+            return
+
+        bloom = self._new_bloom(len(ids))
+        for revoked_id in ids:
+            bloom.add(revoked_id)
+        with self._lock:
+            for revoked_id in self._added_during_rebuild:
+                bloom.add(revoked_id)
+            self._added_during_rebuild = None
+            self._bloom = bloom
+        metrics.observe("auth.revoked_ids", len(ids))
+
+    def on_invalidate(self, tags: List[str]) -> None:
+        for tag in tags:
+            if tag.startswith(TAG_PREFIX):
+                self.add_to_filter(tag[len(TAG_PREFIX):])
+
+    # Redis 미사용 시 DB 폐기 목록 (만료 시각은 UTC naive)
+    @staticmethod
+    def _db_revoke(revoked_id: str, expires_at: float) -> bool:
+        expires = datetime.utcfromtimestamp(expires_at)
+        db = SessionLocal()
+        try:
+            db.add(RevokedToken(revoked_id=revoked_id, expires_at=expires))
+            try:
+                db.commit()
+            except IntegrityError:
+                # 이미 있음: 만료된 행이면 조건부 UPDATE로 다시 폐기 (여러 워커 중 한 쪽만 성공)
+                db.rollback()
+                renewed = db.query(RevokedToken).filter(
+                    RevokedToken.revoked_id == revoked_id,
+                    RevokedToken.expires_at <= datetime.utcnow()
+                ).update({RevokedToken.expires_at: expires}, synchronize_session=False)
+                db.commit()
+                if not renewed:
+                    return False
+        finally:
+            db.close()
+        metrics.incr("auth.tokens_revoked")
+        return True
+
+    @staticmethod
+    def _db_is_revoked(revoked_ids: List[Optional[str]]) -> bool:
+        revoked_ids = [revoked_id for revoked_id in revoked_ids if revoked_id]
+        if not revoked_ids:
+            return False
+        db = SessionLocal()
+        try:
+            return db.query(RevokedToken.revoked_id).filter(
+                RevokedToken.revoked_id.in_(revoked_ids),
+                RevokedToken.expires_at > datetime.utcnow()
+            ).first() is not None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _db_prune(now: float) -> None:
+        db = SessionLocal()
+        try:
+            db.query(RevokedToken).filter(
+                RevokedToken.expires_at <= datetime.utcfromtimestamp(now)
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("토큰 폐기 목록 정리 실패", exc_info=True)
+        finally:
+            db.close()
+
+
+revocation_store = RevocationStore()
+register_invalidation_handler(revocation_store.on_invalidate)
+
+
+async def run_revocation_sync() -> None:
+    """시작 시 블룸 필터를 채우고, 무효화 메시지를 놓친 경우에 대비해 주기적으로 재생성"""
+    while True:
+        await asyncio.to_thread(revocation_store.rebuild)
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_INTERVAL)
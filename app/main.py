@@ -1,14 +1,33 @@
 """
 KoreanForYou FastAPI 서버 메인 애플리케이션
 """
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.redis_client import close_redis
+from app.core.security import PasswordHasherBusyError, password_hasher
+from app.core.cache import invalidation_listener
+from app.core.compression import CompressionMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.counting import run_count_refresher
+from app.core.token_revocation import run_revocation_sync
 from app.api.v1.api import api_router
+from app.services.unique_user_service import backfill_unique_user_sketches
+from app.services.community_search import backfill_search_text
+from app.services.content_snapshot import content_snapshot, run_snapshot_refresher
+from app.services.view_counter import run_view_count_flusher
+from app.services.trending_service import run_trending_worker
+from app.services.scenario_service import run_scenario_session_sweeper
+from app.services.llm_client import close_llm_client
+from app.services.feedback_jobs import run_feedback_workers
 
 
 @asynccontextmanager
@@ -16,8 +35,34 @@ async def lifespan(app: FastAPI):
     """애플리케이션 시작/종료 시 실행되는 함수"""
     # 시작 시
     await init_db()
+    invalidation_listener.start()
+    if settings.CONTENT_SNAPSHOT_ENABLED:
+        await asyncio.to_thread(content_snapshot.refresh)
+    snapshot_task = asyncio.create_task(run_snapshot_refresher())
+    count_task = asyncio.create_task(run_count_refresher())
+    revocation_task = asyncio.create_task(run_revocation_sync())
+    view_count_task = asyncio.create_task(run_view_count_flusher())
+    trending_task = asyncio.create_task(run_trending_worker())
+    scenario_session_task = asyncio.create_task(run_scenario_session_sweeper())
+    feedback_task = asyncio.create_task(run_feedback_workers())
+    backfill_task = asyncio.create_task(asyncio.to_thread(backfill_unique_user_sketches))
+    search_backfill_task = asyncio.create_task(asyncio.to_thread(backfill_search_text))
     yield
-    # 종료 시 (필요한 경우)
+    # 종료 시
+    snapshot_task.cancel()
+    count_task.cancel()
+    revocation_task.cancel()
+    view_count_task.cancel()
+    trending_task.cancel()
+    scenario_session_task.cancel()
+    feedback_task.cancel()
+    await asyncio.gather(view_count_task, feedback_task, return_exceptions=True)
+    await backfill_task
+    await search_backfill_task
+    invalidation_listener.stop()
+    await close_llm_client()
+    password_hasher.shutdown()
+    close_redis()
 
 
 app = FastAPI(
@@ -27,9 +72,16 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# 응답 압축
+app.add_middleware(CompressionMiddleware)
+
+# 요청 수 제한 (429 응답에도 CORS 헤더가 붙도록 CORS 안쪽에 둠)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +101,16 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api")
 
 
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    """비밀번호 해싱 대기열이 가득 찬 경우"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요"},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -1,20 +1,20 @@
 """
 데이터베이스 모델 정의
 """
-from .user import User, Job, UserLevel, UserStatus
-from .community import Post, Reply
+from .user import User, Job, UserLevel, UserStatus, RevokedToken
+from .community import Post, Reply, ViewCountFlush
 from .learning import (
     LearningCategory, Chapter, Sentence, SimilarSentence,
     ChapterFeedback, SentenceFeedback
 )
 from .progress import UserProgress, SentenceProgress
-from .scenario import Scenario, Role, ScenarioProgress, ScenarioFeedback
+from .scenario import Scenario, Role, ScenarioProgress, ScenarioTurn, ScenarioFeedback, ScenarioFeedbackJob
 
 __all__ = [
-    "User", "Job", "UserLevel", "UserStatus",
-    "Post", "Reply",
+    "User", "Job", "UserLevel", "UserStatus", "RevokedToken",
+    "Post", "Reply", "ViewCountFlush",
     "LearningCategory", "Chapter", "Sentence", "SimilarSentence",
     "ChapterFeedback", "SentenceFeedback",
     "UserProgress", "SentenceProgress",
-    "Scenario", "Role", "ScenarioProgress", "ScenarioFeedback"
+    "Scenario", "Role", "ScenarioProgress", "ScenarioTurn", "ScenarioFeedback", "ScenarioFeedbackJob"
 ]
@@ -1,8 +1,9 @@
 """
 커뮤니티 관련 모델
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index, DDL, event
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -26,12 +27,35 @@ class Post(Base):
     content = Column(Text, nullable=False)
     category = Column(Enum(PostCategory), nullable=False, default=PostCategory.FREE)
     view_count = Column(Integer, default=0)
+    # 검색용 문자 바이그램 (app/services/community_search.py에서 생성)
+    search_title = Column(Text)
+    search_content = Column(Text)
+    # 댓글 집계 (댓글 작성/삭제 시 같은 트랜잭션에서 갱신)
+    reply_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_reply_at = Column(DateTime)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # 관계 설정
     user = relationship("User", back_populates="posts")
     replies = relationship("Reply", back_populates="post")
+    
+    @hybrid_property
+    def last_activity_at(self):
+        """마지막 활동 시각 (마지막 댓글, 없으면 작성 시각)"""
+        return self.last_reply_at or self.created_at
+    
+    @last_activity_at.expression
+    def last_activity_at(cls):
+        return func.coalesce(cls.last_reply_at, cls.created_at).label("last_activity_at")
+    
+    # 목록 keyset 페이지네이션용 (정렬 컬럼, post_id)
+    __table_args__ = (
+        Index("ix_posts_created_at_post_id", "created_at", "post_id"),
+        Index("ix_posts_category_created_at_post_id", "category", "created_at", "post_id"),
+        Index("ix_posts_view_count_post_id", "view_count", "post_id"),
+        Index("ix_posts_last_activity_post_id", func.coalesce(last_reply_at, created_at), post_id),
+    )
 
 
 class Reply(Base):
@@ -41,10 +65,46 @@ class Reply(Base):
     reply_id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.post_id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    parent_reply_id = Column(Integer, ForeignKey("replies.reply_id", ondelete="CASCADE"), index=True)  # 대댓글이면 상위 댓글
     content = Column(Text, nullable=False)
+    search_content = Column(Text)  # 검색용 문자 바이그램
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # 관계 설정
     post = relationship("Post", back_populates="replies")
     user = relationship("User", back_populates="replies")
+    
+    # 게시글별 댓글 keyset 페이지네이션용
+    __table_args__ = (
+        Index("ix_replies_post_id_created_at_reply_id", "post_id", "created_at", "reply_id"),
+    )
+
+
+class ViewCountFlush(Base):
+    """반영한 조회수 증가분 묶음 기록 (같은 묶음 중복 반영 방지, app/services/view_counter.py)"""
+    __tablename__ = "view_count_flushes"
+    
+    batch_id = Column(String(32), primary_key=True)
+    post_count = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+
+
+# 검색 GIN 인덱스 (PostgreSQL 전용, 식은 community_search의 검색 문서 식과 같아야 인덱스 사용)
+event.listen(
+    Post.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING gin (("
+        "setweight(to_tsvector('simple'::regconfig, coalesce(search_title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(search_content, '')), 'B')))"
+    ).execute_if(dialect="postgresql")
+)
+event.listen(
+    Reply.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_replies_search ON replies USING gin ("
+        "(to_tsvector('simple'::regconfig, coalesce(search_content, ''))))"
+    ).execute_if(dialect="postgresql")
+)
@@ -1,7 +1,7 @@
 """
 시나리오 관련 모델
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -59,7 +59,10 @@ class ScenarioProgress(Base):
     
     turn_count = Column(Integer)  # 발화 횟수
     description = Column(Text)  # 상황 설명
-    conversation = Column(JSON)  # 대화 내역 (JSON 형태)
+    conversation = Column(JSON)  # 완료 시점 대화 내역 스냅샷 (진행 중 대화는 scenario_turns)
+    # LLM 프롬프트용 누적 요약 (app/services/conversation_context.py)
+    context_summary = Column(Text)
+    summarized_turn = Column(Integer, nullable=False, default=0, server_default="0")  # 요약에 포함된 마지막 턴 번호
     
     start_time = Column(DateTime, nullable=False, default=func.now())
     end_time = Column(DateTime)
@@ -71,6 +74,32 @@ class ScenarioProgress(Base):
     user_role = relationship("Role", foreign_keys=[user_role_id])
     ai_role = relationship("Role", foreign_keys=[ai_role_id])
     scenario_feedback = relationship("ScenarioFeedback", back_populates="scenario_progress")
+    turns = relationship(
+        "ScenarioTurn",
+        back_populates="scenario_progress",
+        order_by="ScenarioTurn.turn_number",
+        passive_deletes=True
+    )
+
+
+class ScenarioTurn(Base):
+    """시나리오 대화 턴 테이블 (턴마다 한 행씩 추가)"""
+    __tablename__ = "scenario_turns"
+    
+    turn_id = Column(Integer, primary_key=True, index=True)
+    progress_id = Column(Integer, ForeignKey("scenario_progress.progress_id", ondelete="CASCADE"), nullable=False)
+    turn_number = Column(Integer, nullable=False)
+    user_message = Column(Text, nullable=False)
+    ai_response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    
+    # 관계 설정
+    scenario_progress = relationship("ScenarioProgress", back_populates="turns")
+    
+    # 재전송된 턴은 같은 행을 덮어쓰고, 진행 기록별 턴 조회는 이 인덱스로 처리
+    __table_args__ = (
+        UniqueConstraint("progress_id", "turn_number", name="uq_scenario_turns_progress_id_turn_number"),
+    )
 
 
 class ScenarioFeedback(Base):
@@ -97,3 +126,21 @@ class ScenarioFeedback(Base):
     # 관계 설정
     user = relationship("User", back_populates="scenario_feedback")
     scenario_progress = relationship("ScenarioProgress", back_populates="scenario_feedback")
+
+
+class ScenarioFeedbackJob(Base):
+    """피드백 생성 작업 (Redis 미사용 시 워커 간 공유 대기열, app/services/feedback_jobs.py)"""
+    __tablename__ = "scenario_feedback_jobs"
+    
+    progress_id = Column(Integer, ForeignKey("scenario_progress.progress_id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(10), nullable=False)  # pending, running, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    queued_at = Column(DateTime, nullable=False)
+    available_at = Column(DateTime, nullable=False)  # 재시도 대기 중이면 다시 처리할 수 있는 시각
+    started_at = Column(DateTime)
+    error = Column(Text)
+    
+    # 작업자가 처리할 작업을 찾는 조회용
+    __table_args__ = (
+        Index("ix_scenario_feedback_jobs_status_available_at", "status", "available_at"),
+    )
@@ -83,3 +83,11 @@ class UserStatus(Base):
     
     # 관계 설정
     user = relationship("User", back_populates="user_status")
+
+
+class RevokedToken(Base):
+    """폐기한 토큰 jti/패밀리 (Redis 미사용 시 워커 간 공유 폐기 목록, app/core/token_revocation.py)"""
+    __tablename__ = "revoked_tokens"
+    
+    revoked_id = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # 원래 토큰 만료 시각 (UTC)
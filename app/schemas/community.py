@@ -1,7 +1,7 @@
 """
 커뮤니티 관련 스키마
 """
-from pydantic import BaseModel, validator
+from pydantic import AliasChoices, BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -14,6 +14,16 @@ class PostCategory(str, Enum):
     JOB_INFO = "취업정보"
 
 
+# 작성자
+class AuthorResponse(BaseModel):
+    user_id: int
+    nickname: Optional[str] = None
+    profile_img: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
 # 게시글 관련
 class PostBase(BaseModel):
     title: str
@@ -59,6 +69,9 @@ class PostResponse(PostBase):
     post_id: int
     user_id: int
     view_count: int
+    reply_count: int = 0
+    last_reply_at: Optional[datetime] = None
+    author: Optional[AuthorResponse] = Field(None, validation_alias=AliasChoices("user", "author"))
     created_at: datetime
     updated_at: datetime
     
@@ -68,9 +81,11 @@ class PostResponse(PostBase):
 
 class PostListResponse(BaseModel):
     posts: List[PostResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false면 생략
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    is_estimate: bool = False  # total이 추정치인지 여부
 
 
 # 댓글 관련
@@ -85,7 +100,7 @@ class ReplyBase(BaseModel):
 
 
 class ReplyCreate(ReplyBase):
-    pass
+    parent_reply_id: Optional[int] = None  # 대댓글이면 상위 댓글 ID
 
 
 class ReplyUpdate(ReplyBase):
@@ -96,6 +111,8 @@ class ReplyResponse(ReplyBase):
     reply_id: int
     post_id: int
     user_id: int
+    parent_reply_id: Optional[int] = None
+    author: Optional[AuthorResponse] = Field(None, validation_alias=AliasChoices("user", "author"))
     created_at: datetime
     updated_at: datetime
     
@@ -103,8 +120,25 @@ class ReplyResponse(ReplyBase):
         from_attributes = True
 
 
+class ReplyTreeResponse(ReplyResponse):
+    depth: int = 0
+    children: List["ReplyTreeResponse"] = []
+    has_more_replies: bool = False  # 깊이/개수 제한으로 생략된 대댓글 존재 여부
+
+
+class ReplyTreeListResponse(BaseModel):
+    replies: List[ReplyTreeResponse]  # 최상위 댓글 (대댓글은 children)
+    total: Optional[int] = None  # 최상위 댓글 수
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+    is_estimate: bool = False
+
+
 class ReplyListResponse(BaseModel):
     replies: List[ReplyResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false면 생략
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    is_estimate: bool = False  # total이 추정치인지 여부
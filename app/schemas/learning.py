@@ -69,9 +69,11 @@ class ChapterResponse(ChapterBase):
 
 class ChapterListResponse(BaseModel):
     chapters: List[ChapterResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false면 생략
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    is_estimate: bool = False  # total이 추정치인지 여부
 
 
 # 문장 관련
@@ -115,9 +117,11 @@ class SentenceResponse(SentenceBase):
 
 class SentenceListResponse(BaseModel):
     sentences: List[SentenceResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false면 생략
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    is_estimate: bool = False  # total이 추정치인지 여부
 
 
 # 유사 문장 관련
@@ -1,7 +1,7 @@
 """
 시나리오 관련 스키마
 """
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -55,9 +55,11 @@ class ScenarioResponse(ScenarioBase):
 
 class ScenarioListResponse(BaseModel):
     scenarios: List[ScenarioResponse]
-    total: int
+    total: Optional[int] = None  # include_total=false면 생략
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    is_estimate: bool = False  # total이 추정치인지 여부
 
 
 # 역할 관련
@@ -135,6 +137,15 @@ class ScenarioFeedbackResponse(ScenarioFeedbackBase):
         from_attributes = True
 
 
+# 피드백 생성 상태 (생성 전)
+class ScenarioFeedbackStatusResponse(BaseModel):
+    progress_id: int
+    status: str  # pending, running, failed
+    attempts: int = 0
+    queued_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 # 시나리오 시작 요청
 class ScenarioStartRequest(BaseModel):
     user_role_id: int
@@ -149,6 +160,21 @@ class ConversationTurnRequest(BaseModel):
     turn_number: int
 
 
+# 학습자 발화 최대 길이 (그대로 LLM 프롬프트에 들어가므로 제한)
+USER_MESSAGE_MAX_LENGTH = 500
+
+
+# AI 응답 스트리밍 턴 요청 (AI 응답은 서버에서 생성)
+class ScenarioTurnStreamRequest(BaseModel):
+    user_message: str = Field(..., max_length=USER_MESSAGE_MAX_LENGTH)
+    
+    @validator('user_message')
+    def validate_user_message(cls, v):
+        if not v.strip():
+            raise ValueError('메시지는 최소 1자 이상이어야 합니다')
+        return v
+
+
 # 시나리오 완료 요청
 class ScenarioCompleteRequest(BaseModel):
     final_conversation: List[Dict[str, Any]]
@@ -2,11 +2,17 @@
 챕터 관련 서비스
 """
 from sqlalchemy.orm import Session
-from typing import Optional, List, Tuple
+from typing import Optional, List
 from sqlalchemy import and_
 
+from app.core.cache import cached, invalidate_tags
+from app.core.http_cache import bump_content_version
+from app.core.pagination import Page, paginate
 from app.models.learning import Chapter, Sentence, LearningCategory
-from app.schemas.learning import ChapterCreate, ChapterUpdate
+from app.schemas.learning import (
+    ChapterCreate, ChapterUpdate, ChapterResponse, SentenceResponse, LearningCategoryResponse
+)
+from app.services.content_snapshot import get_content_snapshot
 
 
 class ChapterService:
@@ -18,9 +24,27 @@ class ChapterService:
         job_id: Optional[int] = None, 
         level_id: Optional[int] = None,
         page: int = 1, 
-        size: int = 20
-    ) -> Tuple[List[Chapter], int]:
-        """챕터 목록 조회"""
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """챕터 목록 조회 (cursor 지정 시 keyset 페이지네이션)"""
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.get_chapters(job_id, level_id, page, size, cursor)
+        
+        return self._query_chapters(job_id, level_id, page, size, cursor, include_total)
+    
+    @cached("chapters", tags=["chapters"], model=ChapterResponse)
+    def _query_chapters(
+        self, 
+        job_id: Optional[int], 
+        level_id: Optional[int],
+        page: int, 
+        size: int,
+        cursor: Optional[str],
+        include_total: bool
+    ) -> Page:
         query = self.db.query(Chapter).filter(Chapter.is_active == True)
         
         if job_id is not None:
@@ -29,13 +53,25 @@ class ChapterService:
         if level_id is not None:
             query = query.filter(Chapter.level_id == level_id)
         
-        total = query.count()
-        chapters = query.offset((page - 1) * size).limit(size).all()
-        
-        return chapters, total
+        return paginate(
+            query, Chapter.chapter_id, page, size,
+            cursor=cursor, include_total=include_total, sort_name="chapter_id"
+        )
     
     def get_chapter_by_id(self, chapter_id: int) -> Optional[Chapter]:
         """ID로 챕터 조회"""
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.chapters_by_id.get(chapter_id)
+        
+        return self._get_cached_chapter(chapter_id)
+    
+    @cached("chapter", tags=["chapters"], model=ChapterResponse)
+    def _get_cached_chapter(self, chapter_id: int) -> Optional[Chapter]:
+        return self._get_chapter(chapter_id)
+    
+    def _get_chapter(self, chapter_id: int) -> Optional[Chapter]:
+        """수정용 챕터 조회 (캐시 미사용)"""
         return self.db.query(Chapter).filter(Chapter.chapter_id == chapter_id).first()
     
     def create_chapter(self, chapter_data: ChapterCreate) -> Chapter:
@@ -46,11 +82,14 @@ class ChapterService:
         self.db.commit()
         self.db.refresh(chapter)
         
+        invalidate_tags("chapters")
+        bump_content_version()
+        
         return chapter
     
     def update_chapter(self, chapter_id: int, chapter_update: ChapterUpdate) -> Optional[Chapter]:
         """챕터 수정"""
-        chapter = self.get_chapter_by_id(chapter_id)
+        chapter = self._get_chapter(chapter_id)
         if not chapter:
             return None
         
@@ -61,36 +100,67 @@ class ChapterService:
         self.db.commit()
         self.db.refresh(chapter)
         
+        invalidate_tags("chapters")
+        bump_content_version()
+        
         return chapter
     
     def delete_chapter(self, chapter_id: int) -> bool:
         """챕터 삭제 (소프트 삭제)"""
-        chapter = self.get_chapter_by_id(chapter_id)
+        chapter = self._get_chapter(chapter_id)
         if not chapter:
             return False
         
         chapter.is_active = False
         self.db.commit()
         
+        invalidate_tags("chapters")
+        bump_content_version()
+        
         return True
     
     def get_chapter_sentences(
         self, 
         chapter_id: int, 
         page: int = 1, 
-        size: int = 20
-    ) -> Tuple[List[Sentence], int]:
-        """챕터 내 문장 목록 조회"""
-        query = self.db.query(Sentence).filter(Sentence.chapter_id == chapter_id)
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """챕터 내 문장 목록 조회 (cursor 지정 시 keyset 페이지네이션)"""
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.get_chapter_sentences(chapter_id, page, size, cursor)
         
-        total = query.count()
-        sentences = query.offset((page - 1) * size).limit(size).all()
+        return self._query_chapter_sentences(chapter_id, page, size, cursor, include_total)
+    
+    @cached("chapter_sentences", tags=["sentences"], model=SentenceResponse)
+    def _query_chapter_sentences(
+        self, 
+        chapter_id: int, 
+        page: int, 
+        size: int,
+        cursor: Optional[str],
+        include_total: bool
+    ) -> Page:
+        query = self.db.query(Sentence).filter(Sentence.chapter_id == chapter_id)
         
-        return sentences, total
+        return paginate(
+            query, Sentence.sentence_id, page, size,
+            cursor=cursor, include_total=include_total, sort_name="sentence_id"
+        )
     
     def get_learning_categories(self, job_id: Optional[int] = None) -> List[LearningCategory]:
         """학습 카테고리 조회"""
-        query = self.db.query(LearningCategory)
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.get_learning_categories(job_id)
+        
+        return self._query_learning_categories(job_id)
+    
+    @cached("learning_categories", tags=["categories"], model=LearningCategoryResponse)
+    def _query_learning_categories(self, job_id: Optional[int]) -> List[LearningCategory]:
+        query = self.db.query(LearningCategory).order_by(LearningCategory.category_id)
         
         if job_id is not None:
             query = query.filter(LearningCategory.job_id == job_id)
@@ -0,0 +1,154 @@
+"""
+커뮤니티 게시글/댓글 한국어 검색
+
+한국어는 조사·어미가 붙어 공백 단위 토큰화로는 검색이 잘 되지 않으므로,
+단어를 문자 바이그램("한국어" → "한국", "국어")으로 나눠 저장하고 검색어도
+같은 방식으로 나눠 모든 바이그램을 포함하는 문서를 찾습니다.
+
+PostgreSQL에서는 바이그램 컬럼의 tsvector 식에 GIN 인덱스를 두고
+(models/community.py) ts_rank_cd로 순위를 매깁니다. 제목 바이그램은 가중치 A,
+본문은 B로 제목 일치를 우선합니다. 다른 DB에서는 LIKE 검색으로 대체합니다.
+"""
+import logging
+import re
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, or_, update
+from sqlalchemy.orm import Query
+
+from app.core.database import SessionLocal
+from app.models.community import Post, Reply
+
+logger = logging.getLogger(__name__)
+
+# 밑줄은 PostgreSQL 파서가 구분자로 처리하므로 제외
+_WORD = re.compile(r"[^\W_]+")
+
+_CONFIG = literal_column("'simple'::regconfig")
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _bigrams(text: Optional[str]) -> List[str]:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    grams: List[str] = []
+    for word in _WORD.findall(normalized):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def to_search_text(text: Optional[str]) -> str:
+    """저장용 바이그램 문자열"""
+    return " ".join(_bigrams(text))
+
+
+def to_tsquery_text(query: str) -> Optional[str]:
+    """검색어를 to_tsquery 문자열로 변환 (한 글자 단어는 접두 일치)"""
+    terms = list(dict.fromkeys(_bigrams(query)))
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" if len(term) == 1 else f"'{term}'" for term in terms)
+
+
+def apply_post_search_text(post: Post) -> None:
+    """게시글 검색 컬럼 갱신 (작성/수정 시 호출)"""
+    post.search_title = to_search_text(post.title)
+    post.search_content = to_search_text(post.content)
+
+
+def apply_reply_search_text(reply: Reply) -> None:
+    """댓글 검색 컬럼 갱신 (작성/수정 시 호출)"""
+    reply.search_content = to_search_text(reply.content)
+
+
+def _to_tsvector(column):
+    return func.to_tsvector(_CONFIG, func.coalesce(column, literal_column("''")))
+
+
+def post_document():
+    """게시글 검색 문서 식 (ix_posts_search 인덱스 식과 동일)"""
+    return func.setweight(_to_tsvector(Post.search_title), literal_column("'A'")).op("||")(
+        func.setweight(_to_tsvector(Post.search_content), literal_column("'B'"))
+    )
+
+
+def reply_document():
+    """댓글 검색 문서 식 (ix_replies_search 인덱스 식과 동일)"""
+    return _to_tsvector(Reply.search_content)
+
+
+def search(query: Query, document, text_columns: List, keyword: str) -> Optional[Query]:
+    """
+    검색 조건과 순위 정렬 적용
+
+    Args:
+        query: 검색 대상 쿼리 (다른 필터 적용 가능)
+        document: PostgreSQL 검색 문서 식
+        text_columns: PostgreSQL이 아닐 때 LIKE로 검색할 원문 컬럼
+        keyword: 검색어
+
+    Returns:
+        검색어에 단어가 없으면 None
+    """
+    tsquery_text = to_tsquery_text(keyword)
+    if tsquery_text is None:
+        return None
+
+    if query.session.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery(_CONFIG, tsquery_text)
+        rank = func.ts_rank_cd(document, tsquery)
+        return query.filter(document.op("@@")(tsquery)).order_by(rank.desc())
+
+    for word in _WORD.findall(unicodedata.normalize("NFKC", keyword)):
+        query = query.filter(or_(*[column.ilike(f"%{word}%") for column in text_columns]))
+    return query
+
+
+def backfill_search_text() -> None:
+    """검색 컬럼이 비어 있는 기존 게시글/댓글 채우기 (애플리케이션 시작 시 호출)"""
+    db = SessionLocal()
+    try:
+        filled = 0
+        while True:
+            rows = db.query(Post.post_id, Post.title, Post.content, Post.updated_at).filter(
+                Post.search_content.is_(None)
+            ).limit(BACKFILL_BATCH_SIZE).all()
+            if not rows:
+                break
+            # updated_at을 그대로 넘겨 onupdate로 수정 시각이 바뀌지 않게 한다
+            db.execute(update(Post), [
+                {
+                    "post_id": post_id,
+                    "search_title": to_search_text(title),
+                    "search_content": to_search_text(content),
+                    "updated_at": updated_at
+                }
+                for post_id, title, content, updated_at in rows
+            ])
+            db.commit()
+            filled += len(rows)
+
+        while True:
+            rows = db.query(Reply.reply_id, Reply.content, Reply.updated_at).filter(
+                Reply.search_content.is_(None)
+            ).limit(BACKFILL_BATCH_SIZE).all()
+            if not rows:
+                break
+            db.execute(update(Reply), [
+                {"reply_id": reply_id, "search_content": to_search_text(content), "updated_at": updated_at}
+                for reply_id, content, updated_at in rows
+            ])
+            db.commit()
+            filled += len(rows)
+
+        if filled:
+            logger.info("커뮤니티 검색 컬럼 백필 완료: %d건", filled)
+    except Exception:
+        db.rollback()
+        logger.warning("커뮤니티 검색 컬럼 백필 실패", exc_info=True)
+    finally:
+        db.close()
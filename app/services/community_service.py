@@ -1,12 +1,54 @@
 """
 커뮤니티 관련 서비스
 """
-from sqlalchemy.orm import Session
-from typing import Optional, List, Tuple
-from sqlalchemy import desc, asc
+from sqlalchemy.orm import Session, Query, joinedload, aliased
+from typing import Dict, List, Optional
+from sqlalchemy import func, case, literal, select
 
+from app.core.config import settings
+from app.core.counting import count_total
+from app.core.pagination import Page, paginate
 from app.models.community import Post, Reply
+from app.models.user import User
 from app.schemas.community import PostCreate, PostUpdate, ReplyCreate, ReplyUpdate
+from app.services.community_search import (
+    search, post_document, reply_document, apply_post_search_text, apply_reply_search_text
+)
+from app.services.trending_service import TrendingService
+from app.services.view_counter import view_counter
+
+
+# 정렬 기준별 (정렬 컬럼, 내림차순 여부)
+POST_SORTS = {
+    "created_at": (Post.created_at, True),
+    "view_count": (Post.view_count, True),
+    "title": (Post.title, False),
+    "recent_activity": (Post.last_activity_at, True),
+}
+
+# 점수를 Redis 정렬 집합에서 읽는 정렬 기준 (trending_service 참고)
+TRENDING_SORT = "trending"
+
+
+def with_author(query: Query, relationship) -> Query:
+    """응답에 필요한 작성자 컬럼만 JOIN으로 함께 조회 (행마다 지연 로딩 방지)"""
+    return query.options(
+        joinedload(relationship).load_only(User.user_id, User.nickname, User.profile_img)
+    )
+
+
+class ReplyThread:
+    """댓글 트리 노드 (응답 변환 시 댓글 속성은 원본 댓글에서 읽음)"""
+    __slots__ = ("reply", "depth", "children", "has_more_replies")
+    
+    def __init__(self, reply: Reply, depth: int):
+        self.reply = reply
+        self.depth = depth
+        self.children: List["ReplyThread"] = []
+        self.has_more_replies = False
+    
+    def __getattr__(self, name):
+        return getattr(self.reply, name)
 
 
 class CommunityService:
@@ -18,30 +60,85 @@ class CommunityService:
         category: Optional[str] = None, 
         sort: str = "created_at",
         page: int = 1, 
-        size: int = 20
-    ) -> Tuple[List[Post], int]:
-        """게시글 목록 조회"""
-        query = self.db.query(Post)
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """게시글 목록 조회 (cursor 지정 시 keyset 페이지네이션)"""
+        query = with_author(self.db.query(Post), Post.user)
         
         if category:
             query = query.filter(Post.category == category)
         
-        # 정렬
-        if sort == "created_at":
-            query = query.order_by(desc(Post.created_at))
-        elif sort == "view_count":
-            query = query.order_by(desc(Post.view_count))
-        elif sort == "title":
-            query = query.order_by(asc(Post.title))
+        if sort == TRENDING_SORT:
+            result = TrendingService(self.db).get_posts(query, category, page, size, cursor, include_total)
+            view_counter.merge_into(result.items)
+            return result
         
-        total = query.count()
-        posts = query.offset((page - 1) * size).limit(size).all()
+        # 정렬 (동일 값은 post_id로 순서 고정)
+        if sort not in POST_SORTS:
+            sort = "created_at"
+        sort_key, descending = POST_SORTS[sort]
+        
+        result = paginate(
+            query, Post.post_id, page, size,
+            cursor=cursor, include_total=include_total,
+            sort_key=sort_key, descending=descending, sort_name=sort
+        )
+        view_counter.merge_into(result.items)
         
-        return posts, total
+        return result
+    
+    def search_posts(
+        self,
+        keyword: str,
+        category: Optional[str] = None,
+        page: int = 1,
+        size: int = 20,
+        include_total: bool = True
+    ) -> Page:
+        """게시글 검색 (제목·본문, 관련도순)"""
+        query = with_author(self.db.query(Post), Post.user)
+        
+        if category:
+            query = query.filter(Post.category == category)
+        
+        query = search(query, post_document(), [Post.title, Post.content], keyword)
+        if query is None:
+            return Page([], 0 if include_total else None)
+        
+        total, is_estimate = count_total(query) if include_total else (None, False)
+        posts = query.order_by(Post.post_id.desc()).offset((page - 1) * size).limit(size).all()
+        view_counter.merge_into(posts)
+        
+        return Page(posts, total, None, is_estimate)
+    
+    def search_replies(
+        self,
+        keyword: str,
+        post_id: Optional[int] = None,
+        page: int = 1,
+        size: int = 20,
+        include_total: bool = True
+    ) -> Page:
+        """댓글 검색 (관련도순)"""
+        query = with_author(self.db.query(Reply), Reply.user)
+        
+        if post_id is not None:
+            query = query.filter(Reply.post_id == post_id)
+        
+        query = search(query, reply_document(), [Reply.content], keyword)
+        if query is None:
+            return Page([], 0 if include_total else None)
+        
+        total, is_estimate = count_total(query) if include_total else (None, False)
+        replies = query.order_by(Reply.reply_id.desc()).offset((page - 1) * size).limit(size).all()
+        
+        return Page(replies, total, None, is_estimate)
     
     def get_post_by_id(self, post_id: int) -> Optional[Post]:
         """ID로 게시글 조회"""
-        return self.db.query(Post).filter(Post.post_id == post_id).first()
+        return with_author(self.db.query(Post), Post.user).filter(Post.post_id == post_id).first()
     
     def create_post(self, user_id: int, post_data: PostCreate) -> Post:
         """게시글 생성"""
@@ -49,11 +146,14 @@ class CommunityService:
             user_id=user_id,
             **post_data.dict()
         )
+        apply_post_search_text(post)
         
         self.db.add(post)
         self.db.commit()
         self.db.refresh(post)
         
+        TrendingService(self.db).mark_dirty(post.post_id)
+        
         return post
     
     def update_post(self, post_id: int, post_update: PostUpdate) -> Optional[Post]:
@@ -65,10 +165,14 @@ class CommunityService:
         update_data = post_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(post, field, value)
+        apply_post_search_text(post)
         
         self.db.commit()
         self.db.refresh(post)
         
+        # 카테고리가 바뀌었을 수 있음
+        TrendingService(self.db).mark_dirty(post_id)
+        
         return post
     
     def delete_post(self, post_id: int) -> bool:
@@ -80,16 +184,20 @@ class CommunityService:
         self.db.delete(post)
         self.db.commit()
         
+        TrendingService(self.db).remove(post_id)
+        
         return True
     
     def increment_view_count(self, post_id: int) -> bool:
-        """조회수 증가"""
-        post = self.get_post_by_id(post_id)
+        """조회수 증가 (버퍼에 기록 후 주기적으로 일괄 반영)"""
+        # 상세 조회에서 이미 읽은 게시글이면 identity map에서 가져오므로 추가 쿼리 없음
+        post = self.db.get(Post, post_id)
         if not post:
             return False
         
-        post.view_count += 1
-        self.db.commit()
+        view_counter.record(post_id)
+        # 응답에 대기 중인 증가분(이번 조회 포함)을 반영
+        view_counter.merge_into([post])
         
         return True
     
@@ -97,15 +205,107 @@ class CommunityService:
         self, 
         post_id: int, 
         page: int = 1, 
-        size: int = 20
-    ) -> Tuple[List[Reply], int]:
-        """게시글 댓글 목록 조회"""
-        query = self.db.query(Reply).filter(Reply.post_id == post_id).order_by(asc(Reply.created_at))
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """게시글 댓글 목록 조회 (cursor 지정 시 keyset 페이지네이션)"""
+        query = with_author(self.db.query(Reply), Reply.user).filter(Reply.post_id == post_id)
+        
+        return paginate(
+            query, Reply.reply_id, page, size,
+            cursor=cursor, include_total=include_total,
+            sort_key=Reply.created_at, sort_name="created_at"
+        )
+    
+    def get_reply_tree(
+        self,
+        post_id: int,
+        page: int = 1,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """
+        게시글 댓글 트리 조회
+        
+        최상위 댓글을 페이지 단위로 읽고, 그 아래 대댓글은 재귀 CTE 한 번으로 읽어
+        트리로 조립합니다. 최상위 댓글 하나당 REPLY_TREE_MAX_DEPTH 깊이,
+        REPLY_TREE_MAX_THREAD_SIZE개까지만 불러오고, 생략된 대댓글이 있으면
+        해당 노드의 has_more_replies가 True입니다.
+        """
+        query = with_author(self.db.query(Reply), Reply.user).filter(
+            Reply.post_id == post_id,
+            Reply.parent_reply_id.is_(None)
+        )
+        result = paginate(
+            query, Reply.reply_id, page, size,
+            cursor=cursor, include_total=include_total,
+            sort_key=Reply.created_at, sort_name="created_at"
+        )
+        
+        roots = [ReplyThread(reply, 0) for reply in result.items]
+        if roots:
+            self._attach_descendants(roots)
+        
+        return result._replace(items=roots)
+    
+    def _attach_descendants(self, roots: List[ReplyThread]) -> None:
+        max_depth = settings.REPLY_TREE_MAX_DEPTH
+        max_size = settings.REPLY_TREE_MAX_THREAD_SIZE
+        
+        # 한 단계 더 읽어 생략된 대댓글 존재 여부를 표시
+        tree = select(
+            Reply.reply_id,
+            Reply.parent_reply_id.label("root_id"),
+            literal(1).label("depth")
+        ).where(
+            Reply.parent_reply_id.in_([root.reply_id for root in roots])
+        ).cte("reply_tree", recursive=True)
+        child = aliased(Reply)
+        tree = tree.union_all(
+            select(child.reply_id, tree.c.root_id, tree.c.depth + 1).where(
+                child.parent_reply_id == tree.c.reply_id,
+                tree.c.depth <= max_depth
+            )
+        )
+        
+        # 깊이 순으로 번호를 매겨 상위 댓글이 항상 먼저 포함되게 한다
+        ranked = select(
+            tree.c.reply_id,
+            tree.c.root_id,
+            tree.c.depth,
+            func.row_number().over(
+                partition_by=tree.c.root_id,
+                order_by=(tree.c.depth, Reply.created_at, Reply.reply_id)
+            ).label("position"),
+            func.count().over(partition_by=tree.c.root_id).label("thread_size")
+        ).join(Reply, Reply.reply_id == tree.c.reply_id).subquery()
         
-        total = query.count()
-        replies = query.offset((page - 1) * size).limit(size).all()
+        rows = with_author(self.db.query(Reply), Reply.user).add_columns(
+            ranked.c.root_id, ranked.c.depth, ranked.c.thread_size
+        ).join(
+            ranked, Reply.reply_id == ranked.c.reply_id
+        ).filter(
+            ranked.c.position <= max_size
+        ).order_by(
+            ranked.c.depth, Reply.created_at, Reply.reply_id
+        ).all()
         
-        return replies, total
+        # 부모가 자식보다 먼저 나오므로 한 번 순회로 조립
+        nodes: Dict[int, ReplyThread] = {root.reply_id: root for root in roots}
+        for reply, root_id, depth, thread_size in rows:
+            parent = nodes.get(reply.parent_reply_id)
+            if parent is None:
+                continue
+            if depth > max_depth:
+                parent.has_more_replies = True
+                continue
+            node = ReplyThread(reply, depth)
+            parent.children.append(node)
+            nodes[reply.reply_id] = node
+            if thread_size > max_size:
+                nodes[root_id].has_more_replies = True
     
     def get_reply_by_id(self, reply_id: int) -> Optional[Reply]:
         """ID로 댓글 조회"""
@@ -118,11 +318,23 @@ class CommunityService:
             post_id=post_id,
             **reply_data.dict()
         )
+        apply_reply_search_text(reply)
         
         self.db.add(reply)
+        # 댓글 집계는 읽고 쓰지 않고 UPDATE 한 번으로 갱신 (동시 작성 시 누락 방지)
+        self.db.query(Post).filter(Post.post_id == post_id).update(
+            {
+                Post.reply_count: Post.reply_count + 1,
+                Post.last_reply_at: func.now(),
+                Post.updated_at: Post.updated_at
+            },
+            synchronize_session=False
+        )
         self.db.commit()
         self.db.refresh(reply)
         
+        TrendingService(self.db).mark_dirty(post_id)
+        
         return reply
     
     def update_reply(self, reply_id: int, reply_update: ReplyUpdate) -> Optional[Reply]:
@@ -134,6 +346,7 @@ class CommunityService:
         update_data = reply_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(reply, field, value)
+        apply_reply_search_text(reply)
         
         self.db.commit()
         self.db.refresh(reply)
@@ -141,12 +354,60 @@ class CommunityService:
         return reply
     
     def delete_reply(self, reply_id: int) -> bool:
-        """댓글 삭제"""
+        """댓글 삭제 (대댓글 포함)"""
         reply = self.get_reply_by_id(reply_id)
         if not reply:
             return False
         
-        self.db.delete(reply)
+        post_id = reply.post_id
+        subtree = select(Reply.reply_id).where(
+            Reply.reply_id == reply_id
+        ).cte("reply_subtree", recursive=True)
+        child = aliased(Reply)
+        subtree = subtree.union_all(
+            select(child.reply_id).where(child.parent_reply_id == subtree.c.reply_id)
+        )
+        reply_ids = [row.reply_id for row in self.db.execute(select(subtree.c.reply_id))]
+        
+        self.db.expunge(reply)
+        deleted = self.db.query(Reply).filter(Reply.reply_id.in_(reply_ids)).delete(
+            synchronize_session=False
+        )
+        
+        last_reply_at = self.db.query(func.max(Reply.created_at)).filter(
+            Reply.post_id == post_id
+        ).scalar_subquery()
+        self.db.query(Post).filter(Post.post_id == post_id).update(
+            {
+                Post.reply_count: case((Post.reply_count > deleted, Post.reply_count - deleted), else_=0),
+                Post.last_reply_at: last_reply_at,
+                Post.updated_at: Post.updated_at
+            },
+            synchronize_session=False
+        )
         self.db.commit()
         
+        TrendingService(self.db).mark_dirty(post_id)
+        
         return True
+    
+    def refresh_reply_stats(self) -> int:
+        """댓글 집계 전체 재계산 (기존 데이터에 컬럼을 추가한 뒤 1회 실행)"""
+        reply_count = self.db.query(func.count(Reply.reply_id)).filter(
+            Reply.post_id == Post.post_id
+        ).scalar_subquery()
+        last_reply_at = self.db.query(func.max(Reply.created_at)).filter(
+            Reply.post_id == Post.post_id
+        ).scalar_subquery()
+        
+        updated = self.db.query(Post).update(
+            {
+                Post.reply_count: reply_count,
+                Post.last_reply_at: last_reply_at,
+                Post.updated_at: Post.updated_at
+            },
+            synchronize_session=False
+        )
+        self.db.commit()
+        
+        return updated
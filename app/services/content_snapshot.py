@@ -0,0 +1,260 @@
+"""
+학습 콘텐츠 인메모리 스냅샷
+
+LearningCategory, Chapter, Sentence, SimilarSentence 전체를 불변 레코드로 읽어
+직무/레벨/카테고리/챕터별 인덱스와 함께 보관합니다. 챕터 목록, 챕터 문장 목록,
+유사 문장 조회는 스냅샷이 있으면 DB 조회 없이 응답합니다.
+
+스냅샷은 시작 시 생성되고, 콘텐츠 캐시 태그가 무효화되면(다른 워커의 쓰기 포함)
+스냅샷을 stale로 표시한 뒤 run_snapshot_refresher 작업이 새로 만들어 참조를 한 번에
+교체합니다. 무효화를 받은 요청/구독 스레드는 재생성을 기다리지 않으며, 재생성이 끝날
+때까지는 스냅샷 대신 DB 경로로 응답합니다. 교체 전 스냅샷을 읽던 요청은 끝까지 같은
+버전을 보게 됩니다.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import register_invalidation_handler
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pagination import Page, paginate_sequence
+from app.models.learning import LearningCategory, Chapter, Sentence, SimilarSentence
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷을 다시 만들어야 하는 캐시 태그
+CONTENT_TAGS = frozenset({"chapters", "sentences", "categories"})
+
+# 필터 미지정(전체)을 나타내는 인덱스 키
+ANY = "*"
+
+
+class _Record:
+    """ORM 행에서 필요한 컬럼만 복사한 불변 레코드"""
+    __slots__ = ()
+
+    def __init__(self, row: Any):
+        for name in self.__slots__:
+            object.__setattr__(self, name, getattr(row, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class CategoryRecord(_Record):
+    __slots__ = ("category_id", "job_id", "title", "sub_title")
+
+
+class ChapterRecord(_Record):
+    __slots__ = (
+        "chapter_id", "category_id", "job_id", "level_id",
+        "title", "description", "is_active", "created_at"
+    )
+
+
+class SentenceRecord(_Record):
+    __slots__ = ("sentence_id", "chapter_id", "content", "translated_content", "tts_url", "created_at")
+
+
+class SimilarSentenceRecord(_Record):
+    __slots__ = (
+        "similar_sentence_id", "sentence_id", "content",
+        "translated_content", "similarity_type", "created_at"
+    )
+
+
+class ContentSnapshot:
+    """특정 시점의 학습 콘텐츠 전체 (생성 후 변경하지 않음)"""
+
+    __slots__ = (
+        "version", "built_at",
+        "categories", "categories_by_job",
+        "chapters_by_id", "chapters_by_filter",
+        "sentences_by_id", "sentences_by_chapter",
+        "similar_by_sentence"
+    )
+
+    def __init__(
+        self,
+        version: int,
+        categories: List[CategoryRecord],
+        chapters: List[ChapterRecord],
+        sentences: List[SentenceRecord],
+        similar_sentences: List[SimilarSentenceRecord]
+    ):
+        self.version = version
+        self.built_at = datetime.utcnow()
+
+        self.categories = tuple(categories)
+        self.categories_by_job = self._group(categories, lambda c: c.job_id)
+
+        # 비활성 챕터도 ID 조회는 가능하지만 목록에는 포함하지 않는다
+        self.chapters_by_id = {chapter.chapter_id: chapter for chapter in chapters}
+        filters: Dict[Tuple[Any, Any], List[ChapterRecord]] = {}
+        for chapter in chapters:
+            if not chapter.is_active:
+                continue
+            job_keys = (ANY,) if chapter.job_id is None else (ANY, chapter.job_id)
+            for job_key in job_keys:
+                for level_key in (ANY, chapter.level_id):
+                    filters.setdefault((job_key, level_key), []).append(chapter)
+        self.chapters_by_filter = {key: tuple(value) for key, value in filters.items()}
+
+        self.sentences_by_id = {sentence.sentence_id: sentence for sentence in sentences}
+        self.sentences_by_chapter = self._group(sentences, lambda s: s.chapter_id)
+        self.similar_by_sentence = self._group(similar_sentences, lambda s: s.sentence_id)
+
+    @staticmethod
+    def _group(records: List, key) -> Dict[Any, Tuple]:
+        grouped: Dict[Any, List] = {}
+        for record in records:
+            grouped.setdefault(key(record), []).append(record)
+        return {group: tuple(items) for group, items in grouped.items()}
+
+    def get_chapters(
+        self,
+        job_id: Optional[int],
+        level_id: Optional[int],
+        page: int,
+        size: int,
+        cursor: Optional[str] = None
+    ) -> Page:
+        chapters = self.chapters_by_filter.get(
+            (ANY if job_id is None else job_id, ANY if level_id is None else level_id), ()
+        )
+        return paginate_sequence(chapters, "chapter_id", page, size, cursor, sort_name="chapter_id")
+
+    def get_chapter_sentences(
+        self,
+        chapter_id: int,
+        page: int,
+        size: int,
+        cursor: Optional[str] = None
+    ) -> Page:
+        sentences = self.sentences_by_chapter.get(chapter_id, ())
+        return paginate_sequence(sentences, "sentence_id", page, size, cursor, sort_name="sentence_id")
+
+    def get_similar_sentences(self, sentence_id: int) -> List[SimilarSentenceRecord]:
+        return list(self.similar_by_sentence.get(sentence_id, ()))
+
+    def get_learning_categories(self, job_id: Optional[int]) -> List[CategoryRecord]:
+        if job_id is None:
+            return list(self.categories)
+        return list(self.categories_by_job.get(job_id, ()))
+
+
+def build_snapshot(db: Session, version: int) -> ContentSnapshot:
+    """DB에서 학습 콘텐츠 전체를 읽어 스냅샷 생성 (4회 조회)"""
+    return ContentSnapshot(
+        version=version,
+        categories=[CategoryRecord(row) for row in db.query(LearningCategory).order_by(LearningCategory.category_id)],
+        chapters=[ChapterRecord(row) for row in db.query(Chapter).order_by(Chapter.chapter_id)],
+        sentences=[SentenceRecord(row) for row in db.query(Sentence).order_by(Sentence.sentence_id)],
+        similar_sentences=[
+            SimilarSentenceRecord(row)
+            for row in db.query(SimilarSentence).order_by(SimilarSentence.similar_sentence_id)
+        ]
+    )
+
+
+class SnapshotHolder:
+    """현재 스냅샷 참조 보관 및 교체"""
+
+    def __init__(self):
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._version = 0
+        self._build_lock = threading.Lock()
+        # 무효화될 때마다 증가, 스냅샷은 생성 시작 시점의 값을 기록
+        self._generation_lock = threading.Lock()
+        self._generation = 0
+        self._built_generation = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def current(self) -> Optional[ContentSnapshot]:
+        """현재 스냅샷 (무효화 후 재생성 전이면 None)"""
+        if self._built_generation != self._generation:
+            return None
+        return self._snapshot
+
+    def refresh(self) -> Optional[ContentSnapshot]:
+        """새 스냅샷을 만들어 교체 (실패 시 기존 스냅샷 유지)"""
+        with self._build_lock:
+            # 생성 도중 들어온 무효화는 이 스냅샷에 반영됐다고 볼 수 없으므로 stale로 남긴다
+            generation = self._generation
+            db = SessionLocal()
+            try:
+                snapshot = build_snapshot(db, self._version + 1)
+            except Exception:
+                logger.warning("콘텐츠 스냅샷 생성 실패", exc_info=True)
+                return self._snapshot
+            finally:
+                db.close()
+
+            self._version = snapshot.version
+            # 단일 참조 대입이므로 읽는 쪽은 이전 또는 새 스냅샷 중 하나만 본다
+            self._snapshot = snapshot
+            self._built_generation = generation
+            return snapshot
+
+    def mark_stale(self) -> None:
+        """재생성 예약 (요청 스레드, 구독 스레드 어디서 호출해도 바로 반환)"""
+        with self._generation_lock:
+            self._generation += 1
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:  # 종료 중인 루프
+            pass
+
+    def on_invalidate(self, tags: List[str]) -> None:
+        if settings.CONTENT_SNAPSHOT_ENABLED and CONTENT_TAGS.intersection(tags):
+            self.mark_stale()
+
+    async def run_refresher(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        # 시작 시 생성과 refresher 시작 사이에 들어온 무효화 처리
+        if self._built_generation != self._generation:
+            self._wakeup.set()
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.CONTENT_SNAPSHOT_REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            # 재생성 중 들어온 무효화는 다시 깨우도록 먼저 비운다
+            self._wakeup.clear()
+            await asyncio.to_thread(self.refresh)
+
+
+content_snapshot = SnapshotHolder()
+register_invalidation_handler(content_snapshot.on_invalidate)
+
+
+def get_content_snapshot() -> Optional[ContentSnapshot]:
+    """현재 콘텐츠 스냅샷 (비활성화 또는 생성 전이면 None)"""
+    if not settings.CONTENT_SNAPSHOT_ENABLED:
+        return None
+    return content_snapshot.current
+
+
+async def run_snapshot_refresher() -> None:
+    """
+    무효화되면 스냅샷 재생성 (워커당 하나의 작업에서만 생성)
+
+    무효화 메시지를 놓친 경우(Redis 미사용 포함)에 대비해 CONTENT_SNAPSHOT_REFRESH_INTERVAL마다도
+    재생성합니다.
+    """
+    if not settings.CONTENT_SNAPSHOT_ENABLED:
+        return
+
+    await content_snapshot.run_refresher()
@@ -0,0 +1,187 @@
+"""
+시나리오 대화 LLM 컨텍스트 관리
+
+대화가 길어져도 턴마다 보내는 프롬프트 크기가 일정하도록
+[시스템 프롬프트] + [이전 대화 요약] + [최근 SCENARIO_PROMPT_TURNS개 턴] + [새 메시지]
+로 구성하고, 전체가 SCENARIO_PROMPT_TOKEN_BUDGET을 넘으면 오래된 턴부터 뺍니다.
+
+요약은 ScenarioProgress.context_summary에 누적하고 summarized_turn까지의 턴을
+대신합니다. 최근 구간 밖으로 밀려난 턴이 SCENARIO_SUMMARY_BATCH개 쌓이면 응답을
+보낸 뒤 백그라운드에서 이전 요약 + 밀려난 턴만으로 요약을 갱신합니다(턴 전체를
+다시 읽지 않음). 토큰 수는 문자 수 기반 추정치입니다.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.models.scenario import ScenarioProgress
+from app.services.llm_client import complete_chat, is_llm_configured
+
+logger = logging.getLogger(__name__)
+
+# 메시지마다 붙는 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "다음은 한국어 학습자와 AI의 역할극 대화입니다. 이전 요약과 이어지는 대화를 합쳐 "
+    "이후 대화를 이어가는 데 필요한 사실(등장인물, 합의한 내용, 학습자가 한 요청, 현재 상황)만 "
+    "간결한 한국어 문단으로 요약하세요."
+)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """토큰 수 추정 (한글/한자는 글자당 1, 그 외는 4글자당 1)"""
+    if not text:
+        return 0
+    wide = sum(1 for ch in text if ord(ch) >= 0x1100)
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _message_tokens(message: Dict[str, str]) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _turn_messages(turn: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [
+        {"role": "user", "content": turn.get("user_message") or ""},
+        {"role": "assistant", "content": turn.get("ai_response") or ""}
+    ]
+
+
+def fit_messages(
+    system_prompt: str,
+    summary: Optional[str],
+    turns: List[Dict[str, Any]],
+    user_message: str
+) -> List[Dict[str, str]]:
+    """
+    토큰 예산 안에서 대화 메시지 구성
+
+    Args:
+        turns: 요약 이후 턴 (오래된 순)
+    """
+    system = system_prompt
+    if summary:
+        system = f"{system_prompt}\n\n이전 대화 요약:\n{summary}"
+    head = [{"role": "system", "content": system}]
+    tail = [{"role": "user", "content": user_message}]
+
+    budget = settings.SCENARIO_PROMPT_TOKEN_BUDGET
+    used = sum(_message_tokens(message) for message in head + tail)
+
+    # 최근 턴부터 예산이 허락하는 만큼 포함
+    recent = turns[-settings.SCENARIO_PROMPT_TURNS:] if settings.SCENARIO_PROMPT_TURNS > 0 else []
+    included: List[List[Dict[str, str]]] = []
+    for turn in reversed(recent):
+        pair = _turn_messages(turn)
+        cost = sum(_message_tokens(message) for message in pair)
+        if used + cost > budget:
+            metrics.incr("llm.context_truncated")
+            break
+        included.append(pair)
+        used += cost
+
+    metrics.observe("llm.prompt_tokens", used)
+    body = [message for pair in reversed(included) for message in pair]
+    return head + body + tail
+
+
+def needs_summary(turn_count_since_summary: int) -> bool:
+    """최근 구간 밖으로 밀려난 턴이 SCENARIO_SUMMARY_BATCH개 이상인지"""
+    if not is_llm_configured():
+        return False
+    return turn_count_since_summary - settings.SCENARIO_PROMPT_TURNS >= settings.SCENARIO_SUMMARY_BATCH
+
+
+def _load_summary_input(progress_id: int) -> Optional[Dict[str, Any]]:
+    # 순환 import 방지
+    from app.services.scenario_service import ScenarioService
+
+    db = SessionLocal()
+    try:
+        progress = db.get(ScenarioProgress, progress_id)
+        if progress is None:
+            return None
+        summarized_turn = progress.summarized_turn or 0
+        turns = ScenarioService(db).get_conversation_turns([progress_id], after_turn=summarized_turn)[progress_id]
+        # 최근 구간은 프롬프트에 원문으로 들어가므로 요약하지 않는다
+        older = turns[:-settings.SCENARIO_PROMPT_TURNS] if settings.SCENARIO_PROMPT_TURNS > 0 else turns
+        if not older:
+            return None
+        return {"summary": progress.context_summary, "summarized_turn": summarized_turn, "turns": older}
+    finally:
+        db.close()
+
+
+def _save_summary(progress_id: int, expected_turn: int, summary: str, summarized_turn: int) -> bool:
+    db = SessionLocal()
+    try:
+        # 다른 워커가 먼저 갱신했으면 덮어쓰지 않는다
+        updated = db.query(ScenarioProgress).filter(
+            ScenarioProgress.progress_id == progress_id,
+            ScenarioProgress.summarized_turn == expected_turn
+        ).update(
+            {
+                ScenarioProgress.context_summary: summary,
+                ScenarioProgress.summarized_turn: summarized_turn
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        return bool(updated)
+    finally:
+        db.close()
+
+
+async def summarize(progress_id: int) -> bool:
+    """밀려난 턴을 이전 요약에 합쳐 요약 갱신"""
+    data = await asyncio.to_thread(_load_summary_input, progress_id)
+    if data is None:
+        return False
+
+    transcript = "\n".join(
+        f"학습자: {turn.get('user_message') or ''}\nAI: {turn.get('ai_response') or ''}"
+        for turn in data["turns"]
+    )
+    content = f"이전 요약:\n{data['summary']}\n\n이어지는 대화:\n{transcript}" if data["summary"] else transcript
+    summary = await complete_chat(
+        [{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": content}],
+        max_tokens=settings.SCENARIO_SUMMARY_MAX_TOKENS
+    )
+    if not summary.strip():
+        return False
+
+    return await asyncio.to_thread(
+        _save_summary, progress_id, data["summarized_turn"], summary.strip(), data["turns"][-1]["turn_number"]
+    )
+
+
+class SummaryScheduler:
+    """진행 기록별로 요약 작업을 하나만 실행 (프로세스 단위)"""
+
+    def __init__(self):
+        self._inflight: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, progress_id: int) -> None:
+        if progress_id in self._inflight:
+            return
+        self._inflight.add(progress_id)
+        task = asyncio.create_task(self._run(progress_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, progress_id: int) -> None:
+        try:
+            if await summarize(progress_id):
+                metrics.incr("llm.summaries")
+        except Exception:
+            logger.warning("대화 요약 갱신 실패: progress_id=%s", progress_id, exc_info=True)
+        finally:
+            self._inflight.discard(progress_id)
+
+
+summary_scheduler = SummaryScheduler()
@@ -0,0 +1,541 @@
+"""
+시나리오 피드백 생성 작업 큐
+
+대화 전체를 LLM으로 평가하는 데 수 초가 걸리므로 요청에서는 작업만 등록하고
+(202), 애플리케이션 워커 안의 작업자 FEEDBACK_WORKER_CONCURRENCY개가 처리해
+ScenarioFeedback을 저장합니다. 작업은 진행 기록(progress_id)당 하나입니다.
+
+Redis 사용 시:
+- feedback:queue: 대기 중인 progress_id (LPUSH / LMOVE로 꺼냄)
+- feedback:processing: 처리 중인 progress_id (FEEDBACK_JOB_TIMEOUT이 지나면 대기열로 복구)
+- feedback:delayed: 재시도 대기 (점수는 재시도 가능 시각)
+- feedback:job:{progress_id}: 상태(pending/running/failed), 시도 횟수, 대기 시작 시각, 오류
+등록(상태 확인 + 상태 기록 + LPUSH)과 꺼내기(LMOVE + 처리 시작 시각 기록)는 각각
+WATCH/MULTI 트랜잭션이라, 같은 작업이 두 번 들어가거나 시작 시각 없이 처리 중 목록에
+보이는 순간이 없습니다.
+
+Redis가 없거나 Redis 호출이 실패하면 scenario_feedback_jobs 테이블을 대기열로 씁니다.
+작업 상태가 DB에 있으므로 요청을 받은 워커와 상태를 조회하는 워커가 달라도 같은 작업을
+보고, 작업자는 상태가 바뀌지 않은 경우에만 성공하는 UPDATE로 작업을 가져가므로 여러
+워커가 같은 작업을 처리하지 않습니다. Redis를 쓰는 중에도 장애 때 DB에 등록된 작업은
+RECOVERY_INTERVAL마다 확인해 처리합니다.
+
+지표: feedback.queue_wait_ms(대기 시간), feedback.processing_ms(처리 시간),
+feedback.completed / feedback.retries / feedback.failed
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from app.models.scenario import ScenarioFeedback, ScenarioFeedbackJob, ScenarioProgress
+from app.services.llm_client import complete_chat, is_llm_configured
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "feedback:queue"
+PROCESSING_KEY = "feedback:processing"
+DELAYED_KEY = "feedback:delayed"
+RECOVERY_LOCK_KEY = "feedback:recovery_lock"
+
+PENDING = "pending"
+RUNNING = "running"
+FAILED = "failed"
+READY = "ready"
+
+# 작업 저장소
+REDIS = "redis"
+DB = "db"
+
+RECOVERY_INTERVAL = 30  # 중단된 작업 확인 주기 (초)
+DB_CLAIM_CANDIDATES = 5  # DB 대기열에서 한 번에 가져오기를 시도할 작업 수
+
+SCORE_FIELDS = ("pronunciation_score", "accuracy_score", "fluency_score", "completeness_score")
+
+# LLM 미설정 시 기본 피드백
+DEFAULT_FEEDBACK = {
+    "pronunciation_score": 85,
+    "accuracy_score": 90,
+    "fluency_score": 80,
+    "completeness_score": 88,
+    "total_score": 86,
+    "comment": "전반적으로 잘하셨습니다. 발음을 조금 더 명확하게 하시면 좋겠습니다.",
+    "detail_comment": [
+        "발음: 'ㅅ'과 'ㅆ' 구분을 더 명확하게 해주세요",
+        "유창성: 문장을 더 자연스럽게 연결해보세요",
+        "완성도: 대화의 맥락을 더 잘 파악해보세요"
+    ]
+}
+
+EVALUATION_PROMPT = (
+    "당신은 한국어 말하기 평가자입니다. 아래 역할극 대화에서 학습자의 발화를 평가해 "
+    "다음 키만 가진 JSON 객체 하나로 답하세요: "
+    "pronunciation_score, accuracy_score, fluency_score, completeness_score, total_score "
+    "(각 0-100 정수), comment (한 문단 총평), detail_comment (개선 제안 문자열 배열)."
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _job_key(progress_id: int) -> str:
+    return f"feedback:job:{progress_id}"
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.utcfromtimestamp(timestamp)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+# 평가
+def _load_conversation(progress_id: int) -> Optional[Dict[str, Any]]:
+    # 순환 import 방지
+    from app.services.scenario_service import ScenarioService
+
+    db = SessionLocal()
+    try:
+        progress = db.get(ScenarioProgress, progress_id)
+        if progress is None:
+            return None
+        return {
+            "scenario": progress.scenario.title if progress.scenario else None,
+            "user_role": progress.user_role.role_name if progress.user_role else None,
+            "ai_role": progress.ai_role.role_name if progress.ai_role else None,
+            "turns": ScenarioService(db).get_conversation_turns([progress_id])[progress_id]
+        }
+    finally:
+        db.close()
+
+
+def _parse_evaluation(text: str) -> Dict[str, Any]:
+    match = _JSON_OBJECT.search(text)
+    if match is None:
+        raise ValueError("평가 응답에 JSON 객체가 없습니다")
+    data = json.loads(match.group(0))
+
+    result: Dict[str, Any] = {}
+    for field in SCORE_FIELDS:
+        result[field] = max(0, min(100, int(data[field])))
+    total = data.get("total_score")
+    result["total_score"] = (
+        max(0, min(100, int(total))) if total is not None
+        else round(sum(result[field] for field in SCORE_FIELDS) / len(SCORE_FIELDS))
+    )
+    result["comment"] = str(data.get("comment") or "")
+    result["detail_comment"] = [str(item) for item in data.get("detail_comment") or []]
+    return result
+
+
+async def evaluate_conversation(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """대화 평가 (LLM 미설정 시 기본 피드백)"""
+    if not is_llm_configured():
+        return dict(DEFAULT_FEEDBACK)
+
+    transcript = "\n".join(
+        f"[{turn['turn_number']}] 학습자: {turn.get('user_message') or ''}\n"
+        f"[{turn['turn_number']}] 상대: {turn.get('ai_response') or ''}"
+        for turn in conversation["turns"]
+    )
+    messages = [
+        {"role": "system", "content": EVALUATION_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"시나리오: {conversation['scenario'] or ''}\n"
+                f"학습자 역할: {conversation['user_role'] or ''}\n"
+                f"상대 역할: {conversation['ai_role'] or ''}\n\n{transcript}"
+            )
+        }
+    ]
+    return _parse_evaluation(await complete_chat(messages))
+
+
+def _save_feedback(progress_id: int, result: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        progress = db.get(ScenarioProgress, progress_id)
+        if progress is None:
+            return
+        feedback = db.query(ScenarioFeedback).filter(ScenarioFeedback.log_id == progress_id).first()
+        if feedback is None:
+            feedback = ScenarioFeedback(user_id=progress.user_id, log_id=progress_id)
+            db.add(feedback)
+        for field, value in result.items():
+            setattr(feedback, field, value)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class FeedbackJobQueue:
+    """피드백 작업 대기열과 상태"""
+
+    def __init__(self):
+        self._last_recovery = 0.0
+        self._last_db_check = 0.0
+
+    # 등록/조회
+    def enqueue(self, progress_id: int) -> Dict[str, Any]:
+        """작업 등록 (이미 대기/처리 중이면 기존 상태 반환)"""
+        now = time.time()
+        job = {"status": PENDING, "attempts": 0, "queued_at": now, "error": ""}
+
+        client = get_redis()
+        if client is not None:
+            key = _job_key(progress_id)
+
+            def _claim(pipe) -> Dict[str, Any]:
+                raw = pipe.hgetall(key)
+                if raw:
+                    current = self._decode(raw)
+                    if current is None:
+                        # 필드가 일부만 있는 상태: 다시 넣지 않고 대기 중으로 본다
+                        return dict(job)
+                    if current["status"] != FAILED:
+                        return current
+                pipe.multi()
+                pipe.hset(key, mapping=job)
+                pipe.expire(key, settings.FEEDBACK_JOB_TTL)
+                pipe.lpush(QUEUE_KEY, progress_id)
+                return dict(job)
+
+            try:
+                # 다른 요청이 같은 작업을 먼저 등록하면 WatchError로 다시 확인
+                return client.transaction(_claim, key, value_from_callable=True)
+            except Exception:
+                logger.warning("피드백 작업 등록 실패, DB 대기열 사용: %s", progress_id, exc_info=True)
+
+        return self._db_enqueue(progress_id, job)
+
+    def status(self, progress_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태 (작업이 없거나 완료되어 정리되었으면 None)"""
+        client = get_redis()
+        if client is not None:
+            try:
+                job = self._decode(client.hgetall(_job_key(progress_id)))
+                if job:
+                    return job
+            except Exception:
+                logger.warning("피드백 작업 상태 조회 실패: %s", progress_id, exc_info=True)
+
+        db = SessionLocal()
+        try:
+            row = db.get(ScenarioFeedbackJob, progress_id)
+            return self._row_to_job(row) if row else None
+        finally:
+            db.close()
+
+    def depth(self) -> int:
+        """대기 중인 작업 수"""
+        depth = 0
+        client = get_redis()
+        if client is not None:
+            try:
+                depth += client.llen(QUEUE_KEY) + client.zcard(DELAYED_KEY)
+            except Exception:
+                logger.warning("피드백 대기열 길이 조회 실패", exc_info=True)
+
+        db = SessionLocal()
+        try:
+            return depth + db.query(ScenarioFeedbackJob).filter(ScenarioFeedbackJob.status == PENDING).count()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _decode(raw: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        data = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in raw.items()
+        }
+        if "queued_at" not in data:
+            return None
+        return {
+            "status": data.get("status", PENDING),
+            "attempts": int(data.get("attempts") or 0),
+            "queued_at": float(data["queued_at"]),
+            "error": data.get("error") or ""
+        }
+
+    @staticmethod
+    def _row_to_job(row: ScenarioFeedbackJob) -> Dict[str, Any]:
+        return {
+            "status": row.status,
+            "attempts": row.attempts or 0,
+            "queued_at": _to_timestamp(row.queued_at),
+            "error": row.error or ""
+        }
+
+    # 작업자
+    def dequeue(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """다음 작업을 꺼내 처리 중으로 표시 (작업의 "store"는 complete/retry_or_fail에 전달)"""
+        now = time.time()
+        client = get_redis()
+        if client is not None:
+            try:
+                self._promote_delayed(client, now)
+                self._recover_stale(client, now)
+                claimed = client.transaction(
+                    lambda pipe: self._claim_next(pipe, now), QUEUE_KEY, value_from_callable=True
+                )
+                if claimed is not None:
+                    progress_id, raw = claimed
+                    job = self._decode(raw) or {"status": PENDING, "attempts": 0, "queued_at": now, "error": ""}
+                    job["store"] = REDIS
+                    return progress_id, job
+                # Redis 장애 중 DB에 등록된 작업은 가끔만 확인
+                if now - self._last_db_check < RECOVERY_INTERVAL:
+                    return None
+                self._last_db_check = now
+            except Exception:
+                logger.warning("피드백 작업 가져오기 실패", exc_info=True)
+
+        return self._db_dequeue(now)
+
+    @staticmethod
+    def _claim_next(pipe, now: float) -> Optional[Tuple[int, Dict[Any, Any]]]:
+        """대기열 끝의 작업을 처리 중 목록으로 옮기고 시작 시각 기록 (transaction 콜백)"""
+        member = pipe.lindex(QUEUE_KEY, -1)
+        if member is None:
+            return None
+        key = _job_key(int(member))
+        pipe.watch(key)
+        raw = pipe.hgetall(key)
+        pipe.multi()
+        pipe.lmove(QUEUE_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+        pipe.hset(key, mapping={"status": RUNNING, "started_at": now})
+        pipe.expire(key, settings.FEEDBACK_JOB_TTL)
+        return int(member), raw
+
+    def complete(self, progress_id: int, store: str = REDIS) -> None:
+        """완료 처리 (상태 정리, 이후 조회는 저장된 피드백으로 판단)"""
+        client = get_redis()
+        if store == REDIS and client is not None:
+            try:
+                pipe = client.pipeline(transaction=True)
+                pipe.lrem(PROCESSING_KEY, 0, progress_id)
+                pipe.delete(_job_key(progress_id))
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("피드백 작업 완료 처리 실패: %s", progress_id, exc_info=True)
+                return
+
+        db = SessionLocal()
+        try:
+            db.query(ScenarioFeedbackJob).filter(ScenarioFeedbackJob.progress_id == progress_id).delete()
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("피드백 작업 완료 처리 실패: %s", progress_id, exc_info=True)
+        finally:
+            db.close()
+
+    def retry_or_fail(self, progress_id: int, attempts: int, error: str, store: str = REDIS) -> bool:
+        """재시도 예약 (최대 시도 횟수를 넘으면 실패 처리하고 False)"""
+        retry = attempts < settings.FEEDBACK_JOB_MAX_ATTEMPTS
+        available_at = time.time() + settings.FEEDBACK_JOB_RETRY_DELAY * (2 ** (attempts - 1))
+        fields = {
+            "status": PENDING if retry else FAILED,
+            "attempts": attempts,
+            "error": error[:500]
+        }
+        if retry:
+            fields["queued_at"] = available_at
+
+        client = get_redis()
+        if store == REDIS and client is not None:
+            try:
+                key = _job_key(progress_id)
+                pipe = client.pipeline(transaction=True)
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, settings.FEEDBACK_JOB_TTL)
+                pipe.lrem(PROCESSING_KEY, 0, progress_id)
+                if retry:
+                    pipe.zadd(DELAYED_KEY, {progress_id: available_at})
+                pipe.execute()
+            except Exception:
+                # 처리 중 목록에 남은 작업은 FEEDBACK_JOB_TIMEOUT 후 복구된다
+                logger.warning("피드백 작업 재시도 등록 실패: %s", progress_id, exc_info=True)
+            return retry
+
+        values = dict(fields)
+        if retry:
+            values["queued_at"] = values["available_at"] = _to_datetime(available_at)
+        db = SessionLocal()
+        try:
+            db.query(ScenarioFeedbackJob).filter(ScenarioFeedbackJob.progress_id == progress_id).update(
+                values, synchronize_session=False
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("피드백 작업 재시도 등록 실패: %s", progress_id, exc_info=True)
+        finally:
+            db.close()
+        return retry
+
+    # DB 대기열
+    def _db_enqueue(self, progress_id: int, job: Dict[str, Any]) -> Dict[str, Any]:
+        queued_at = _to_datetime(job["queued_at"])
+        db = SessionLocal()
+        try:
+            row = db.get(ScenarioFeedbackJob, progress_id)
+            if row is not None and row.status != FAILED:
+                return self._row_to_job(row)
+            if row is None:
+                row = ScenarioFeedbackJob(progress_id=progress_id)
+                db.add(row)
+            row.status = PENDING
+            row.attempts = 0
+            row.queued_at = queued_at
+            row.available_at = queued_at
+            row.started_at = None
+            row.error = ""
+            db.commit()
+            return dict(job)
+        except IntegrityError:
+            # 다른 워커가 먼저 등록함
+            db.rollback()
+            row = db.get(ScenarioFeedbackJob, progress_id)
+            return self._row_to_job(row) if row else dict(job)
+        finally:
+            db.close()
+
+    def _db_dequeue(self, now: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+        current = _to_datetime(now)
+        stale_before = _to_datetime(now - settings.FEEDBACK_JOB_TIMEOUT)
+        Job = ScenarioFeedbackJob
+
+        db = SessionLocal()
+        try:
+            # 처리할 차례인 작업 + 처리 중이던 워커가 종료된 작업
+            candidates = db.query(Job.progress_id, Job.status, Job.started_at, Job.attempts, Job.queued_at).filter(
+                or_(
+                    and_(Job.status == PENDING, Job.available_at <= current),
+                    and_(Job.status == RUNNING, Job.started_at < stale_before)
+                )
+            ).order_by(Job.available_at).limit(DB_CLAIM_CANDIDATES).all()
+
+            for progress_id, status, started_at, attempts, queued_at in candidates:
+                # 읽은 뒤 다른 워커가 가져갔으면 상태/시작 시각이 바뀌어 0행 갱신
+                claimed = db.query(Job).filter(
+                    Job.progress_id == progress_id,
+                    Job.status == status,
+                    Job.started_at.is_(None) if started_at is None else Job.started_at == started_at
+                ).update({Job.status: RUNNING, Job.started_at: current}, synchronize_session=False)
+                db.commit()
+                if not claimed:
+                    continue
+                if status == RUNNING:
+                    logger.warning("중단된 피드백 작업 복구: %s", progress_id)
+                return progress_id, {
+                    "status": PENDING,
+                    "attempts": attempts or 0,
+                    "queued_at": _to_timestamp(queued_at),
+                    "error": "",
+                    "store": DB
+                }
+            return None
+        except Exception:
+            db.rollback()
+            logger.warning("피드백 작업 가져오기 실패 (DB)", exc_info=True)
+            return None
+        finally:
+            db.close()
+
+    def _promote_delayed(self, client, now: float) -> None:
+        for member in client.zrangebyscore(DELAYED_KEY, "-inf", now, start=0, num=100):
+            # 여러 워커 중 ZREM에 성공한 쪽만 대기열에 넣는다
+            if client.zrem(DELAYED_KEY, member):
+                client.lpush(QUEUE_KEY, member)
+
+    def _recover_stale(self, client, now: float) -> None:
+        if now - self._last_recovery < RECOVERY_INTERVAL:
+            return
+        self._last_recovery = now
+        if not client.set(RECOVERY_LOCK_KEY, 1, nx=True, ex=RECOVERY_INTERVAL):
+            return
+
+        for member in client.lrange(PROCESSING_KEY, 0, -1):
+            key = _job_key(int(member))
+            started_at = client.hget(key, "started_at")
+            if started_at is None:
+                # 시작 시각은 LMOVE와 함께 기록되므로, 없으면 상태가 만료(FEEDBACK_JOB_TTL)된 경우만 복구
+                if client.exists(key):
+                    continue
+            elif now - float(started_at) < settings.FEEDBACK_JOB_TIMEOUT:
+                continue
+            # 처리 중이던 워커가 종료된 작업
+            if client.lrem(PROCESSING_KEY, 1, member):
+                client.lpush(QUEUE_KEY, member)
+                logger.warning("중단된 피드백 작업 복구: %s", member)
+
+
+feedback_jobs = FeedbackJobQueue()
+
+
+async def _process(progress_id: int, job: Dict[str, Any]) -> None:
+    started = time.time()
+    metrics.observe("feedback.queue_wait_ms", max(0.0, started - job["queued_at"]) * 1000)
+    attempts = job["attempts"] + 1
+    store = job.get("store", REDIS)
+
+    try:
+        conversation = await asyncio.to_thread(_load_conversation, progress_id)
+        if conversation is None:
+            # 진행 기록이 삭제됨
+            await asyncio.to_thread(feedback_jobs.complete, progress_id, store)
+            return
+        result = await evaluate_conversation(conversation)
+        await asyncio.to_thread(_save_feedback, progress_id, result)
+    except asyncio.CancelledError:
+        # 종료 중: 처리 중 목록에 남겨 두면 다른 워커가 복구
+        raise
+    except Exception as e:
+        logger.warning("피드백 생성 실패: progress_id=%s, 시도 %d회", progress_id, attempts, exc_info=True)
+        error = f"{e.__class__.__name__}: {e}"
+        if await asyncio.to_thread(feedback_jobs.retry_or_fail, progress_id, attempts, error, store):
+            metrics.incr("feedback.retries")
+        else:
+            metrics.incr("feedback.failed")
+        return
+
+    await asyncio.to_thread(feedback_jobs.complete, progress_id, store)
+    metrics.observe("feedback.processing_ms", (time.time() - started) * 1000)
+    metrics.incr("feedback.completed")
+
+
+async def _worker() -> None:
+    while True:
+        item = await asyncio.to_thread(feedback_jobs.dequeue)
+        if item is None:
+            await asyncio.sleep(settings.FEEDBACK_QUEUE_POLL_INTERVAL)
+            continue
+        await _process(*item)
+
+
+async def run_feedback_workers() -> None:
+    """피드백 작업자 실행 (FEEDBACK_WORKER_CONCURRENCY개 동시 처리)"""
+    workers = [asyncio.create_task(_worker()) for _ in range(max(1, settings.FEEDBACK_WORKER_CONCURRENCY))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
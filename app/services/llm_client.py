@@ -0,0 +1,103 @@
+"""
+LLM 스트리밍 클라이언트
+
+OpenAI 호환 chat completions API(LLM_API_URL)에 stream=true로 요청하고
+응답 SSE의 delta 텍스트를 도착하는 대로 넘겨줍니다. 연결을 재사용하도록
+프로세스당 httpx.AsyncClient 하나를 공유합니다.
+"""
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class LLMError(Exception):
+    """LLM 호출 실패"""
+
+
+def is_llm_configured() -> bool:
+    return bool(settings.LLM_API_URL)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.LLM_READ_TIMEOUT,
+                connect=settings.LLM_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _client
+
+
+async def close_llm_client() -> None:
+    """공유 HTTP 클라이언트 종료 (애플리케이션 종료 시 호출)"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def stream_chat(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    대화 메시지를 보내고 응답 텍스트 조각을 순서대로 반환
+
+    Raises:
+        LLMError: 설정 누락, HTTP 오류, 연결/타임아웃 오류
+    """
+    if not is_llm_configured():
+        raise LLMError("LLM_API_URL이 설정되지 않았습니다")
+
+    payload = {
+        "messages": messages,
+        "stream": True,
+        "max_tokens": max_tokens or settings.LLM_MAX_TOKENS,
+        "temperature": settings.LLM_TEMPERATURE
+    }
+    if settings.LLM_MODEL:
+        payload["model"] = settings.LLM_MODEL
+
+    headers = {"Accept": "text/event-stream"}
+    if settings.LLM_API_KEY:
+        headers["Authorization"] = f"Bearer {settings.LLM_API_KEY}"
+
+    try:
+        async with _get_client().stream("POST", settings.LLM_API_URL, json=payload, headers=headers) as response:
+            if response.status_code >= 400:
+                body = await response.aread()
+                raise LLMError(f"LLM 응답 오류 {response.status_code}: {body[:200]!r}")
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    logger.warning("LLM 응답 파싱 실패: %s", data[:200])
+                    continue
+                for choice in chunk.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+    except httpx.HTTPError as e:
+        raise LLMError(f"LLM 호출 실패: {e.__class__.__name__}") from e
+
+
+async def complete_chat(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> str:
+    """대화 메시지를 보내고 전체 응답 텍스트 반환"""
+    parts = [text async for text in stream_chat(messages, max_tokens)]
+    return "".join(parts)
@@ -8,6 +8,7 @@ from decimal import Decimal
 
 from app.models.progress import UserProgress, SentenceProgress
 from app.models.learning import Chapter, Sentence
+from app.services.unique_user_service import UniqueUserService
 from app.schemas.progress import (
     UserProgressUpdate, SentenceProgressUpdate, ProgressStatsResponse,
     ChapterProgressResponse, UserProgressHistoryResponse
@@ -135,6 +136,14 @@ class ProgressService:
         self.db.commit()
         self.db.refresh(progress)
         
+        # 고유 학습자 스케치 갱신
+        UniqueUserService(self.db).record_chapter_learner(
+            chapter_id,
+            user_id,
+            completed=progress.completion_rate >= 100,
+            at=progress.last_access_at
+        )
+        
         return progress
     
     def get_sentence_progress(self, user_id: int, sentence_id: int) -> Optional[SentenceProgress]:
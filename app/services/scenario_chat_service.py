@@ -0,0 +1,158 @@
+"""
+시나리오 역할극 AI 응답 생성
+
+시나리오, 역할, 이전 대화 요약, 최근 턴으로 프롬프트를 만들어(conversation_context)
+LLM 응답을 토큰 단위로 SSE(text/event-stream)로 전달하고, 응답이 끝나면 턴을
+저장합니다.
+
+이벤트:
+- token: {"text": 응답 조각}
+- done: {"turn_number": 턴 번호, "ai_response": 전체 응답}
+- error: {"detail": 오류 메시지}
+
+첫 토큰까지 걸린 시간(요청 처리 시작 기준)을 llm.ttft_ms 지표로 기록합니다.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.models.scenario import ScenarioProgress
+from app.schemas.scenario import ConversationTurnRequest
+from app.services.conversation_context import fit_messages, needs_summary, summary_scheduler
+from app.services.llm_client import LLMError, stream_chat
+from app.services.scenario_service import ScenarioService
+
+logger = logging.getLogger(__name__)
+
+
+class TurnContext(NamedTuple):
+    """스트리밍 시작 전에 DB에서 준비한 턴 정보"""
+    user_id: int
+    scenario_id: int
+    progress_id: int
+    turn_number: int
+    user_message: str
+    messages: List[Dict[str, str]]
+    started_at: float
+    turns_since_summary: int  # 요약에 포함되지 않은 턴 수 (이번 턴 제외)
+
+
+def _role_text(role) -> str:
+    if role is None:
+        return "미정"
+    return f"{role.role_name} ({role.description})" if role.description else role.role_name
+
+
+def build_system_prompt(progress: ScenarioProgress) -> str:
+    """역할극 시스템 프롬프트 (대화 중 바뀌지 않음)"""
+    scenario = progress.scenario
+    lines = [
+        "당신은 한국어 학습자와 역할극을 하는 대화 상대입니다.",
+        f"시나리오: {scenario.title}" if scenario else None,
+        f"시나리오 설명: {scenario.description}" if scenario and scenario.description else None,
+        f"상황: {progress.description}" if progress.description else None,
+        f"당신의 역할: {_role_text(progress.ai_role)}",
+        f"학습자의 역할: {_role_text(progress.user_role)}",
+        "역할에서 벗어나지 말고, 학습자가 이해하기 쉬운 자연스러운 한국어로 짧게 대답하세요."
+    ]
+    return "\n".join(line for line in lines if line)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _save_turn(context: TurnContext, ai_response: str) -> bool:
+    # 요청 세션은 스트리밍 중 닫힐 수 있으므로 새 세션 사용
+    db = SessionLocal()
+    try:
+        return ScenarioService(db).save_conversation_turn(
+            context.user_id,
+            context.scenario_id,
+            ConversationTurnRequest(
+                user_message=context.user_message,
+                ai_response=ai_response,
+                turn_number=context.turn_number
+            )
+        )
+    finally:
+        db.close()
+
+
+class ScenarioChatService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.scenario_service = ScenarioService(db)
+
+    def prepare_turn(self, user_id: int, scenario_id: int, user_message: str) -> Optional[TurnContext]:
+        """프롬프트 구성 (진행 중인 시나리오가 없으면 None)"""
+        started_at = time.perf_counter()
+
+        progress_id = self.scenario_service.get_active_progress_id(user_id, scenario_id)
+        if progress_id is None:
+            return None
+
+        progress = self.db.query(ScenarioProgress).options(
+            joinedload(ScenarioProgress.scenario),
+            joinedload(ScenarioProgress.user_role),
+            joinedload(ScenarioProgress.ai_role)
+        ).filter(ScenarioProgress.progress_id == progress_id).first()
+        if progress is None:
+            return None
+
+        # 요약된 앞부분은 읽지 않는다
+        summarized_turn = progress.summarized_turn or 0
+        turns = self.scenario_service.get_conversation_turns(
+            [progress_id], after_turn=summarized_turn
+        )[progress_id]
+        last_turn = turns[-1]["turn_number"] if turns else max(summarized_turn, progress.turn_count or 0)
+
+        return TurnContext(
+            user_id=user_id,
+            scenario_id=scenario_id,
+            progress_id=progress_id,
+            turn_number=last_turn + 1,
+            user_message=user_message,
+            messages=fit_messages(build_system_prompt(progress), progress.context_summary, turns, user_message),
+            started_at=started_at,
+            turns_since_summary=len(turns)
+        )
+
+    @staticmethod
+    async def stream_turn(context: TurnContext) -> AsyncIterator[str]:
+        """AI 응답을 SSE 이벤트로 전달하고 끝나면 턴 저장"""
+        parts: List[str] = []
+        try:
+            async for text in stream_chat(context.messages):
+                if not parts:
+                    metrics.observe("llm.ttft_ms", (time.perf_counter() - context.started_at) * 1000)
+                parts.append(text)
+                yield _sse("token", {"text": text})
+        except LLMError:
+            metrics.incr("llm.errors")
+            logger.warning("시나리오 AI 응답 생성 실패: progress_id=%s", context.progress_id, exc_info=True)
+            yield _sse("error", {"detail": "AI 응답 생성에 실패했습니다"})
+            return
+
+        metrics.observe("llm.total_ms", (time.perf_counter() - context.started_at) * 1000)
+        ai_response = "".join(parts)
+
+        try:
+            saved = await asyncio.to_thread(_save_turn, context, ai_response)
+        except Exception:
+            saved = False
+            logger.warning("시나리오 턴 저장 실패: progress_id=%s", context.progress_id, exc_info=True)
+        if not saved:
+            yield _sse("error", {"detail": "대화를 저장하지 못했습니다"})
+            return
+
+        if needs_summary(context.turns_since_summary + 1):
+            summary_scheduler.schedule(context.progress_id)
+
+        yield _sse("done", {"turn_number": context.turn_number, "ai_response": ai_response})
@@ -1,15 +1,41 @@
 """
 시나리오 관련 서비스
 """
+import asyncio
+import logging
+
 from sqlalchemy.orm import Session
-from typing import Optional, List, Tuple
+from sqlalchemy import case, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
 
-from app.models.scenario import Scenario, Role, ScenarioProgress, ScenarioFeedback
+from app.models.scenario import Scenario, Role, ScenarioProgress, ScenarioTurn, ScenarioFeedback
 from app.schemas.scenario import (
     ScenarioCreate, ScenarioUpdate, ScenarioStartRequest, 
-    ConversationTurnRequest, ScenarioCompleteRequest
+    ConversationTurnRequest, ScenarioCompleteRequest, RoleResponse
 )
+from app.core.cache import cached, invalidate_tags
+from app.core.http_cache import bump_content_version
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pagination import Page, paginate
+from app.services.feedback_jobs import READY, feedback_jobs
+from app.services.scenario_sessions import scenario_sessions
+from app.services.unique_user_service import UniqueUserService
+
+logger = logging.getLogger(__name__)
+
+
+def _turn_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    """버퍼에 보관한 턴을 scenario_turns INSERT 값으로 변환"""
+    return {
+        "progress_id": row["progress_id"],
+        "turn_number": row["turn_number"],
+        "user_message": row["user_message"],
+        "ai_response": row["ai_response"],
+        "created_at": datetime.fromisoformat(row["timestamp"])
+    }
 
 
 class ScenarioService:
@@ -21,9 +47,11 @@ class ScenarioService:
         job_id: Optional[int] = None, 
         level_id: Optional[int] = None,
         page: int = 1, 
-        size: int = 20
-    ) -> Tuple[List[Scenario], int]:
-        """시나리오 목록 조회"""
+        size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """시나리오 목록 조회 (cursor 지정 시 keyset 페이지네이션)"""
         query = self.db.query(Scenario)
         
         if job_id is not None:
@@ -32,10 +60,10 @@ class ScenarioService:
         if level_id is not None:
             query = query.filter(Scenario.level_id == level_id)
         
-        total = query.count()
-        scenarios = query.offset((page - 1) * size).limit(size).all()
-        
-        return scenarios, total
+        return paginate(
+            query, Scenario.scenario_id, page, size,
+            cursor=cursor, include_total=include_total, sort_name="scenario_id"
+        )
     
     def get_scenario_by_id(self, scenario_id: int) -> Optional[Scenario]:
         """ID로 시나리오 조회"""
@@ -49,6 +77,8 @@ class ScenarioService:
         self.db.commit()
         self.db.refresh(scenario)
         
+        bump_content_version()
+        
         return scenario
     
     def update_scenario(self, scenario_id: int, scenario_update: ScenarioUpdate) -> Optional[Scenario]:
@@ -64,6 +94,8 @@ class ScenarioService:
         self.db.commit()
         self.db.refresh(scenario)
         
+        bump_content_version()
+        
         return scenario
     
     def delete_scenario(self, scenario_id: int) -> bool:
@@ -75,6 +107,8 @@ class ScenarioService:
         self.db.delete(scenario)
         self.db.commit()
         
+        bump_content_version()
+        
         return True
     
     def start_scenario(
@@ -99,41 +133,193 @@ class ScenarioService:
         self.db.commit()
         self.db.refresh(progress)
         
+        UniqueUserService(self.db).record_scenario_learner(scenario_id, user_id)
+        scenario_sessions.register(user_id, scenario_id, progress.progress_id)
+        
         return progress
     
+    def get_active_progress_id(self, user_id: int, scenario_id: int) -> Optional[int]:
+        """진행 중인 progress_id (세션 레지스트리에 없을 때만 조회 후 등록)"""
+        progress_id = scenario_sessions.get_progress_id(user_id, scenario_id)
+        if progress_id is not None:
+            return progress_id
+        
+        row = self.db.query(ScenarioProgress.progress_id).filter(
+            ScenarioProgress.user_id == user_id,
+            ScenarioProgress.scenario_id == scenario_id,
+            ScenarioProgress.completion_status == "진행중"
+        ).first()
+        if not row:
+            return None
+        
+        scenario_sessions.register(user_id, scenario_id, row.progress_id)
+        return row.progress_id
+    
+    def _upsert_turns(self, rows: List[Dict[str, Any]], overwrite: bool = True) -> None:
+        """
+        대화 턴 INSERT (같은 턴 번호가 있으면 overwrite에 따라 덮어쓰거나 무시)
+        
+        JSON 컬럼에 이어 붙이면 턴마다 대화 전체를 다시 쓰므로 턴 하나당 한 행만 추가합니다.
+        """
+        if not rows:
+            return
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            stmt = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(ScenarioTurn)
+            if overwrite:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ScenarioTurn.progress_id, ScenarioTurn.turn_number],
+                    set_={
+                        "user_message": stmt.excluded.user_message,
+                        "ai_response": stmt.excluded.ai_response
+                    }
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(
+                    index_elements=[ScenarioTurn.progress_id, ScenarioTurn.turn_number]
+                )
+            self.db.execute(stmt, rows)
+            return
+        
+        # ON CONFLICT를 지원하지 않는 DB
+        for row in rows:
+            existing = self.db.query(ScenarioTurn).filter(
+                ScenarioTurn.progress_id == row["progress_id"],
+                ScenarioTurn.turn_number == row["turn_number"]
+            )
+            if existing.first() is None:
+                self.db.execute(insert(ScenarioTurn), [row])
+            elif overwrite:
+                existing.update(
+                    {"user_message": row["user_message"], "ai_response": row["ai_response"]},
+                    synchronize_session=False
+                )
+    
+    def _update_turn_count(self, progress_id: int, turn_number: int) -> None:
+        # 늦게 도착한 이전 턴이 발화 횟수를 줄이지 않도록 큰 값 유지
+        self.db.query(ScenarioProgress).filter(
+            ScenarioProgress.progress_id == progress_id
+        ).update(
+            {
+                ScenarioProgress.turn_count: case(
+                    (ScenarioProgress.turn_count.is_(None), turn_number),
+                    (ScenarioProgress.turn_count < turn_number, turn_number),
+                    else_=ScenarioProgress.turn_count
+                )
+            },
+            synchronize_session=False
+        )
+    
     def save_conversation_turn(
         self, 
         user_id: int, 
         scenario_id: int, 
         conversation_data: ConversationTurnRequest
     ) -> bool:
-        """대화 턴 저장"""
-        progress = self.db.query(ScenarioProgress).filter(
-            ScenarioProgress.user_id == user_id,
-            ScenarioProgress.scenario_id == scenario_id,
-            ScenarioProgress.completion_status == "진행중"
-        ).first()
+        """
+        대화 턴 저장 (같은 턴 번호로 다시 보내면 덮어씀)
         
-        if not progress:
+        Redis 사용 시 등록된 세션이면 조회 없이 턴 버퍼에 추가하고,
+        버퍼가 SCENARIO_TURN_BUFFER_MAX개 이상이면 바로 반영합니다.
+        """
+        progress_id = self.get_active_progress_id(user_id, scenario_id)
+        if progress_id is None:
             return False
         
-        # 대화 내역에 추가
-        if not progress.conversation:
-            progress.conversation = []
-        
-        progress.conversation.append({
+        row = {
+            "progress_id": progress_id,
             "turn_number": conversation_data.turn_number,
             "user_message": conversation_data.user_message,
             "ai_response": conversation_data.ai_response,
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }
+        buffered = scenario_sessions.buffer_turn(user_id, scenario_id, progress_id, row)
+        if buffered is not None:
+            if buffered >= settings.SCENARIO_TURN_BUFFER_MAX:
+                self.flush_buffered_turns(progress_id)
+            return True
         
-        progress.turn_count = conversation_data.turn_number
+        self._upsert_turns([_turn_columns(row)])
+        self._update_turn_count(progress_id, conversation_data.turn_number)
         
         self.db.commit()
         
         return True
     
+    def flush_buffered_turns(self, progress_id: int) -> int:
+        """버퍼에 쌓인 턴을 scenario_turns에 반영하고 반영한 턴 수 반환"""
+        batch = scenario_sessions.take(progress_id)
+        if batch is None or not batch.rows:
+            if batch is not None:
+                scenario_sessions.acknowledge(batch)
+            return 0
+        
+        try:
+            self._upsert_turns([_turn_columns(row) for row in batch.rows])
+            self._update_turn_count(progress_id, batch.rows[-1]["turn_number"])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        scenario_sessions.acknowledge(batch)
+        return len(batch.rows)
+    
+    def get_conversation_turns(
+        self, progress_ids: Iterable[int], after_turn: int = 0
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        진행 기록별 대화 내역 일괄 조회
+        
+        scenario_turns 도입 전에 저장된 진행 기록은 conversation JSON을 그대로 반환합니다.
+        
+        Args:
+            after_turn: 이 턴 번호 이후만 조회 (요약된 앞부분 제외)
+        """
+        progress_ids = list(progress_ids)
+        conversations: Dict[int, List[Dict[str, Any]]] = {progress_id: [] for progress_id in progress_ids}
+        if not progress_ids:
+            return conversations
+        
+        turns = self.db.query(ScenarioTurn).filter(
+            ScenarioTurn.progress_id.in_(progress_ids),
+            ScenarioTurn.turn_number > after_turn
+        ).order_by(ScenarioTurn.progress_id, ScenarioTurn.turn_number).all()
+        for turn in turns:
+            conversations[turn.progress_id].append({
+                "turn_number": turn.turn_number,
+                "user_message": turn.user_message,
+                "ai_response": turn.ai_response,
+                "timestamp": turn.created_at.isoformat() if turn.created_at else None
+            })
+        
+        legacy_ids = [progress_id for progress_id, turns in conversations.items() if not turns]
+        if legacy_ids:
+            for progress_id, conversation in self.db.query(
+                ScenarioProgress.progress_id, ScenarioProgress.conversation
+            ).filter(ScenarioProgress.progress_id.in_(legacy_ids)):
+                conversations[progress_id] = [
+                    turn for turn in conversation or []
+                    if (turn.get("turn_number") or 0) > after_turn
+                ]
+        
+        # 아직 반영되지 않은 턴 (같은 턴 번호는 버퍼 값이 최신)
+        for progress_id, rows in scenario_sessions.buffered_turns(progress_ids).items():
+            merged = {turn["turn_number"]: turn for turn in conversations[progress_id]}
+            for row in rows:
+                if row["turn_number"] <= after_turn:
+                    continue
+                merged[row["turn_number"]] = {
+                    "turn_number": row["turn_number"],
+                    "user_message": row["user_message"],
+                    "ai_response": row["ai_response"],
+                    "timestamp": row["timestamp"]
+                }
+            conversations[progress_id] = [merged[number] for number in sorted(merged)]
+        
+        return conversations
+    
     def complete_scenario(
         self, 
         user_id: int, 
@@ -150,20 +336,52 @@ class ScenarioService:
         if not progress:
             return False
         
-        progress.conversation = complete_data.final_conversation
+        # 버퍼에 남은 턴을 같은 트랜잭션에서 반영
+        batch = scenario_sessions.take(progress.progress_id)
+        if batch is not None and batch.rows:
+            self._upsert_turns([_turn_columns(row) for row in batch.rows])
+        
+        # 턴 저장 요청이 누락된 경우를 위해 최종 대화 중 없는 턴만 추가
+        self._upsert_turns([
+            {
+                "progress_id": progress.progress_id,
+                "turn_number": turn["turn_number"],
+                "user_message": turn.get("user_message") or "",
+                "ai_response": turn.get("ai_response") or ""
+            }
+            for turn in complete_data.final_conversation
+            if isinstance(turn, dict) and isinstance(turn.get("turn_number"), int)
+        ], overwrite=False)
+        self.db.flush()
+        
+        # 완료 시점에 한 번만 스냅샷 저장
+        conversation = self.get_conversation_turns([progress.progress_id])[progress.progress_id]
+        progress.conversation = conversation or complete_data.final_conversation
+        if conversation:
+            progress.turn_count = max(progress.turn_count or 0, conversation[-1]["turn_number"])
         progress.completion_status = "완료"
         progress.end_time = datetime.utcnow()
         
         self.db.commit()
         
+        if batch is not None:
+            scenario_sessions.acknowledge(batch)
+        scenario_sessions.forget(user_id, scenario_id)
+        
+        UniqueUserService(self.db).record_scenario_learner(scenario_id, user_id, completed=True)
+        
         return True
     
-    def get_scenario_feedback(self, user_id: int, scenario_id: int) -> Optional[ScenarioFeedback]:
-        """시나리오 피드백 조회"""
-        progress = self.db.query(ScenarioProgress).filter(
+    def get_latest_progress(self, user_id: int, scenario_id: int) -> Optional[ScenarioProgress]:
+        """가장 최근 진행 기록"""
+        return self.db.query(ScenarioProgress).filter(
             ScenarioProgress.user_id == user_id,
             ScenarioProgress.scenario_id == scenario_id
-        ).first()
+        ).order_by(ScenarioProgress.start_time.desc()).first()
+    
+    def get_scenario_feedback(self, user_id: int, scenario_id: int) -> Optional[ScenarioFeedback]:
+        """시나리오 피드백 조회"""
+        progress = self.get_latest_progress(user_id, scenario_id)
         
         if not progress:
             return None
@@ -172,40 +390,43 @@ class ScenarioService:
             ScenarioFeedback.log_id == progress.progress_id
         ).first()
     
-    def generate_scenario_feedback(self, user_id: int, scenario_id: int) -> bool:
-        """AI 피드백 생성 요청"""
-        # TODO: 실제 AI 서비스 연동 구현
-        # 현재는 기본 피드백 생성
-        progress = self.db.query(ScenarioProgress).filter(
-            ScenarioProgress.user_id == user_id,
-            ScenarioProgress.scenario_id == scenario_id
-        ).first()
+    def get_scenario_feedback_status(
+        self, user_id: int, scenario_id: int
+    ) -> Optional[Tuple[int, Optional[ScenarioFeedback], Optional[Dict[str, Any]]]]:
+        """
+        피드백 생성 상태 조회
         
+        Returns:
+            (progress_id, 저장된 피드백, 작업 상태), 진행 기록이 없으면 None
+        """
+        progress = self.get_latest_progress(user_id, scenario_id)
         if not progress:
-            return False
+            return None
         
-        # 기본 피드백 생성
-        feedback = ScenarioFeedback(
-            user_id=user_id,
-            log_id=progress.progress_id,
-            pronunciation_score=85,
-            accuracy_score=90,
-            fluency_score=80,
-            completeness_score=88,
-            total_score=86,
-            comment="전반적으로 잘하셨습니다. 발음을 조금 더 명확하게 하시면 좋겠습니다.",
-            detail_comment=[
-                "발음: 'ㅅ'과 'ㅆ' 구분을 더 명확하게 해주세요",
-                "유창성: 문장을 더 자연스럽게 연결해보세요",
-                "완성도: 대화의 맥락을 더 잘 파악해보세요"
-            ]
-        )
+        feedback = self.db.query(ScenarioFeedback).filter(
+            ScenarioFeedback.log_id == progress.progress_id
+        ).first()
+        job = None if feedback else feedback_jobs.status(progress.progress_id)
+        return progress.progress_id, feedback, job
+    
+    def request_scenario_feedback(self, user_id: int, scenario_id: int) -> Optional[Tuple[int, str]]:
+        """
+        AI 피드백 생성 요청 (작업 큐에 등록)
         
-        self.db.add(feedback)
-        self.db.commit()
+        Returns:
+            (progress_id, 상태), 진행 기록이 없으면 None
+        """
+        current = self.get_scenario_feedback_status(user_id, scenario_id)
+        if current is None:
+            return None
         
-        return True
+        progress_id, feedback, _ = current
+        if feedback is not None:
+            return progress_id, READY
+        
+        return progress_id, feedback_jobs.enqueue(progress_id)["status"]
     
+    @cached("roles", ttl=3600, tags=["roles"], model=RoleResponse)
     def get_roles(self) -> List[Role]:
         """모든 역할 조회"""
         return self.db.query(Role).all()
@@ -218,4 +439,37 @@ class ScenarioService:
         self.db.commit()
         self.db.refresh(role)
         
+        invalidate_tags("roles")
+        
         return role
+
+
+def flush_idle_scenario_sessions() -> int:
+    """입력이 멈춘 세션의 버퍼 턴 반영 (백그라운드 작업)"""
+    progress_ids = scenario_sessions.idle_progress_ids()
+    if not progress_ids:
+        return 0
+    
+    db = SessionLocal()
+    flushed = 0
+    try:
+        service = ScenarioService(db)
+        for progress_id in progress_ids:
+            try:
+                flushed += service.flush_buffered_turns(progress_id)
+            except Exception:
+                # 버퍼에 남아 다음 주기에 재시도
+                logger.warning("대화 턴 반영 실패: %s", progress_id, exc_info=True)
+    finally:
+        db.close()
+    return flushed
+
+
+async def run_scenario_session_sweeper() -> None:
+    """주기적으로 유휴 세션의 버퍼 턴 반영"""
+    if not scenario_sessions.enabled:
+        return
+    
+    while True:
+        await asyncio.sleep(settings.SCENARIO_SESSION_SWEEP_INTERVAL)
+        await asyncio.to_thread(flush_idle_scenario_sessions)
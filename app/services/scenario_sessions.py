@@ -0,0 +1,190 @@
+"""
+진행 중인 시나리오 세션 레지스트리
+
+대화 턴을 저장할 때마다 진행중 ScenarioProgress를 조회하지 않도록
+(user_id, scenario_id) → progress_id를 Redis에 TTL과 함께 보관하고,
+턴은 Redis 해시에 모아 두었다가 완료 시 또는 일정 시간 입력이 없을 때
+한 번에 scenario_turns에 반영합니다.
+
+키 구성:
+- scenario:session:{user_id}:{scenario_id}: progress_id (SCENARIO_SESSION_TTL)
+- scenario:turns:{progress_id}: 턴 번호 → 턴 JSON (SCENARIO_SESSION_TTL)
+- scenario:sessions:active: 반영할 턴이 있는 progress_id, 점수는 마지막 턴 시각
+
+반영은 해시를 읽어 DB에 쓴 뒤, 그 사이 바뀌지 않은 필드만 지웁니다(WATCH).
+반영 중 새 턴이 들어오면 해시에 남아 다음 반영 때 처리됩니다.
+Redis가 없으면 아무것도 보관하지 않고 호출자가 DB에 바로 씁니다.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_KEY = "scenario:sessions:active"
+SWEEP_LOCK_KEY = "scenario:sessions:sweep_lock"
+
+
+def _session_key(user_id: int, scenario_id: int) -> str:
+    return f"scenario:session:{user_id}:{scenario_id}"
+
+
+def _turns_key(progress_id: int) -> str:
+    return f"scenario:turns:{progress_id}"
+
+
+class BufferedTurns:
+    """반영할 턴 묶음 (반영 후 acknowledge()에 그대로 전달)"""
+
+    __slots__ = ("progress_id", "rows", "_raw")
+
+    def __init__(self, progress_id: int, raw: Dict[bytes, bytes]):
+        self.progress_id = progress_id
+        self._raw = raw
+        self.rows: List[Dict[str, Any]] = sorted(
+            (json.loads(value) for value in raw.values()),
+            key=lambda row: row["turn_number"]
+        )
+
+
+class ScenarioSessionRegistry:
+    """(user_id, scenario_id) → progress_id 매핑과 턴 버퍼"""
+
+    @property
+    def enabled(self) -> bool:
+        return get_redis() is not None
+
+    # 세션
+    def get_progress_id(self, user_id: int, scenario_id: int) -> Optional[int]:
+        """진행 중인 progress_id (모르면 None)"""
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(_session_key(user_id, scenario_id))
+        except Exception:
+            logger.warning("시나리오 세션 조회 실패", exc_info=True)
+            return None
+        return int(value) if value is not None else None
+
+    def register(self, user_id: int, scenario_id: int, progress_id: int) -> None:
+        """진행 중인 세션 등록 (시작 시 또는 DB 조회 후)"""
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.set(_session_key(user_id, scenario_id), progress_id, ex=settings.SCENARIO_SESSION_TTL)
+        except Exception:
+            logger.warning("시나리오 세션 등록 실패", exc_info=True)
+
+    def forget(self, user_id: int, scenario_id: int) -> None:
+        """세션 등록 해제 (완료/중단 시)"""
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.delete(_session_key(user_id, scenario_id))
+        except Exception:
+            logger.warning("시나리오 세션 해제 실패", exc_info=True)
+
+    # 턴 버퍼
+    def buffer_turn(self, user_id: int, scenario_id: int, progress_id: int, row: Dict[str, Any]) -> Optional[int]:
+        """
+        턴을 버퍼에 추가
+
+        Returns:
+            버퍼에 쌓인 턴 수 (버퍼를 쓸 수 없으면 None, 호출자가 DB에 바로 저장)
+        """
+        client = get_redis()
+        if client is None:
+            return None
+
+        key = _turns_key(progress_id)
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(key, row["turn_number"], json.dumps(row, ensure_ascii=False))
+            pipe.expire(key, settings.SCENARIO_SESSION_TTL)
+            pipe.zadd(ACTIVE_KEY, {progress_id: time.time()})
+            pipe.expire(_session_key(user_id, scenario_id), settings.SCENARIO_SESSION_TTL)
+            pipe.hlen(key)
+            return pipe.execute()[-1]
+        except Exception:
+            logger.warning("대화 턴 버퍼 저장 실패, DB에 바로 저장: %s", progress_id, exc_info=True)
+            return None
+
+    def buffered_turns(self, progress_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """아직 DB에 반영되지 않은 턴 조회"""
+        progress_ids = list(progress_ids)
+        client = get_redis()
+        if client is None or not progress_ids:
+            return {}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for progress_id in progress_ids:
+                pipe.hgetall(_turns_key(progress_id))
+            results = pipe.execute()
+        except Exception:
+            logger.warning("대화 턴 버퍼 조회 실패", exc_info=True)
+            return {}
+        return {
+            progress_id: BufferedTurns(progress_id, raw).rows
+            for progress_id, raw in zip(progress_ids, results)
+            if raw
+        }
+
+    def take(self, progress_id: int) -> Optional[BufferedTurns]:
+        """반영할 턴 읽기 (버퍼에서 지우지 않음)"""
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.hgetall(_turns_key(progress_id))
+        except Exception:
+            logger.warning("대화 턴 버퍼 조회 실패: %s", progress_id, exc_info=True)
+            return None
+        return BufferedTurns(progress_id, raw)
+
+    def acknowledge(self, batch: BufferedTurns) -> None:
+        """DB에 반영한 턴을 버퍼에서 제거 (반영 중 바뀐 턴은 유지)"""
+        client = get_redis()
+        if client is None:
+            return
+        key = _turns_key(batch.progress_id)
+
+        def _remove(pipe) -> None:
+            current = pipe.hgetall(key)
+            fields = [field for field, value in batch._raw.items() if current.get(field) == value]
+            pipe.multi()
+            if fields:
+                pipe.hdel(key, *fields)
+            if len(current) == len(fields):
+                pipe.zrem(ACTIVE_KEY, batch.progress_id)
+
+        try:
+            client.transaction(_remove, key)
+        except Exception:
+            # 버퍼에 남은 턴은 다음 반영 때 다시 쓰인다 (같은 턴 번호는 덮어씀)
+            logger.warning("대화 턴 버퍼 정리 실패: %s", batch.progress_id, exc_info=True)
+
+    def idle_progress_ids(self, limit: int = 100) -> List[int]:
+        """SCENARIO_SESSION_IDLE_TIMEOUT 동안 새 턴이 없는 세션 (여러 워커 중 하나만 반환)"""
+        client = get_redis()
+        if client is None:
+            return []
+        try:
+            lock_ms = settings.SCENARIO_SESSION_SWEEP_INTERVAL * 1000
+            if not client.set(SWEEP_LOCK_KEY, 1, nx=True, px=lock_ms):
+                return []
+            cutoff = time.time() - settings.SCENARIO_SESSION_IDLE_TIMEOUT
+            members = client.zrangebyscore(ACTIVE_KEY, "-inf", cutoff, start=0, num=limit)
+        except Exception:
+            logger.warning("유휴 시나리오 세션 조회 실패", exc_info=True)
+            return []
+        return [int(member) for member in members]
+
+
+scenario_sessions = ScenarioSessionRegistry()
@@ -4,8 +4,13 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
+from app.core.cache import cached, invalidate_tags
+from app.core.http_cache import bump_content_version
 from app.models.learning import Sentence, SimilarSentence
-from app.schemas.learning import SentenceCreate, SentenceUpdate
+from app.schemas.learning import (
+    SentenceCreate, SentenceUpdate, SentenceResponse, SimilarSentenceResponse
+)
+from app.services.content_snapshot import get_content_snapshot
 
 
 class SentenceService:
@@ -14,6 +19,18 @@ class SentenceService:
     
     def get_sentence_by_id(self, sentence_id: int) -> Optional[Sentence]:
         """ID로 문장 조회"""
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.sentences_by_id.get(sentence_id)
+        
+        return self._get_cached_sentence(sentence_id)
+    
+    @cached("sentence", tags=["sentences"], model=SentenceResponse)
+    def _get_cached_sentence(self, sentence_id: int) -> Optional[Sentence]:
+        return self._get_sentence(sentence_id)
+    
+    def _get_sentence(self, sentence_id: int) -> Optional[Sentence]:
+        """수정용 문장 조회 (캐시 미사용)"""
         return self.db.query(Sentence).filter(Sentence.sentence_id == sentence_id).first()
     
     def create_sentence(self, sentence_data: SentenceCreate) -> Sentence:
@@ -24,11 +41,14 @@ class SentenceService:
         self.db.commit()
         self.db.refresh(sentence)
         
+        invalidate_tags("sentences")
+        bump_content_version()
+        
         return sentence
     
     def update_sentence(self, sentence_id: int, sentence_update: SentenceUpdate) -> Optional[Sentence]:
         """문장 수정"""
-        sentence = self.get_sentence_by_id(sentence_id)
+        sentence = self._get_sentence(sentence_id)
         if not sentence:
             return None
         
@@ -39,24 +59,38 @@ class SentenceService:
         self.db.commit()
         self.db.refresh(sentence)
         
+        invalidate_tags("sentences")
+        bump_content_version()
+        
         return sentence
     
     def delete_sentence(self, sentence_id: int) -> bool:
         """문장 삭제"""
-        sentence = self.get_sentence_by_id(sentence_id)
+        sentence = self._get_sentence(sentence_id)
         if not sentence:
             return False
         
         self.db.delete(sentence)
         self.db.commit()
         
+        invalidate_tags("sentences")
+        bump_content_version()
+        
         return True
     
     def get_similar_sentences(self, sentence_id: int) -> List[SimilarSentence]:
         """유사 문장 목록 조회"""
+        snapshot = get_content_snapshot()
+        if snapshot is not None:
+            return snapshot.get_similar_sentences(sentence_id)
+        
+        return self._query_similar_sentences(sentence_id)
+    
+    @cached("similar_sentences", tags=["sentences"], model=SimilarSentenceResponse)
+    def _query_similar_sentences(self, sentence_id: int) -> List[SimilarSentence]:
         return self.db.query(SimilarSentence).filter(
             SimilarSentence.sentence_id == sentence_id
-        ).all()
+        ).order_by(SimilarSentence.similar_sentence_id).all()
     
     def create_similar_sentence(self, similar_sentence_data: dict) -> SimilarSentence:
         """유사 문장 생성"""
@@ -66,4 +100,7 @@ class SentenceService:
         self.db.commit()
         self.db.refresh(similar_sentence)
         
+        invalidate_tags("sentences")
+        bump_content_version()
+        
         return similar_sentence
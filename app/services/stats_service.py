@@ -7,8 +7,9 @@ from sqlalchemy import func
 
 from app.models.user import User, UserStatus
 from app.models.learning import Chapter, ChapterFeedback
-from app.models.scenario import Scenario, ScenarioFeedback
+from app.models.scenario import Scenario, ScenarioProgress, ScenarioFeedback
 from app.models.progress import UserProgress, SentenceProgress
+from app.services.unique_user_service import UniqueUserService
 
 
 class StatsService:
@@ -67,16 +68,10 @@ class StatsService:
         if not chapter:
             return None
         
-        # 챕터를 학습한 사용자 수
-        total_users = self.db.query(UserProgress).filter(
-            UserProgress.chapter_id == chapter_id
-        ).count()
-        
-        # 챕터를 완료한 사용자 수
-        completed_users = self.db.query(UserProgress).filter(
-            UserProgress.chapter_id == chapter_id,
-            UserProgress.completion_rate >= 100
-        ).count()
+        # 챕터를 학습/완료한 고유 사용자 수 (HyperLogLog 추정치)
+        unique_users = UniqueUserService(self.db).get_chapter_unique_users(chapter_id)
+        total_users = unique_users["total_users"]
+        completed_users = min(unique_users["completed_users"], total_users)
         
         # 평균 점수
         avg_score = self.db.query(func.avg(ChapterFeedback.total_score)).filter(
@@ -93,6 +88,12 @@ class StatsService:
             "chapter_title": chapter.title,
             "total_users": total_users,
             "completed_users": completed_users,
+            "unique_users": {
+                "daily": unique_users["daily"],
+                "weekly": unique_users["weekly"],
+                "monthly": unique_users["monthly"]
+            },
+            "is_estimate": unique_users["is_estimate"],
             "completion_rate": (completed_users / total_users * 100) if total_users > 0 else 0,
             "average_score": float(avg_score) if avg_score else None,
             "average_completion_time": float(avg_completion_time) if avg_completion_time else None,
@@ -107,16 +108,10 @@ class StatsService:
         if not scenario:
             return None
         
-        # 시나리오를 수행한 사용자 수
-        total_users = self.db.query(ScenarioProgress).filter(
-            ScenarioProgress.scenario_id == scenario_id
-        ).count()
-        
-        # 시나리오를 완료한 사용자 수
-        completed_users = self.db.query(ScenarioProgress).filter(
-            ScenarioProgress.scenario_id == scenario_id,
-            ScenarioProgress.completion_status == "완료"
-        ).count()
+        # 시나리오를 수행/완료한 고유 사용자 수 (HyperLogLog 추정치)
+        unique_users = UniqueUserService(self.db).get_scenario_unique_users(scenario_id)
+        total_users = unique_users["total_users"]
+        completed_users = min(unique_users["completed_users"], total_users)
         
         # 평균 점수
         avg_score = self.db.query(func.avg(ScenarioFeedback.total_score)).join(
@@ -130,6 +125,12 @@ class StatsService:
             "scenario_title": scenario.title,
             "total_users": total_users,
             "completed_users": completed_users,
+            "unique_users": {
+                "daily": unique_users["daily"],
+                "weekly": unique_users["weekly"],
+                "monthly": unique_users["monthly"]
+            },
+            "is_estimate": unique_users["is_estimate"],
             "completion_rate": (completed_users / total_users * 100) if total_users > 0 else 0,
             "average_score": float(avg_score) if avg_score else None,
             "total_feedback_count": self.db.query(ScenarioFeedback).join(
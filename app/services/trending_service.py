@@ -0,0 +1,287 @@
+"""
+커뮤니티 인기(trending) 정렬
+
+점수는 Reddit hot 방식으로 계산합니다.
+
+    score = log10(max(조회수 + 댓글수 × TRENDING_REPLY_WEIGHT, 1)) + 작성 시각(epoch) / TRENDING_DECAY_SECONDS
+
+작성 시각 항이 시간에 따라 커지므로 새 글이 오래된 글보다 위로 올라가고,
+TRENDING_DECAY_SECONDS마다 참여도가 10배여야 같은 순위를 유지합니다.
+현재 시각이 식에 없어 점수는 참여도가 바뀔 때만 다시 계산하면 됩니다.
+
+점수는 Redis 정렬 집합(trending:all, trending:cat:{카테고리})에 보관하고,
+조회/댓글/작성으로 바뀐 게시글은 trending:dirty 집합에 넣어 두었다가 백그라운드
+작업이 모아서 다시 계산합니다. 목록 조회는 ZREVRANGE 한 번 + 기본 키 조회입니다.
+Redis가 없으면 PostgreSQL에서는 같은 식으로 ORDER BY, 그 외 DB는 작성일순입니다.
+"""
+import asyncio
+import logging
+import math
+from datetime import timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.counting import count_total
+from app.core.database import SessionLocal
+from app.core.pagination import Page, decode_cursor, encode_cursor
+from app.core.redis_client import get_redis
+from app.models.community import Post, PostCategory
+
+logger = logging.getLogger(__name__)
+
+ALL_KEY = "trending:all"
+DIRTY_KEY = "trending:dirty"
+BUILT_KEY = "trending:built"
+REBUILD_LOCK_KEY = "trending:rebuilding"
+REBUILD_LOCK_TTL = 600
+SORT_NAME = "trending"
+
+
+def _category_key(category: str) -> str:
+    return f"trending:cat:{category}"
+
+
+def _category_value(category) -> str:
+    return category.value if isinstance(category, PostCategory) else str(category)
+
+
+def hot_score(view_count: int, reply_count: int, created_at) -> float:
+    """인기 점수 계산 (created_at은 UTC naive, SQL 식의 extract(epoch)와 같은 값)"""
+    engagement = (view_count or 0) + (reply_count or 0) * settings.TRENDING_REPLY_WEIGHT
+    return math.log10(max(engagement, 1)) + created_at.replace(tzinfo=timezone.utc).timestamp() / settings.TRENDING_DECAY_SECONDS
+
+
+def hot_score_expression():
+    """PostgreSQL용 인기 점수 식 (Redis 미사용 시 정렬)"""
+    engagement = func.coalesce(Post.view_count, 0) + Post.reply_count * settings.TRENDING_REPLY_WEIGHT
+    return (
+        func.log(func.greatest(engagement, 1))
+        + func.extract("epoch", Post.created_at) / literal(settings.TRENDING_DECAY_SECONDS)
+    )
+
+
+class TrendingService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.redis = get_redis()
+
+    # 변경 기록
+    def mark_dirty(self, *post_ids: int) -> None:
+        """점수 재계산 대상 기록"""
+        if self.redis is None or not post_ids:
+            return
+        try:
+            self.redis.sadd(DIRTY_KEY, *post_ids)
+        except Exception:
+            logger.warning("인기 점수 갱신 대상 기록 실패: %s", post_ids, exc_info=True)
+
+    def remove(self, post_id: int) -> None:
+        """삭제된 게시글 제거"""
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem(ALL_KEY, post_id)
+            for category in PostCategory:
+                pipe.zrem(_category_key(category.value), post_id)
+            pipe.execute()
+        except Exception:
+            logger.warning("인기 목록에서 게시글 제거 실패: %s", post_id, exc_info=True)
+
+    # 조회
+    def get_posts(
+        self,
+        query: Query,
+        category: Optional[str],
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Page:
+        """
+        인기순 게시글 목록
+
+        Args:
+            query: 카테고리 필터가 적용된 게시글 쿼리 (정렬 미적용)
+        """
+        page_result = None
+        if self.redis is not None:
+            try:
+                page_result = self._get_posts_from_redis(query, category, page, size, cursor)
+            except Exception:
+                logger.warning("인기 목록 조회 실패, DB 정렬 사용", exc_info=True)
+        if page_result is None:
+            page_result = self._get_posts_from_db(query, page, size)
+
+        # 정렬 집합은 TRENDING_MAX_ITEMS개로 잘리므로 전체 개수는 DB 기준 (다른 정렬과 같은 방식)
+        total, is_estimate = count_total(query) if include_total else (None, False)
+        return page_result._replace(total=total, is_estimate=is_estimate)
+
+    def _get_posts_from_redis(
+        self,
+        query: Query,
+        category: Optional[str],
+        page: int,
+        size: int,
+        cursor: Optional[str]
+    ) -> Page:
+        key = _category_key(category) if category else ALL_KEY
+
+        if cursor:
+            score, last_post_id = decode_cursor(cursor, SORT_NAME)
+            rank = self.redis.zrevrank(key, last_post_id)
+            # 마지막 게시글이 빠졌거나 점수가 바뀌었으면 점수 기준으로 위치 계산
+            if rank is None or self.redis.zscore(key, last_post_id) != score:
+                start = self.redis.zcount(key, f"({score}", "+inf")
+            else:
+                start = rank + 1
+        else:
+            start = (page - 1) * size
+
+        entries = self.redis.zrevrange(key, start, start + size, withscores=True)
+
+        has_more = len(entries) > size
+        entries = entries[:size]
+        post_ids = [int(member) for member, _ in entries]
+
+        # 호출자가 지정한 로딩 옵션(작성자 JOIN 등)을 유지하도록 전달받은 쿼리 사용
+        posts_by_id = {
+            post.post_id: post
+            for post in query.filter(Post.post_id.in_(post_ids)).all()
+        } if post_ids else {}
+        posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+        next_cursor = None
+        if has_more and entries:
+            member, score = entries[-1]
+            next_cursor = encode_cursor(SORT_NAME, score, int(member))
+
+        return Page(posts, None, next_cursor)
+
+    def _get_posts_from_db(self, query: Query, page: int, size: int) -> Page:
+        if self.db.get_bind().dialect.name == "postgresql":
+            query = query.order_by(hot_score_expression().desc(), Post.post_id.desc())
+        else:
+            query = query.order_by(Post.created_at.desc(), Post.post_id.desc())
+        posts = query.offset((page - 1) * size).limit(size).all()
+        return Page(posts, None)
+
+    # 점수 계산
+    def refresh_dirty(self) -> int:
+        """변경된 게시글 점수 재계산 (백그라운드 작업)"""
+        if self.redis is None:
+            return 0
+
+        refreshed = 0
+        while True:
+            try:
+                members = self.redis.spop(DIRTY_KEY, settings.TRENDING_BATCH_SIZE)
+            except Exception:
+                logger.warning("인기 점수 갱신 대상 조회 실패", exc_info=True)
+                return refreshed
+            if not members:
+                return refreshed
+
+            post_ids = [int(member) for member in members]
+            try:
+                self._score_posts(post_ids)
+            except Exception:
+                # 다음 주기에 다시 처리
+                self.db.rollback()
+                self.mark_dirty(*post_ids)
+                logger.warning("인기 점수 갱신 실패", exc_info=True)
+                return refreshed
+            refreshed += len(post_ids)
+
+    def rebuild(self, force: bool = False) -> bool:
+        """전체 게시글 점수 재구성 (최초 1회)"""
+        if self.redis is None:
+            return False
+        try:
+            if not force and self.redis.exists(BUILT_KEY):
+                return False
+            # 여러 워커 중 한 워커만 재구성 (실패하거나 워커가 죽으면 잠금 해제/만료 후 재시도)
+            if not self.redis.set(REBUILD_LOCK_KEY, 1, nx=True, ex=REBUILD_LOCK_TTL):
+                return False
+        except Exception:
+            logger.warning("인기 목록 재구성 마커 확인 실패", exc_info=True)
+            return False
+
+        try:
+            batch: List[int] = []
+            for (post_id,) in self.db.query(Post.post_id).yield_per(1000):
+                batch.append(post_id)
+                if len(batch) >= settings.TRENDING_BATCH_SIZE:
+                    self._score_posts(batch)
+                    batch = []
+            if batch:
+                self._score_posts(batch)
+            # 재구성이 끝까지 성공한 경우에만 완료 표시
+            self.redis.set(BUILT_KEY, 1)
+        finally:
+            self.redis.delete(REBUILD_LOCK_KEY)
+        return True
+
+    def _score_posts(self, post_ids: Iterable[int]) -> None:
+        # 순환 import 방지
+        from app.services.view_counter import view_counter
+
+        post_ids = list(post_ids)
+        rows = self.db.query(
+            Post.post_id, Post.category, Post.view_count, Post.reply_count, Post.created_at
+        ).filter(Post.post_id.in_(post_ids)).all()
+        pending_views = view_counter.pending(post_ids, db=self.db)
+
+        scores: Dict[int, float] = {}
+        pipe = self.redis.pipeline(transaction=False)
+        for post_id, category, view_count, reply_count, created_at in rows:
+            score = hot_score((view_count or 0) + pending_views.get(post_id, 0), reply_count, created_at)
+            scores[post_id] = score
+            category_value = _category_value(category)
+            pipe.zadd(ALL_KEY, {post_id: score})
+            # 카테고리가 바뀐 경우를 위해 다른 카테고리 집합에서는 제거
+            for other in PostCategory:
+                if other.value == category_value:
+                    pipe.zadd(_category_key(other.value), {post_id: score})
+                else:
+                    pipe.zrem(_category_key(other.value), post_id)
+
+        # 삭제된 게시글
+        for post_id in set(post_ids) - scores.keys():
+            pipe.zrem(ALL_KEY, post_id)
+            for category in PostCategory:
+                pipe.zrem(_category_key(category.value), post_id)
+
+        # 상위 TRENDING_MAX_ITEMS개만 유지
+        keep = settings.TRENDING_MAX_ITEMS
+        pipe.zremrangebyrank(ALL_KEY, 0, -keep - 1)
+        for category in PostCategory:
+            pipe.zremrangebyrank(_category_key(category.value), 0, -keep - 1)
+        pipe.execute()
+
+
+def refresh_trending() -> None:
+    """인기 점수 재계산 (최초 실행 시 전체 재구성)"""
+    db = SessionLocal()
+    try:
+        service = TrendingService(db)
+        if service.rebuild():
+            logger.info("인기 목록 재구성 완료")
+        service.refresh_dirty()
+    except Exception:
+        logger.warning("인기 점수 갱신 실패", exc_info=True)
+    finally:
+        db.close()
+
+
+async def run_trending_worker() -> None:
+    """주기적으로 변경된 게시글 점수 재계산"""
+    if get_redis() is None:
+        return
+
+    while True:
+        await asyncio.to_thread(refresh_trending)
+        await asyncio.sleep(settings.TRENDING_REFRESH_INTERVAL)
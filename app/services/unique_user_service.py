@@ -0,0 +1,243 @@
+"""
+고유 학습자 수 집계 서비스 (HyperLogLog)
+
+챕터/시나리오별로 전체, 완료, 일별 HyperLogLog 스케치를 Redis에 유지합니다.
+Redis의 PFCOUNT는 여러 키를 병합해 계산하므로 일/주/월 고유 학습자 수를
+테이블 크기와 무관하게 조회할 수 있습니다. Redis를 사용할 수 없으면 DB에서
+COUNT(DISTINCT user_id)로 정확한 값을 계산합니다.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import func, distinct
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis_client import get_redis
+from app.models.progress import UserProgress
+from app.models.scenario import ScenarioProgress
+
+logger = logging.getLogger(__name__)
+
+# 집계 구간 (일)
+WINDOWS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+BACKFILL_MARKER_KEY = "hll:backfilled"
+BACKFILL_LOCK_KEY = "hll:backfilling"
+BACKFILL_LOCK_TTL = 3600
+BACKFILL_BATCH_SIZE = 1000  # 파이프라인 한 번에 보내는 명령 수
+
+
+def _day_suffix(day: datetime) -> str:
+    return day.strftime("%Y%m%d")
+
+
+class UniqueUserService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.redis = get_redis()
+
+    # 기록
+    def record_chapter_learner(
+        self,
+        chapter_id: int,
+        user_id: int,
+        completed: bool = False,
+        at: Optional[datetime] = None
+    ) -> None:
+        """챕터 학습자 기록"""
+        self._record("chapter", chapter_id, user_id, completed, at)
+
+    def record_scenario_learner(
+        self,
+        scenario_id: int,
+        user_id: int,
+        completed: bool = False,
+        at: Optional[datetime] = None
+    ) -> None:
+        """시나리오 학습자 기록"""
+        self._record("scenario", scenario_id, user_id, completed, at)
+
+    def _record(
+        self,
+        kind: str,
+        target_id: int,
+        user_id: int,
+        completed: bool,
+        at: Optional[datetime]
+    ) -> None:
+        if self.redis is None:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._queue_record(pipe, kind, target_id, user_id, completed, at)
+            pipe.execute()
+        except Exception:
+            # 집계 실패가 학습 기록 저장을 막지 않도록 한다
+            logger.warning("고유 학습자 스케치 갱신 실패: hll:%s:%s", kind, target_id, exc_info=True)
+
+    @staticmethod
+    def _queue_record(pipe, kind: str, target_id: int, user_id: int, completed: bool, at: Optional[datetime]) -> None:
+        now = datetime.utcnow()
+        day = at or now
+        ttl = timedelta(days=settings.UNIQUE_USERS_DAILY_KEY_TTL_DAYS)
+        prefix = f"hll:{kind}:{target_id}"
+        day_key = f"{prefix}:d:{_day_suffix(day)}"
+        member = str(user_id)
+
+        pipe.pfadd(f"{prefix}:all", member)
+        # 보관 기간이 지난 날짜의 일별 스케치는 만들지 않는다
+        if now - day < ttl:
+            pipe.pfadd(day_key, member)
+            pipe.expire(day_key, ttl)
+        if completed:
+            pipe.pfadd(f"{prefix}:completed", member)
+
+    # 조회
+    def get_chapter_unique_users(self, chapter_id: int) -> Dict[str, Any]:
+        """챕터 고유 학습자 수 조회"""
+        counts = self._count_from_sketches("chapter", chapter_id)
+        if counts is not None:
+            return counts
+
+        base = self.db.query(func.count(distinct(UserProgress.user_id))).filter(
+            UserProgress.chapter_id == chapter_id
+        )
+        return self._count_from_db(
+            base,
+            completed_filter=UserProgress.completion_rate >= 100,
+            activity_column=UserProgress.last_access_at
+        )
+
+    def get_scenario_unique_users(self, scenario_id: int) -> Dict[str, Any]:
+        """시나리오 고유 학습자 수 조회"""
+        counts = self._count_from_sketches("scenario", scenario_id)
+        if counts is not None:
+            return counts
+
+        base = self.db.query(func.count(distinct(ScenarioProgress.user_id))).filter(
+            ScenarioProgress.scenario_id == scenario_id
+        )
+        return self._count_from_db(
+            base,
+            completed_filter=ScenarioProgress.completion_status == "완료",
+            activity_column=ScenarioProgress.start_time
+        )
+
+    def _count_from_sketches(self, kind: str, target_id: int) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return None
+
+        prefix = f"hll:{kind}:{target_id}"
+        today = datetime.utcnow()
+        day_keys: List[str] = [
+            f"{prefix}:d:{_day_suffix(today - timedelta(days=offset))}"
+            for offset in range(max(WINDOWS.values()))
+        ]
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.pfcount(f"{prefix}:all")
+            pipe.pfcount(f"{prefix}:completed")
+            for days in WINDOWS.values():
+                pipe.pfcount(*day_keys[:days])
+            results = pipe.execute()
+        except Exception:
+            logger.warning("고유 학습자 스케치 조회 실패: %s", prefix, exc_info=True)
+            return None
+
+        counts = {
+            "total_users": results[0],
+            "completed_users": results[1],
+            "is_estimate": True
+        }
+        counts.update(zip(WINDOWS.keys(), results[2:]))
+        return counts
+
+    def _count_from_db(self, base_query, completed_filter, activity_column) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        counts = {
+            "total_users": base_query.scalar() or 0,
+            "completed_users": base_query.filter(completed_filter).scalar() or 0,
+            "is_estimate": False
+        }
+        for name, days in WINDOWS.items():
+            counts[name] = base_query.filter(
+                activity_column >= now - timedelta(days=days)
+            ).scalar() or 0
+        return counts
+
+    # 백필
+    def rebuild_sketches(self, force: bool = False) -> bool:
+        """기존 진행 기록으로 스케치 재구성 (최초 1회)"""
+        if self.redis is None:
+            return False
+
+        try:
+            if not force and self.redis.exists(BACKFILL_MARKER_KEY):
+                return False
+            # 여러 워커가 동시에 시작해도 한 워커만 백필 (실패하거나 워커가 죽으면 잠금 해제/만료 후 재시도)
+            if not self.redis.set(BACKFILL_LOCK_KEY, 1, nx=True, ex=BACKFILL_LOCK_TTL):
+                return False
+        except Exception:
+            logger.warning("고유 학습자 스케치 백필 마커 확인 실패", exc_info=True)
+            return False
+
+        try:
+            self._backfill()
+            # 백필이 끝까지 성공한 경우에만 완료 표시
+            self.redis.set(BACKFILL_MARKER_KEY, 1)
+        finally:
+            self.redis.delete(BACKFILL_LOCK_KEY)
+
+        return True
+
+    def _backfill(self) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+
+        chapter_rows = self.db.query(
+            UserProgress.chapter_id,
+            UserProgress.user_id,
+            UserProgress.completion_rate,
+            UserProgress.last_access_at
+        ).yield_per(1000)
+        for chapter_id, user_id, completion_rate, last_access_at in chapter_rows:
+            self._queue_record(
+                pipe, "chapter", chapter_id, user_id,
+                completed=completion_rate is not None and completion_rate >= 100,
+                at=last_access_at
+            )
+            if len(pipe) >= BACKFILL_BATCH_SIZE:
+                pipe.execute()
+
+        scenario_rows = self.db.query(
+            ScenarioProgress.scenario_id,
+            ScenarioProgress.user_id,
+            ScenarioProgress.completion_status,
+            ScenarioProgress.start_time
+        ).yield_per(1000)
+        for scenario_id, user_id, completion_status, start_time in scenario_rows:
+            self._queue_record(
+                pipe, "scenario", scenario_id, user_id,
+                completed=completion_status == "완료",
+                at=start_time
+            )
+            if len(pipe) >= BACKFILL_BATCH_SIZE:
+                pipe.execute()
+
+        pipe.execute()
+
+
+def backfill_unique_user_sketches() -> None:
+    """스케치가 비어 있는 환경에서 최초 1회 백필 (애플리케이션 시작 시 호출)"""
+    db = SessionLocal()
+    try:
+        if UniqueUserService(db).rebuild_sketches():
+            logger.info("고유 학습자 스케치 백필 완료")
+    except Exception:
+        logger.warning("고유 학습자 스케치 백필 실패", exc_info=True)
+    finally:
+        db.close()
@@ -6,8 +6,17 @@ from typing import Optional, List
 from datetime import datetime
 
 from app.models.user import User, Job, UserLevel, UserStatus
-from app.schemas.user import UserCreate, UserUpdate, UserPasswordChange, UserLanguageChange, UserJobChange
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user import (
+    UserCreate, UserUpdate, UserPasswordChange, UserLanguageChange, UserJobChange,
+    JobResponse, UserLevelResponse, UserResponse
+)
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.cache import cached, invalidate_tags
+
+
+def _user_tags(params) -> List[str]:
+    return [f"user:{params['user_id']}"]
 
 
 class UserService:
@@ -18,13 +27,18 @@ class UserService:
         """ID로 사용자 조회"""
         return self.db.query(User).filter(User.user_id == user_id).first()
     
+    @cached("user_profile", ttl=settings.USER_PROFILE_CACHE_TTL, tags=_user_tags, model=UserResponse)
+    def get_user_profile(self, user_id: int) -> Optional[User]:
+        """사용자 프로필 조회 (캐시, 수정 시 user:{user_id} 태그로 무효화)"""
+        return self.get_user_by_id(user_id)
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """이메일로 사용자 조회"""
         return self.db.query(User).filter(User.email == email).first()
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         """사용자 생성"""
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         user = User(
             email=user_data.email,
@@ -67,18 +81,22 @@ class UserService:
         self.db.commit()
         self.db.refresh(user)
         
+        invalidate_tags(f"user:{user_id}")
+        
         return user
     
-    def update_user_password(self, user_id: int, new_password: str) -> bool:
+    async def update_user_password(self, user_id: int, new_password: str) -> bool:
         """사용자 비밀번호 변경"""
         user = self.get_user_by_id(user_id)
         if not user:
             return False
         
-        user.password = get_password_hash(new_password)
+        user.password = await get_password_hash_async(new_password)
         user.updated_at = datetime.utcnow()
         self.db.commit()
         
+        invalidate_tags(f"user:{user_id}")
+        
         return True
     
     def update_user_language(self, user_id: int, level_id: int) -> bool:
@@ -91,6 +109,8 @@ class UserService:
         user.updated_at = datetime.utcnow()
         self.db.commit()
         
+        invalidate_tags(f"user:{user_id}")
+        
         return True
     
     def update_user_job(self, user_id: int, job_id: int) -> bool:
@@ -103,26 +123,34 @@ class UserService:
         user.updated_at = datetime.utcnow()
         self.db.commit()
         
+        invalidate_tags(f"user:{user_id}")
+        
         return True
     
-    def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        """사용자 인증"""
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+        """사용자 인증 (해싱 비용 설정이 바뀌었으면 새 설정으로 재해싱해 저장)"""
         user = self.get_user_by_email(email)
         if not user:
             return None
         
-        if not verify_password(password, user.password):
+        valid, new_hash = await verify_password_async(password, user.password)
+        if not valid:
             return None
         
+        if new_hash:
+            user.password = new_hash
+            self.db.commit()
+        
         return user
     
-    def verify_user_password(self, user_id: int, password: str) -> bool:
+    async def verify_user_password(self, user_id: int, password: str) -> bool:
         """사용자 비밀번호 확인"""
         user = self.get_user_by_id(user_id)
         if not user:
             return False
         
-        return verify_password(password, user.password)
+        valid, _ = await verify_password_async(password, user.password)
+        return valid
     
     def get_user_status(self, user_id: int) -> Optional[UserStatus]:
         """사용자 상태 조회"""
@@ -136,10 +164,12 @@ class UserService:
         """레벨 조회"""
         return self.db.query(UserLevel).filter(UserLevel.level_id == level_id).first()
     
+    @cached("jobs", ttl=3600, tags=["jobs"], model=JobResponse)
     def get_all_jobs(self) -> List[Job]:
         """모든 직무 조회"""
         return self.db.query(Job).all()
     
+    @cached("levels", ttl=3600, tags=["levels"], model=UserLevelResponse)
     def get_all_levels(self) -> List[UserLevel]:
         """모든 레벨 조회"""
         return self.db.query(UserLevel).all()
@@ -0,0 +1,285 @@
+"""
+게시글 조회수 쓰기 병합
+
+조회마다 posts 행을 갱신하지 않고 증가분을 Redis 해시(HINCRBY) 또는 프로세스
+내 dict에 모아 두었다가 주기적으로 한 번의 UPDATE ... FROM (VALUES ...)로
+반영합니다. 조회 응답에는 아직 반영되지 않은 증가분을 더해 보여줍니다.
+
+Redis 사용 시 반영 절차:
+1. 반영 락 획득 (워커 간 중복 반영 방지)
+2. 대기 해시를 반영 중 해시로 RENAME (이후 조회는 새 대기 해시에 쌓임)
+   하고 묶음 ID 부여
+3. 같은 DB 트랜잭션에서 UPDATE와 묶음 ID 기록(view_count_flushes)을 커밋
+4. 반영 중 해시와 묶음 ID 삭제
+
+반영 중 해시가 남아 있으면(이전 반영 실패) 그것부터 다시 반영합니다. 커밋 후 4단계가
+실패했거나 락이 만료돼 다른 워커가 같은 묶음을 다시 가져와도, 묶음 ID가 이미 기록돼
+있으면 UPDATE 없이 Redis 정리만 하므로 조회수가 두 번 더해지지 않습니다.
+
+3단계 커밋과 4단계 삭제 사이에는 반영 중 해시가 DB에 이미 더해진 상태로 남아 있으므로,
+조회 응답에 증가분을 더할 때(pending) 묶음 ID가 view_count_flushes에 있으면 반영 중
+해시를 빼고 계산합니다.
+"""
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis_client import get_redis
+from app.models.community import Post, ViewCountFlush
+from app.services.trending_service import DIRTY_KEY as TRENDING_DIRTY_KEY
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "views:pending"
+FLUSHING_KEY = "views:flushing"
+FLUSH_LOCK_KEY = "views:flush_lock"
+FLUSH_BATCH_KEY = "views:flushing_batch"
+
+# 묶음 ID 기록 보관 기간 (반영 중 해시는 보통 다음 주기 안에 정리되므로 넉넉히)
+FLUSH_RECORD_RETENTION = timedelta(days=1)
+
+
+def _apply_deltas(db: Session, deltas: Dict[int, int]) -> None:
+    """증가분을 묶어서 DB에 반영 (커밋은 호출하는 쪽에서)"""
+    items = list(deltas.items())
+    batch_size = settings.VIEW_COUNT_FLUSH_BATCH_SIZE
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        if postgres:
+            values = ", ".join(f"(:id{i}, :delta{i})" for i in range(len(batch)))
+            params = {}
+            for i, (post_id, delta) in enumerate(batch):
+                params[f"id{i}"] = post_id
+                params[f"delta{i}"] = delta
+            db.execute(
+                text(
+                    "UPDATE posts SET view_count = COALESCE(posts.view_count, 0) + v.delta "
+                    f"FROM (VALUES {values}) AS v(post_id, delta) "
+                    "WHERE posts.post_id = v.post_id"
+                ),
+                params
+            )
+        else:
+            db.execute(
+                text(
+                    "UPDATE posts SET view_count = COALESCE(view_count, 0) + :delta "
+                    "WHERE post_id = :post_id"
+                ),
+                [{"post_id": post_id, "delta": delta} for post_id, delta in batch]
+            )
+
+
+class ViewCounter:
+    """게시글 조회수 증가분 버퍼"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._flushing: Dict[int, int] = {}
+        # 반영이 확인된 마지막 Redis 묶음 ID (같은 묶음의 DB 확인 반복 방지)
+        self._applied_batch: Optional[str] = None
+
+    def record(self, post_id: int) -> None:
+        """조회 1회 기록"""
+        client = get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hincrby(PENDING_KEY, post_id, 1)
+                pipe.sadd(TRENDING_DIRTY_KEY, post_id)
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("조회수 기록 실패, 로컬 버퍼 사용: %s", post_id, exc_info=True)
+
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + 1
+
+    def pending(self, post_ids: Iterable[int], db: Optional[Session] = None) -> Dict[int, int]:
+        """
+        아직 DB에 반영되지 않은 증가분 조회
+
+        Args:
+            db: 반영 중 묶음의 반영 여부 확인에 쓸 세션 (없으면 새 세션)
+        """
+        post_ids = list(post_ids)
+        if not post_ids:
+            return {}
+
+        with self._lock:
+            result = {
+                post_id: self._pending.get(post_id, 0) + self._flushing.get(post_id, 0)
+                for post_id in post_ids
+            }
+
+        client = get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hmget(PENDING_KEY, post_ids)
+                pipe.hmget(FLUSHING_KEY, post_ids)
+                pipe.get(FLUSH_BATCH_KEY)
+                pending, flushing, batch_id = pipe.execute()
+                if any(flushing) and self._is_batch_applied(batch_id, db):
+                    # 커밋 후 Redis 정리 전: DB 값에 이미 포함됨
+                    flushing = [None] * len(post_ids)
+                for post_id, a, b in zip(post_ids, pending, flushing):
+                    result[post_id] += int(a or 0) + int(b or 0)
+            except Exception:
+                logger.warning("대기 중인 조회수 조회 실패", exc_info=True)
+
+        return {post_id: delta for post_id, delta in result.items() if delta}
+
+    def _is_batch_applied(self, batch_id, db: Optional[Session]) -> bool:
+        if batch_id is None:
+            return False
+        batch_id = batch_id.decode() if isinstance(batch_id, bytes) else str(batch_id)
+        if batch_id == self._applied_batch:
+            return True
+
+        session = db if db is not None else SessionLocal()
+        try:
+            applied = session.get(ViewCountFlush, batch_id) is not None
+        except Exception:
+            logger.warning("조회수 묶음 반영 여부 확인 실패: %s", batch_id, exc_info=True)
+            return False
+        finally:
+            if db is None:
+                session.close()
+        if applied:
+            self._applied_batch = batch_id
+        return applied
+
+    def merge_into(self, posts: List[Post]) -> None:
+        """조회 결과에 대기 중인 증가분을 더함 (변경으로 표시하지 않음)"""
+        session = inspect(posts[0]).session if posts else None
+        deltas = self.pending((post.post_id for post in posts), db=session)
+        for post in posts:
+            info = inspect(post).info
+            current = post.view_count or 0
+            # 같은 세션에서 이미 더한 값이면 DB 값 기준으로 다시 계산 (중복 합산 방지)
+            base = info["db_view_count"] if info.get("merged_view_count") == current else current
+            merged = base + deltas.get(post.post_id, 0)
+            info["db_view_count"] = base
+            info["merged_view_count"] = merged
+            if merged != current:
+                set_committed_value(post, "view_count", merged)
+
+    def flush(self) -> int:
+        """대기 중인 증가분을 DB에 반영하고 반영한 게시글 수 반환"""
+        return self._flush_local() + self._flush_redis()
+
+    def _flush_local(self) -> int:
+        with self._lock:
+            if not self._flushing:
+                self._flushing, self._pending = self._pending, {}
+            deltas = dict(self._flushing)
+
+        if not deltas:
+            return 0
+
+        db = SessionLocal()
+        try:
+            _apply_deltas(db, deltas)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("조회수 반영 실패 (다음 주기에 재시도)", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+        with self._lock:
+            self._flushing = {}
+        return len(deltas)
+
+    def _flush_redis(self) -> int:
+        client = get_redis()
+        if client is None:
+            return 0
+
+        try:
+            lock_ms = settings.VIEW_COUNT_FLUSH_INTERVAL * 1000
+            if not client.set(FLUSH_LOCK_KEY, 1, nx=True, px=lock_ms):
+                return 0
+            # 이전 반영이 실패해 남은 해시가 없을 때만 새로 가져온다
+            if not client.exists(FLUSHING_KEY):
+                try:
+                    client.rename(PENDING_KEY, FLUSHING_KEY)
+                except Exception:
+                    # 대기 해시가 없음 (반영할 조회 없음)
+                    client.delete(FLUSH_LOCK_KEY)
+                    return 0
+                client.delete(FLUSH_BATCH_KEY)
+            # RENAME 직후 실패해 묶음 ID가 없으면 여기서 부여 (있으면 이전 ID 유지)
+            client.set(FLUSH_BATCH_KEY, uuid.uuid4().hex, nx=True)
+            batch_id, raw = client.get(FLUSH_BATCH_KEY), client.hgetall(FLUSHING_KEY)
+        except Exception:
+            logger.warning("조회수 버퍼 가져오기 실패", exc_info=True)
+            return 0
+
+        batch_id = batch_id.decode() if isinstance(batch_id, bytes) else str(batch_id)
+        deltas = {int(post_id): int(delta) for post_id, delta in raw.items() if int(delta)}
+        db = SessionLocal()
+        try:
+            applied = self._apply_batch(db, batch_id, deltas)
+            self._applied_batch = batch_id
+        except Exception:
+            db.rollback()
+            logger.warning("조회수 반영 실패 (다음 주기에 재시도)", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+        try:
+            client.delete(FLUSHING_KEY, FLUSH_BATCH_KEY, FLUSH_LOCK_KEY)
+        except Exception:
+            # 묶음 ID가 기록됐으므로 다음 주기에는 정리만 한다
+            logger.warning("조회수 반영 중 해시 정리 실패: %s", batch_id, exc_info=True)
+        return applied
+
+    @staticmethod
+    def _apply_batch(db: Session, batch_id: str, deltas: Dict[int, int]) -> int:
+        """묶음을 한 트랜잭션으로 반영 (이미 반영한 묶음이면 0)"""
+        if db.get(ViewCountFlush, batch_id) is not None:
+            logger.info("이미 반영한 조회수 묶음: %s", batch_id)
+            return 0
+
+        _apply_deltas(db, deltas)
+        db.add(ViewCountFlush(batch_id=batch_id, post_count=len(deltas), applied_at=datetime.utcnow()))
+        db.query(ViewCountFlush).filter(
+            ViewCountFlush.applied_at < datetime.utcnow() - FLUSH_RECORD_RETENTION
+        ).delete(synchronize_session=False)
+        try:
+            db.commit()
+        except IntegrityError:
+            # 락 만료 후 다른 워커가 같은 묶음을 먼저 커밋한 경우
+            db.rollback()
+            return 0
+        return len(deltas)
+
+
+view_counter = ViewCounter()
+
+
+async def run_view_count_flusher() -> None:
+    """주기적으로 조회수 증가분 반영 (종료 시 남은 증가분도 반영)"""
+    try:
+        while True:
+            await asyncio.sleep(settings.VIEW_COUNT_FLUSH_INTERVAL)
+            await asyncio.to_thread(view_counter.flush)
+    except asyncio.CancelledError:
+        await asyncio.to_thread(view_counter.flush)
+        raise
@@ -0,0 +1,111 @@
+"""
+응답 JSON 직렬화 비교
+
+실제 목록 응답 스키마(PostListResponse, SentenceListResponse, 통계용 BaseResponse)로
+아래 경로의 응답 본문 생성 시간을 비교합니다. 입력은 ORM 객체처럼 속성으로 접근하는
+객체입니다.
+- fastapi: FastAPI 기본 경로 (response_model 검증 → 파이썬 객체로 직렬화 → JSONResponse)
+- fastapi+orjson: 같은 경로에서 응답 클래스만 ORJSONResponse
+- fast route: FastJSONRoute 경로 (pydantic-core에서 바로 JSON 바이트)
+
+사용법:
+    python benchmarks/json_serialization_benchmark.py --items 100 --iterations 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.responses import ORJSONResponse, json_response_factory  # noqa: E402
+from app.schemas.common import BaseResponse  # noqa: E402
+from app.schemas.community import PostListResponse  # noqa: E402
+from app.schemas.learning import SentenceListResponse  # noqa: E402
+
+
+def make_posts(count: int) -> PostListResponse:
+    now = datetime(2024, 1, 1)
+    posts = [
+        SimpleNamespace(
+            post_id=i, user_id=i % 50, title=f"게시글 제목 {i}", content="한국어 공부 방법을 공유합니다. " * 10,
+            category="자유게시판", view_count=i * 7, reply_count=i % 13, last_reply_at=now + timedelta(minutes=i),
+            user=SimpleNamespace(user_id=i % 50, nickname=f"학습자{i % 50}", profile_img=None),
+            created_at=now, updated_at=now
+        )
+        for i in range(count)
+    ]
+    return PostListResponse(posts=posts, total=count * 10, page=1, size=count)
+
+
+def make_sentences(count: int) -> SentenceListResponse:
+    now = datetime(2024, 1, 1)
+    sentences = [
+        SimpleNamespace(
+            sentence_id=i, chapter_id=i % 20, content=f"안녕하세요, 만나서 반갑습니다 {i}",
+            translated_content=f"Hello, nice to meet you {i}", tts_url=None, created_at=now
+        )
+        for i in range(count)
+    ]
+    return SentenceListResponse(sentences=sentences, total=count * 10, page=1, size=count)
+
+
+def make_stats(count: int) -> BaseResponse:
+    return BaseResponse(data={
+        "daily": [
+            {"date": f"2024-01-{i % 28 + 1:02d}", "study_time": i * 3, "sentences": i, "score": i / 3}
+            for i in range(count)
+        ],
+        "total_study_time": count * 100
+    })
+
+
+async def fastapi_body(field, content, response_class) -> bytes:
+    return response_class(await serialize_response(field=field, response_content=content)).body
+
+
+def measure(name: str, func, iterations: int) -> float:
+    seconds = min(timeit.repeat(func, number=iterations, repeat=3)) / iterations
+    print(f"  {name}: {seconds * 1e6:.1f}us")
+    return seconds
+
+
+def main(args) -> None:
+    loop = asyncio.new_event_loop()
+    cases = [
+        ("PostListResponse", PostListResponse, make_posts(args.items)),
+        ("SentenceListResponse", SentenceListResponse, make_sentences(args.items)),
+        ("BaseResponse (통계)", BaseResponse, make_stats(args.items)),
+    ]
+    for name, model, content in cases:
+        field = create_response_field(name=f"Response_{model.__name__}", type_=model)
+        render = json_response_factory(model, 200)
+        expected = loop.run_until_complete(fastapi_body(field, content, JSONResponse))
+        assert render(content).body == expected, f"{name}: 직렬화 결과가 다릅니다"
+
+        print(f"{name} (항목 {args.items}개, {len(expected)} bytes)")
+        base = measure(
+            "fastapi", lambda: loop.run_until_complete(fastapi_body(field, content, JSONResponse)), args.iterations
+        )
+        measure(
+            "fastapi+orjson",
+            lambda: loop.run_until_complete(fastapi_body(field, content, ORJSONResponse)),
+            args.iterations
+        )
+        fast = measure("fast route", lambda: render(content), args.iterations)
+        print(f"  → {base / fast:.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="응답 JSON 직렬화 비교")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+로그인 부하 측정
+
+실행 중인 서버에 동시 로그인 요청을 보내면서 /health를 함께 호출해,
+로그인 지연(p50/p95/p99)과 그동안 다른 요청이 막히는지 확인합니다.
+
+사용법:
+    python benchmarks/login_benchmark.py --email user@example.com --password secret \\
+        --requests 200 --concurrency 20
+
+IP당 동시 로그인 제한(LOGIN_MAX_CONCURRENT_PER_IP)에 걸린 요청은 429로 따로 셉니다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples: List[float]) -> None:
+    if not samples:
+        print(f"{name}: 표본 없음")
+        return
+    print(
+        f"{name}: n={len(samples)} "
+        f"mean={statistics.mean(samples):.1f}ms "
+        f"p50={percentile(samples, 50):.1f}ms "
+        f"p95={percentile(samples, 95):.1f}ms "
+        f"p99={percentile(samples, 99):.1f}ms"
+    )
+
+
+async def run_logins(client: httpx.AsyncClient, args, latencies: List[float], statuses: Dict[int, int]) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/auth/login",
+                data={"username": args.email, "password": args.password}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def main(args) -> None:
+    login_latencies: List[float] = []
+    health_latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, health_latencies))
+        started = time.perf_counter()
+        await run_logins(client, args, login_latencies, statuses)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    print(f"총 {args.requests}건, 동시 {args.concurrency}, {elapsed:.1f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"상태 코드: {dict(sorted(statuses.items()))}")
+    report("login", login_latencies)
+    report("health (로그인 부하 중)", health_latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 부하 측정")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
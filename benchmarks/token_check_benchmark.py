@@ -0,0 +1,63 @@
+"""
+요청당 토큰 확인 비용 측정
+
+서버 없이 인증 의존성이 요청마다 하는 작업을 반복 호출해 호출당 시간을 출력합니다.
+- bloom: 폐기되지 않은 토큰의 블룸 필터 확인
+- revocation: 토큰 클레임(jti, fam) 폐기 여부 확인
+- verify_token (cached): 캐시된 클레임 + 폐기 여부 확인 (보호된 요청의 일반 경로)
+- verify_token (decode): 캐시 없이 JWT 디코드 + 폐기 여부 확인
+- redis exists: 필터 없이 매번 Redis를 조회할 때 (REDIS_URL이 설정된 경우)
+
+사용법:
+    python benchmarks/token_check_benchmark.py --revoked 100000 --iterations 100000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.redis_client import get_redis  # noqa: E402
+from app.core.security import create_access_token, new_token_id, token_cache, verify_token  # noqa: E402
+from app.core.token_revocation import KEY_PREFIX, revocation_store  # noqa: E402
+
+
+def measure(name: str, func, iterations: int) -> None:
+    seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+    print(f"{name}: {seconds / iterations * 1e6:.2f}us/call")
+
+
+def main(args) -> None:
+    # 다른 토큰들이 폐기된 상태를 만든다 (Redis가 있으면 Redis에 기록됨)
+    expires_at = time.time() + 3600
+    for _ in range(args.revoked):
+        revocation_store.add_to_filter(new_token_id())
+    revoked_family = new_token_id()
+    revocation_store.revoke(revoked_family, expires_at)
+
+    token = create_access_token({"sub": "1", "email": "bench@example.com", "fam": new_token_id()})
+    claims = verify_token(token)
+    print(f"폐기 목록 {args.revoked + 1}건, 반복 {args.iterations}회")
+
+    measure("bloom", lambda: claims["jti"] in revocation_store._bloom, args.iterations)
+    measure("revocation", lambda: revocation_store.is_token_revoked(claims), args.iterations)
+    measure("verify_token (cached)", lambda: verify_token(token), args.iterations)
+
+    def decode():
+        token_cache.clear()
+        verify_token(token)
+    measure("verify_token (decode)", decode, max(1, args.iterations // 10))
+
+    client = get_redis()
+    if client is not None:
+        key = f"{KEY_PREFIX}:{claims['jti']}"
+        measure("redis exists", lambda: client.exists(key), max(1, args.iterations // 100))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요청당 토큰 확인 비용 측정")
+    parser.add_argument("--revoked", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=100000)
+    main(parser.parse_args())
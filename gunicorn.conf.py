@@ -0,0 +1,44 @@
+"""
+운영 서버 설정 (gunicorn + uvicorn 워커)
+
+사용법:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+- 워커 수: WEB_CONCURRENCY (미설정 시 CPU 코어 수 * 2 + 1)
+- preload_app: 마스터에서 앱을 한 번 import한 뒤 fork해 코드/모듈 메모리를 워커끼리
+  copy-on-write로 공유합니다. lifespan(init_db, 백그라운드 작업, Redis 연결)은 워커마다
+  fork 이후에 실행됩니다.
+- WORKER_MAX_REQUESTS(+ 지터)만큼 처리한 워커는 새 워커로 교체합니다.
+- SIGTERM 시 WORKER_GRACEFUL_TIMEOUT 동안 처리 중인 요청과 lifespan 종료 작업을 기다립니다.
+"""
+import gc
+import multiprocessing
+
+from app.core.config import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+worker_class = "app.core.server.ProductionWorker"
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count() * 2 + 1
+
+preload_app = True
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = settings.WORKER_MAX_REQUESTS_JITTER
+timeout = settings.WORKER_TIMEOUT
+graceful_timeout = settings.WORKER_GRACEFUL_TIMEOUT
+keepalive = settings.WORKER_KEEPALIVE
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "debug" if settings.DEBUG else "info"
+
+
+def when_ready(server):
+    # preload로 만든 객체를 GC 대상에서 빼 워커의 GC가 공유 페이지를 건드려 복사되지 않게 한다
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # 마스터에서 만든 커넥션 풀을 워커가 이어 쓰지 않도록 (연결은 닫지 않고 버림)
+    from app.core.database import engine
+
+    engine.dispose(close=False)
@@ -1,11 +1,17 @@
+"""
+개발용 실행 스크립트 (단일 워커, 코드 변경 시 자동 재시작)
+
+운영에서는 gunicorn -c gunicorn.conf.py app.main:app 을 사용합니다.
+"""
 import uvicorn
-from app.main import app
+
+from app.core.config import settings
 
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
+        host=settings.HOST,
+        port=settings.PORT,
         reload=True,
         log_level="info"
     )
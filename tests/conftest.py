@@ -0,0 +1,73 @@
+"""
+테스트 공통 설정
+
+app.main은 lifespan에서 PostgreSQL 초기화와 백그라운드 작업을 시작하고 외부 서비스
+의존성(pyaudio)을 불러오므로, 테스트는 필요한 라우터만 올린 앱을 사용합니다.
+DB는 임시 SQLite 파일을 쓰고 Redis는 사용하지 않습니다(REDIS_URL 미설정 경로).
+"""
+import os
+import tempfile
+
+# app 모듈이 설정을 읽기 전에 지정해야 한다
+_db_dir = tempfile.mkdtemp(prefix="koreanforyou-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["REDIS_URL"] = ""
+
+import pytest  # noqa: E402
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.responses import ORJSONResponse  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def build_app(router: APIRouter, prefix: str) -> FastAPI:
+    """라우터 하나만 올린 테스트 앱"""
+    test_app = FastAPI(default_response_class=ORJSONResponse)
+    test_app.include_router(router, prefix=prefix)
+    return test_app
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """테스트마다 빈 스키마로 시작"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    def factory(email: str = "user@example.com", nickname: str = "학습자") -> User:
+        user = User(email=email, password="hashed", nickname=nickname)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return factory
+
+
+@pytest.fixture
+def client_for():
+    clients = []
+
+    def factory(router: APIRouter, prefix: str) -> TestClient:
+        client = TestClient(build_app(router, prefix))
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        client.close()
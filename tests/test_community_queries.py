@@ -0,0 +1,111 @@
+"""
+커뮤니티 목록 API의 SQL 실행 횟수 (N+1 회귀 방지)
+
+작성자와 대댓글을 여러 명/여러 단계로 만들어 두고, 행 수와 관계없이 허용 횟수 안에서
+응답하는지 확인합니다. 개수 1회 + 페이지 1회(댓글은 게시글 존재 확인 1회 추가)가 기준입니다.
+"""
+import pytest
+
+from app.api.v1.endpoints import community
+from app.core.query_counter import assert_max_queries
+from app.schemas.community import PostCreate, ReplyCreate
+from app.services.community_service import CommunityService
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for(community.router, "/api/posts")
+
+
+@pytest.fixture
+def post_id(db, make_user):
+    users = [make_user(email=f"user{i}@example.com", nickname=f"학습자{i}") for i in range(5)]
+    service = CommunityService(db)
+
+    posts = [
+        service.create_post(
+            users[i % len(users)].user_id,
+            PostCreate(title=f"한국어 공부 {i}", content=f"존댓말 연습 방법 {i}", category="자유게시판")
+        )
+        for i in range(15)
+    ]
+    target = posts[0].post_id
+
+    for i in range(6):
+        parent = service.create_reply(
+            users[i % len(users)].user_id, target, ReplyCreate(content=f"댓글 {i}")
+        )
+        for j in range(3):
+            child = service.create_reply(
+                users[(i + j + 1) % len(users)].user_id,
+                target,
+                ReplyCreate(content=f"대댓글 {i}-{j}", parent_reply_id=parent.reply_id)
+            )
+            service.create_reply(
+                users[j % len(users)].user_id,
+                target,
+                ReplyCreate(content=f"대대댓글 {i}-{j}", parent_reply_id=child.reply_id)
+            )
+    return target
+
+
+def test_posts_list(client, post_id):
+    with assert_max_queries(2):
+        response = client.get("/api/posts/", params={"size": 20})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["posts"]) == 15
+    assert all(post["author"]["nickname"] for post in body["posts"])
+
+
+def test_posts_list_by_cursor(client, post_id):
+    first = client.get("/api/posts/", params={"size": 5, "include_total": False}).json()
+
+    with assert_max_queries(1):
+        response = client.get(
+            "/api/posts/", params={"size": 5, "cursor": first["next_cursor"], "include_total": False}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["posts"]) == 5
+
+
+def test_replies_list(client, post_id):
+    with assert_max_queries(3):
+        response = client.get(f"/api/posts/{post_id}/replies", params={"size": 50})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 42
+    assert all(reply["author"]["nickname"] for reply in body["replies"])
+
+
+def test_reply_tree(client, post_id):
+    # 최상위 댓글 페이지 + 재귀 CTE 한 번으로 모든 깊이의 대댓글 조회
+    with assert_max_queries(4):
+        response = client.get(f"/api/posts/{post_id}/replies/tree", params={"size": 20})
+
+    assert response.status_code == 200
+    roots = response.json()["replies"]
+    assert len(roots) == 6
+    assert all(len(root["children"]) == 3 for root in roots)
+    assert all(len(child["children"]) == 1 for root in roots for child in root["children"])
+
+
+def test_post_search(client, post_id):
+    with assert_max_queries(2):
+        response = client.get("/api/posts/search", params={"q": "존댓말"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 15
+    assert all(post["author"]["nickname"] for post in body["posts"])
+
+
+def test_reply_search(client, post_id):
+    with assert_max_queries(2):
+        response = client.get("/api/posts/replies/search", params={"q": "대댓글"})
+
+    assert response.status_code == 200
+    assert response.json()["total"] > 0
@@ -0,0 +1,204 @@
+"""
+시나리오 대화 턴 SSE 스트리밍 (POST /api/scenarios/{scenario_id}/turns/stream)
+
+LLM 서버는 httpx.MockTransport로 만든 OpenAI 호환 스텁입니다. 이벤트 순서
+(token... → done 또는 error), 스트림이 끝난 뒤의 턴 저장, 업스트림 오류와 중간 끊김을
+확인합니다.
+"""
+import json
+from typing import Dict, List, Tuple
+
+import httpx
+import pytest
+
+from app.api.v1.endpoints import scenarios
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.scenario import Role, Scenario
+from app.schemas.scenario import USER_MESSAGE_MAX_LENGTH, ScenarioStartRequest
+from app.services import llm_client
+from app.services.scenario_service import ScenarioService
+
+LLM_URL = "http://llm.test/v1/chat/completions"
+
+
+def sse_chunk(text: str) -> bytes:
+    return f"data: {json.dumps({'choices': [{'delta': {'content': text}}]})}\n\n".encode()
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """몇 조각 보낸 뒤 연결이 끊기는 응답 본문"""
+
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+        raise httpx.RemoteProtocolError("peer closed connection")
+
+
+class StubLLM:
+    """요청을 기록하고 정해진 응답을 돌려주는 LLM 서버 스텁"""
+
+    def __init__(self):
+        self.requests: List[dict] = []
+        self.response = lambda: httpx.Response(
+            200,
+            headers={"Content-Type": "text/event-stream"},
+            content=b"".join(sse_chunk(text) for text in ["안녕하세요", ", ", "주문하시겠어요?"]) + b"data: [DONE]\n\n"
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        return self.response()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    stub = StubLLM()
+    monkeypatch.setattr(settings, "LLM_API_URL", LLM_URL)
+    monkeypatch.setattr(llm_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(stub.handler)))
+    return stub
+
+
+@pytest.fixture
+def session(db, make_user) -> Tuple[int, int, Dict[str, str]]:
+    """진행 중인 시나리오 (사용자 ID, 시나리오 ID, 인증 헤더)"""
+    user = make_user()
+    customer = Role(role_name="손님", description="카페 손님")
+    clerk = Role(role_name="점원")
+    scenario = Scenario(title="카페 주문", description="카페에서 음료 주문")
+    db.add_all([customer, clerk, scenario])
+    db.commit()
+
+    ScenarioService(db).start_scenario(
+        user.user_id,
+        scenario.scenario_id,
+        ScenarioStartRequest(user_role_id=customer.role_id, ai_role_id=clerk.role_id)
+    )
+    token = create_access_token({"sub": str(user.user_id), "email": user.email})
+    return user.user_id, scenario.scenario_id, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for(scenarios.router, "/api/scenarios")
+
+
+def read_events(response) -> List[Tuple[str, dict]]:
+    events = []
+    for block in response.text.split("\n\n"):
+        if not block.strip():
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def saved_turns(db, user_id: int, scenario_id: int) -> List[dict]:
+    service = ScenarioService(db)
+    progress_id = service.get_active_progress_id(user_id, scenario_id)
+    return service.get_conversation_turns([progress_id])[progress_id]
+
+
+def test_stream_tokens_then_done_and_turn_saved(client, llm, session, db):
+    user_id, scenario_id, headers = session
+
+    response = client.post(
+        f"/api/scenarios/{scenario_id}/turns/stream",
+        json={"user_message": "아메리카노 한 잔 주세요"},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+    assert [name for name, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == "안녕하세요, 주문하시겠어요?"
+    assert events[-1][1] == {"turn_number": 1, "ai_response": "안녕하세요, 주문하시겠어요?"}
+
+    # 프롬프트: 스트리밍 요청, 시스템 프롬프트 + 이번 발화
+    request = llm.requests[0]
+    assert request["stream"] is True
+    assert request["messages"][0]["role"] == "system"
+    assert request["messages"][-1] == {"role": "user", "content": "아메리카노 한 잔 주세요"}
+
+    turns = saved_turns(db, user_id, scenario_id)
+    assert [(t["turn_number"], t["user_message"], t["ai_response"]) for t in turns] == [
+        (1, "아메리카노 한 잔 주세요", "안녕하세요, 주문하시겠어요?")
+    ]
+
+
+def test_next_turn_includes_previous_turn(client, llm, session):
+    _, scenario_id, headers = session
+    url = f"/api/scenarios/{scenario_id}/turns/stream"
+
+    client.post(url, json={"user_message": "아메리카노 주세요"}, headers=headers)
+    events = read_events(client.post(url, json={"user_message": "따뜻한 걸로요"}, headers=headers))
+
+    assert events[-1][0] == "done"
+    assert events[-1][1]["turn_number"] == 2
+    contents = [message["content"] for message in llm.requests[1]["messages"]]
+    assert "아메리카노 주세요" in contents
+    assert contents[-1] == "따뜻한 걸로요"
+
+
+def test_upstream_error_sends_error_event_without_saving(client, llm, session, db):
+    user_id, scenario_id, headers = session
+    llm.response = lambda: httpx.Response(500, content=b'{"error": "overloaded"}')
+
+    response = client.post(
+        f"/api/scenarios/{scenario_id}/turns/stream",
+        json={"user_message": "아메리카노 주세요"},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert [name for name, _ in read_events(response)] == ["error"]
+    assert saved_turns(db, user_id, scenario_id) == []
+
+
+def test_disconnect_mid_stream_sends_error_event_without_saving(client, llm, session, db):
+    user_id, scenario_id, headers = session
+    llm.response = lambda: httpx.Response(
+        200,
+        headers={"Content-Type": "text/event-stream"},
+        stream=BrokenStream([sse_chunk("안녕"), sse_chunk("하세요")])
+    )
+
+    response = client.post(
+        f"/api/scenarios/{scenario_id}/turns/stream",
+        json={"user_message": "아메리카노 주세요"},
+        headers=headers
+    )
+
+    events = read_events(response)
+    assert [name for name, _ in events] == ["token", "token", "error"]
+    assert saved_turns(db, user_id, scenario_id) == []
+
+
+def test_too_long_message_is_rejected_before_calling_llm(client, llm, session):
+    _, scenario_id, headers = session
+
+    response = client.post(
+        f"/api/scenarios/{scenario_id}/turns/stream",
+        json={"user_message": "가" * (USER_MESSAGE_MAX_LENGTH + 1)},
+        headers=headers
+    )
+
+    assert response.status_code == 422
+    assert llm.requests == []
+
+
+def test_no_active_scenario(client, llm, session):
+    _, scenario_id, headers = session
+
+    response = client.post(
+        f"/api/scenarios/{scenario_id + 1}/turns/stream",
+        json={"user_message": "안녕하세요"},
+        headers=headers
+    )
+
+    assert response.status_code == 404
+    assert llm.requests == []